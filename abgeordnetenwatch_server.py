@@ -1,223 +1,387 @@
 """
 Flask server for Abgeordnetenwatch PLZ lookup
 """
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.firefox.options import Options
-import time
-import csv
+import requests
 import os
+import re
 import json
+import hashlib
+import logging
+import time
+import atexit
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from gender_data import GENDER_LOOKUP
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from name_processing import detect_gender, name_cache_stats
+from mp_index import MPIndex
+from fuzzy_names import FuzzyNameIndex
+from http_caching import cacheable_response, compress_response, prepare_entry, prepared_response, serialize
+from cache_store import JsonCacheStore, SqliteCacheStore
+from concurrent_cache import ConcurrentCache
+from driver_pool import DriverPool, DriverPoolTimeout, create_firefox_driver
+from page_waits import PageWaiter, PageWaitTimeout, READY_CONDITIONS
+from tile_extraction import TileExtractor
+from html_scraper import create_session, fetch_listing, parse_listing, ListingParseError
+from single_flight import SingleFlight
+from wahlkreis_resolver import WahlkreisResolver
+from scrape_jobs import JobManager
+from admission import AdmissionController, ScrapeRejected
+from metrics import Registry, CONTENT_TYPE as METRICS_CONTENT_TYPE
+import request_timing
+from request_timing import phase, record as record_timing
+from structured_logging import configure_logging, assign_request_id, add_request_id_header, dropped_records
+
+configure_logging()
+# Not __name__: Flask's app.logger has that name and is set to DEBUG in debug mode
+log = logging.getLogger('abgeordnetenwatch')
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=['X-Cache', 'X-Coalesced-Requests', 'Retry-After'])
+app.after_request(compress_response)
+# Server-Timing header and admin-only ?profile=1 traces
+app.before_request(request_timing.start_request)
+app.after_request(request_timing.finish_request)
+app.teardown_request(request_timing.teardown_request)
+# Request ids for log records (echoed as X-Request-ID)
+app.before_request(assign_request_id)
+app.after_request(add_request_id_header)
 
-# Cache for PLZ results (in-memory cache)
-PLZ_CACHE = {}
+# Cache for PLZ results: a ConcurrentCache (created below) in front of CACHE_STORE
 CACHE_FILE = 'data/plz_cache.json'
-CACHE_DURATION = timedelta(days=7)  # Cache valid for 7 days
-
-# Comprehensive German first names for fallback gender detection
-MALE_FIRST_NAMES = {
-    'achim', 'adam', 'adis', 'adrian', 'alaa', 'albert', 'alexander', 'alexis', 'alois', 'andreas',
-    'ansgar', 'anton', 'armin', 'arne', 'artur', 'ates', 'axel', 'balten', 'bastian', 'benedikt',
-    'benjamin', 'bernd', 'boris', 'carl', 'carl-philipp', 'carsten', 'cem', 'christian', 'christoph',
-    'christopher', 'daniel', 'david', 'denis', 'dennis', 'dietmar', 'dirk', 'enrico', 'erhard',
-    'erik', 'fabian', 'falko', 'felix', 'ferat', 'florian', 'frank', 'frederik', 'friedrich',
-    'fritz', 'georg', 'gereon', 'gerhard', 'gerold', 'gerrit', 'gottfried', 'gregor', 'gunther',
-    'günter', 'götz', 'gökay', 'hans', 'hans-jürgen', 'hansjörg', 'hannes', 'harald', 'hauke',
-    'heiko', 'heinrich', 'helge', 'helmut', 'hendrik', 'henning', 'henri', 'herbert', 'hermann',
-    'holger', 'hubertus', 'ingo', 'isaac', 'jakob', 'jan', 'jan-marco', 'jan-niclas', 'jan-wilhelm',
-    'janosch', 'joachim', 'jochen', 'johann', 'johannes', 'jonas', 'jorrit', 'josef', 'julian',
-    'jörg', 'jörn', 'jürgen', 'kai', 'karl', 'karsten', 'kay', 'klaus', 'knut', 'konstantin',
-    'konrad', 'kurt', 'lars', 'leif', 'leif-erik', 'leon', 'lorenz', 'lukas', 'luke', 'luigi',
-    'lutz', 'macit', 'maik', 'malte', 'manfred', 'manuel', 'marc', 'marcel', 'marco', 'marcus',
-    'mario', 'mark', 'markus', 'martin', 'marvin', 'matthias', 'max', 'maximilian', 'metin',
-    'micha', 'michael', 'mirco', 'moritz', 'nicolai', 'niklas', 'nils', 'norbert', 'olaf', 'olav',
-    'oliver', 'omid', 'oskar', 'otto', 'parsa', 'pascal', 'patrick', 'paul', 'peter', 'philipp',
-    'philip', 'pierre', 'rainer', 'raimond', 'ralf', 'ralph', 'reinhard', 'rene', 'rené', 'reza',
-    'richard', 'robert', 'robin', 'rocco', 'roderich', 'roland', 'rolf', 'ronald', 'ruben', 'rüdiger',
-    'sascha', 'sebastian', 'sepp', 'sergej', 'sieghard', 'stefan', 'steffen', 'stephan', 'sven',
-    'tarek', 'theo', 'theodor', 'thomas', 'thorsten', 'til', 'tilman', 'tim', 'timon', 'tino',
-    'tobias', 'torben', 'truels', 'udo', 'ulrich', 'uwe', 'vinzenz', 'volker', 'waldemar', 'walter',
-    'werner', 'wilfried', 'wilhelm', 'wolfgang'
-}
-
-FEMALE_FIRST_NAMES = {
-    'agnieszka', 'alexandra', 'andrea', 'angela', 'angelika', 'anja', 'anke', 'anna', 'annalena',
-    'anne', 'anne-mieke', 'anette', 'annette', 'annika', 'astrid', 'ayse', 'barbara', 'beate',
-    'bettina', 'birgit', 'britta', 'bärbel', 'cansin', 'caren', 'carina', 'carolin', 'caroline',
-    'catarina', 'chantal', 'charlotte', 'christiane', 'christina', 'christine', 'clara', 'claudia',
-    'corinna', 'cornelia', 'dagmar', 'daniela', 'deborah', 'denise', 'desiree', 'diana', 'doris',
-    'dorothee', 'dunja', 'elena', 'elisabeth', 'elke', 'ellen', 'emilia', 'emma', 'erika', 'esra',
-    'esther', 'eva', 'filiz', 'franziska', 'frauke', 'gabriela', 'gitta', 'gisela', 'gudrun',
-    'hannah', 'heide', 'heidi', 'heike', 'helga', 'hilde', 'hildegard', 'hülya', 'ida', 'ilse',
-    'ina', 'ines', 'inge', 'ingeborg', 'ingrid', 'irene', 'iris', 'isabel', 'isabell', 'isabelle',
-    'jamila', 'jana', 'janina', 'jasmin', 'jasmina', 'jeanne', 'jennifer', 'jessica', 'johanna',
-    'josephine', 'julia', 'juliane', 'jutta', 'karin', 'karla', 'karoline', 'katalin', 'katharina',
-    'kathrin', 'katja', 'katrin', 'kerstin', 'kirsten', 'klara', 'kristin', 'lamya', 'lara', 'laura',
-    'lea', 'lena', 'linda', 'lisa', 'luise', 'mandy', 'manuela', 'margarete', 'mareike', 'maren',
-    'maria', 'marie', 'marion', 'marlene', 'marta', 'martha', 'martina', 'mechthild', 'melanie',
-    'michaela', 'monika', 'nadine', 'nancy', 'natalie', 'nicole', 'nina', 'ophelia', 'ottilie',
-    'patricia', 'paula', 'petra', 'pia', 'rasha', 'rebecca', 'reem', 'regina', 'renate', 'ricarda',
-    'rita', 'ronja', 'rosa', 'rosemarie', 'ruth', 'sabine', 'sabrina', 'sahra', 'sanae', 'sandra',
-    'sara', 'sarah', 'saskia', 'schahina', 'serap', 'siemtje', 'silke', 'silvia', 'simone', 'sofia',
-    'sonja', 'sophie', 'stefanie', 'steffi', 'stella', 'susanne', 'svenja', 'swantje', 'sylvia',
-    'tamara', 'tanja', 'teresa', 'theresa', 'tijen', 'ulrike', 'ursula', 'ute', 'vanessa', 'vera',
-    'verena', 'veronika', 'victoria', 'violetta', 'waltraud', 'wiebke', 'zada', 'zoe'
-}
-
-def normalize_name(name):
-    """Normalize name by removing Dr./Prof. prefix and extra spaces"""
-    import re
-    # Remove Dr., Prof., prof. dr., Prof. Dr. prefixes (with or without dot, with optional spaces)
-    normalized = re.sub(r'\b[Pp][Rr][Oo][Ff]\.?\s+[Dd][Rr]\.?\s+', '', name)
-    normalized = re.sub(r'\b[Dd][Rr]\.?\s+[Mm][Ee][Dd]\.?\s+', '', normalized)
-    normalized = re.sub(r'\b[Pp][Rr][Oo][Ff]\.?\s+', '', normalized)
-    normalized = re.sub(r'\b[Dd][Rr]\.?\s+', '', normalized)
-    # Remove extra spaces
-    normalized = ' '.join(normalized.split())
-    return normalized.strip()
-
-def extract_first_name(full_name):
-    """Extract first name from full name (handles 'Last, First' or 'First Last' formats)"""
-    normalized = normalize_name(full_name)
-    
-    # Handle "Last, First" format
-    if ',' in normalized:
-        parts = normalized.split(',', 1)
-        if len(parts) > 1:
-            first_name = parts[1].strip().split()[0]
-            return first_name.lower()
-    
-    # Handle "First Last" format
-    parts = normalized.split()
-    if parts:
-        return parts[0].lower()
-    
-    return ''
-
-def detect_gender(full_name):
-    """Detect gender using comprehensive MP database with first-name fallback"""
-    # First try exact match (case-insensitive)
-    normalized_name = normalize_name(full_name).lower()
-    gender = GENDER_LOOKUP.get(normalized_name)
-    
-    if gender and gender != 'unknown':
-        return gender
-    
-    # Fallback: try first name pattern matching
-    first_name = extract_first_name(full_name)
-    
-    if first_name in MALE_FIRST_NAMES:
-        return 'male'
-    elif first_name in FEMALE_FIRST_NAMES:
-        return 'female'
-    else:
-        return 'unknown'
+# Stale-while-revalidate: past the soft TTL a cached response is still served
+# immediately while a background scrape refreshes it; past the hard TTL it is dropped
+CACHE_SOFT_TTL = timedelta(hours=float(os.environ.get('CACHE_SOFT_TTL_HOURS', '24')))
+CACHE_DURATION = timedelta(hours=float(os.environ.get('CACHE_HARD_TTL_HOURS', str(7 * 24))))  # Hard TTL, 7 days
+CACHE_REFRESH_WORKERS = int(os.environ.get('CACHE_REFRESH_WORKERS', '1'))
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'sqlite').lower()  # 'sqlite' or legacy 'json'
+CACHE_DB_FILE = os.environ.get('CACHE_DB_FILE', 'data/plz_cache.db')
 
-# Load contact URLs from CSV database
-CONTACT_URL_MAP = {}
-def load_contact_urls():
-    csv_path = os.path.join('data', 'bundestag_contacts.csv')
-    if os.path.exists(csv_path):
-        try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # CSV has names in "Last, First" format
-                    # Store both formats for matching
-                    name_csv = row['name'].strip()
-                    
-                    # Normalize name (remove Dr. prefix)
-                    name_normalized = normalize_name(name_csv)
-                    
-                    # Store original format: "Meiser, Pascal"
-                    name_key1 = name_normalized.lower()
-                    CONTACT_URL_MAP[name_key1] = row['contact_url']
-                    
-                    # Also store reversed format: "Pascal Meiser"
-                    if ',' in name_normalized:
-                        parts = name_normalized.split(',', 1)
-                        name_reversed = f"{parts[1].strip()} {parts[0].strip()}"
-                        name_key2 = name_reversed.lower()
-                        CONTACT_URL_MAP[name_key2] = row['contact_url']
-                    
-            print(f"✓ Loaded {len(CONTACT_URL_MAP)} contact URLs from database")
-        except Exception as e:
-            print(f"Warning: Could not load contact URLs: {e}")
+# Query parameters that never change the scraped page (plus any utm_*)
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', '_ga', 'ref'}
+# Keys from the old per-process hash(): a signed 64-bit int, so at most 19 digits. Current keys have
+# 24 hex digits, which can all be decimal digits, and must never match
+LEGACY_URL_KEY = re.compile(r'^url_-?\d{1,19}$')
+
+def canonical_url(url):
+    """
+    Normalize a listing URL so equivalent links share one cache entry:
+    lower-case scheme/host, no fragment or tracking parameters, and sorted
+    query parameters. Repeated parameters keep their last value, which is
+    what the site itself uses (e.g. 'constituency=All&...&constituency=14011').
+    """
+    parts = urlsplit(url.strip())
+    params = {}
+    for key, value in parse_qsl(parts.query, keep_blank_values=True):
+        if key.lower().startswith('utm_') or key.lower() in TRACKING_PARAMS:
+            continue
+        params.pop(key, None)
+        params[key] = value
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(params.items())), ''))
+
+
+# Prometheus metrics for GET /metrics; each worker process keeps and serves its own,
+# so with several workers every sample gets a worker="<pid>" label (set by gunicorn.conf.py)
+METRICS_WORKER_LABEL = os.environ.get('METRICS_WORKER_LABEL', '0') == '1'
+METRICS = Registry(const_labels=(lambda: {'worker': str(os.getpid())}) if METRICS_WORKER_LABEL else None)
+REQUEST_SECONDS = METRICS.histogram(
+    'abgeordnetenwatch_http_request_duration_seconds', 'Request latency by route', ['route', 'method'])
+REQUESTS = METRICS.counter(
+    'abgeordnetenwatch_http_requests_total', 'Requests by route and status', ['route', 'method', 'status'])
+CACHE_RESULTS = METRICS.counter(
+    'abgeordnetenwatch_cache_results_total', 'API answers by X-Cache result (hit, stale, miss, offline)',
+    ['route', 'result'])
+SCRAPE_SECONDS = METRICS.histogram(
+    'abgeordnetenwatch_scrape_duration_seconds', 'Duration of one listing scrape', ['backend'])
+SCRAPE_PHASE_SECONDS = METRICS.histogram(
+    'abgeordnetenwatch_scrape_phase_duration_seconds',
+    'Scrape time per phase (selenium: browser_start, lease, page_load, wait, extract, enrich; '
+    'http: fetch, parse, enrich)',
+    ['backend', 'phase'])
+SCRAPE_ERRORS = METRICS.counter(
+    'abgeordnetenwatch_scrape_errors_total', 'Failed scrapes by backend and exception type', ['backend', 'type'])
+POLITICIANS_PER_PAGE = METRICS.histogram(
+    'abgeordnetenwatch_scrape_politicians_per_page', 'Politicians extracted from one listing page', ['backend'],
+    buckets=(0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 50))
+
+# Scrapes (and browsers) the whole host runs at once, across all worker processes; bounds Firefox memory
+SCRAPE_CONCURRENCY = int(os.environ.get('SCRAPE_CONCURRENCY', '2'))
+# gunicorn.conf.py exports its worker count; every worker gets an equal share of the host's scrape slots
+WEB_WORKERS = int(os.environ.get('WEB_WORKERS', '1'))
+WORKER_SCRAPE_CONCURRENCY = max(1, SCRAPE_CONCURRENCY // WEB_WORKERS)
+# Scrapes beyond that wait in a bounded queue; when it is full, or the wait times out, the request gets a 503.
+# Queued requests hold a server thread: keep the worker's share + SCRAPE_QUEUE_SIZE + SSE_MAX_STREAMS below WEB_THREADS
+SCRAPE_QUEUE_SIZE = int(os.environ.get('SCRAPE_QUEUE_SIZE', '4'))
+SCRAPE_QUEUE_TIMEOUT = float(os.environ.get('SCRAPE_QUEUE_TIMEOUT', '10'))  # Seconds
+# Batch, async job and refresh scrapes wait behind interactive misses, outside their queue, this long
+SCRAPE_BACKGROUND_TIMEOUT = float(os.environ.get('SCRAPE_BACKGROUND_TIMEOUT', '300'))  # Seconds
+SCRAPE_ADMISSION = AdmissionController(limit=WORKER_SCRAPE_CONCURRENCY, max_queue=SCRAPE_QUEUE_SIZE,
+                                       queue_timeout=SCRAPE_QUEUE_TIMEOUT,
+                                       background_timeout=SCRAPE_BACKGROUND_TIMEOUT)
+# Set on executor threads whose scrapes use the background admission lane
+_scrape_lane = threading.local()
+
+# Warm Firefox drivers shared by all scrapes of this worker
+DRIVER_POOL_SIZE = int(os.environ.get('DRIVER_POOL_SIZE', str(WORKER_SCRAPE_CONCURRENCY)))
+DRIVER_MAX_USES = int(os.environ.get('DRIVER_MAX_USES', '50'))  # Recycle a browser after this many scrapes
+DRIVER_LEASE_TIMEOUT = float(os.environ.get('DRIVER_LEASE_TIMEOUT', '30'))  # Seconds to wait for a free browser
+
+
+def record_scrape_phase(backend, name, seconds):
+    """A scrape phase goes to /metrics and, on the request path, to the Server-Timing header"""
+    SCRAPE_PHASE_SECONDS.observe(seconds, backend=backend, phase=name)
+    record_timing(name, seconds)
+
+
+@contextmanager
+def scrape_phase(backend, name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_scrape_phase(backend, name, time.perf_counter() - started)
+
+
+def start_firefox():
+    """Driver pool factory that records how long each browser takes to start"""
+    with scrape_phase('selenium', 'browser_start'):
+        return create_firefox_driver()
+
+
+DRIVER_POOL = DriverPool(size=DRIVER_POOL_SIZE, max_uses=DRIVER_MAX_USES, lease_timeout=DRIVER_LEASE_TIMEOUT,
+                         factory=start_firefox)
+atexit.register(DRIVER_POOL.shutdown)
+
+# Wait for real DOM markers instead of sleeping a fixed amount after navigation
+PAGE_WAIT_TIMEOUT = float(os.environ.get('PAGE_WAIT_TIMEOUT', '10'))  # Per-request deadline in seconds
+PAGE_WAIT_POLL_INTERVAL = float(os.environ.get('PAGE_WAIT_POLL_INTERVAL', '0.1'))
+PAGE_WAITER = PageWaiter(timeout=PAGE_WAIT_TIMEOUT, poll_interval=PAGE_WAIT_POLL_INTERVAL)
+
+# Pulls all tiles of a page in one execute_script round-trip
+TILE_EXTRACTOR = TileExtractor()
+
+# Site to scrape; overridable so crawls and benchmarks can run against a local fixture server
+SITE_URL = 'https://www.abgeordnetenwatch.de'
+ABGEORDNETENWATCH_URL = os.environ.get('ABGEORDNETENWATCH_URL', SITE_URL).rstrip('/')
+
+
+def fetch_url(url):
+    """Where to download a site URL from (ABGEORDNETENWATCH_URL when that is overridden)"""
+    if url and url.startswith(SITE_URL):
+        return ABGEORDNETENWATCH_URL + url[len(SITE_URL):]
+    return url
+
+
+def site_url(url):
+    """
+    The public site URL for a URL on the host a page was fetched from, so cached
+    results never link to a fixture server or other stand-in
+    """
+    if url and ABGEORDNETENWATCH_URL != SITE_URL and url.startswith(ABGEORDNETENWATCH_URL):
+        return SITE_URL + url[len(ABGEORDNETENWATCH_URL):]
+    return url
+
+# Scraping backend: 'http' (pooled HTTP + lxml, Selenium fallback) or 'selenium'
+SCRAPER_BACKEND = os.environ.get('SCRAPER_BACKEND', 'http').lower()
+HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', '10'))
+HTTP_SESSION = create_session(pool_size=HTTP_POOL_SIZE)
+
+# Concurrent cache misses for the same PLZ/URL wait on one shared scrape
+SCRAPE_FLIGHTS = SingleFlight()
+
+# Background scrapes that refresh stale cache entries
+REFRESH_EXECUTOR = ThreadPoolExecutor(max_workers=CACHE_REFRESH_WORKERS, thread_name_prefix='cache-refresh')
+PENDING_REFRESHES = set()
+PENDING_REFRESHES_LOCK = threading.Lock()
+
+# Scrape budget shared by all /api/search/batch requests
+BATCH_MAX_PLZ = int(os.environ.get('BATCH_MAX_PLZ', '5000'))
+BATCH_SCRAPE_WORKERS = int(os.environ.get('BATCH_SCRAPE_WORKERS', '4'))
+BATCH_EXECUTOR = ThreadPoolExecutor(max_workers=BATCH_SCRAPE_WORKERS, thread_name_prefix='batch-scrape')
+
+# Async mode (?async=1): cache misses become jobs that clients poll or subscribe to via SSE
+# Job scrapes use the background admission lane; more threads than the worker's scrape share would only wait
+JOB_WORKERS = min(int(os.environ.get('JOB_WORKERS', str(WORKER_SCRAPE_CONCURRENCY))), WORKER_SCRAPE_CONCURRENCY)
+JOB_TTL = int(os.environ.get('JOB_TTL', '600'))  # Seconds a finished job stays collectable
+SSE_TIMEOUT = int(os.environ.get('SSE_TIMEOUT', '60'))  # Max lifetime of one event stream
+# Every open event stream holds a server thread; beyond this many per worker, clients are told to poll instead
+SSE_MAX_STREAMS = int(os.environ.get('SSE_MAX_STREAMS', '2'))
+SSE_RETRY_AFTER = 5  # Seconds
+SCRAPE_JOBS = JobManager(workers=JOB_WORKERS, ttl=JOB_TTL)
+_sse_streams = {'open': 0, 'rejected': 0}
+_sse_lock = threading.Lock()
+
+# One record per MP (mdbId) with contact URL, gender and Wahlkreis, indexed by every name spelling
+MP_INDEX = MPIndex(os.path.join('data', 'bundestag_contacts.csv'), detect_gender=detect_gender)
+try:
+    if MP_INDEX.load():
+        log.info("Loaded %d MPs with contact URLs from database", len(MP_INDEX))
     else:
-        print("Warning: data/bundestag_contacts.csv not found")
+        log.warning("data/bundestag_contacts.csv not found")
+except Exception as e:
+    log.warning("Could not load contact URLs: %s", e)
 
-load_contact_urls()
+# Approximate matching for scraped names the exact index misses (middle names, typos)
+FUZZY_NAMES = FuzzyNameIndex(MP_INDEX)
+FUZZY_NAMES.load()
+
+# Offline PLZ -> Wahlkreis -> MP resolution; unmapped PLZs are scraped as before
+PLZ_WAHLKREIS_FILE = os.environ.get('PLZ_WAHLKREIS_FILE', os.path.join('data', 'plz_wahlkreis.csv'))
+WAHLKREIS_RESOLVER = WahlkreisResolver(MP_INDEX, PLZ_WAHLKREIS_FILE, canonicalize=canonical_url)
+try:
+    if WAHLKREIS_RESOLVER.load():
+        log.info("Loaded offline Wahlkreis index for %d PLZs", WAHLKREIS_RESOLVER.stats()['plz'])
+except Exception as e:
+    log.warning("Could not load %s: %s", PLZ_WAHLKREIS_FILE, e)
+
+def create_cache_store():
+    """Create the persistent cache backend selected by CACHE_BACKEND"""
+    if CACHE_BACKEND == 'json':
+        return JsonCacheStore(CACHE_FILE)
+    # The SQLite store imports the legacy JSON cache the first time it starts
+    return SqliteCacheStore(CACHE_DB_FILE, CACHE_DURATION, import_json_path=CACHE_FILE)
+
+def url_cache_key_for(url):
+    """Stable cache key for a listing URL (identical across restarts and worker processes)"""
+    digest = hashlib.sha256(canonical_url(url).encode('utf-8')).hexdigest()
+    return f"url_{digest[:24]}"
+
+def drop_orphaned_url_entries():
+    """
+    Remove 'url_<hash()>' entries written before URL keys were deterministic;
+    Python's per-process string hash made them unreachable after a restart
+    """
+    orphaned = [key for key in PLZ_CACHE.keys() if LEGACY_URL_KEY.match(key)]
+    if orphaned:
+        PLZ_CACHE.delete_many(orphaned)
+        log.info("Dropped %d orphaned URL cache entries", len(orphaned))
 
 def load_cache():
-    """Load cache from disk"""
-    global PLZ_CACHE
-    if os.path.exists(CACHE_FILE):
+    """Load cache from disk, deleting entries past the hard TTL from the SQLite store first"""
+    if isinstance(CACHE_STORE, SqliteCacheStore):
         try:
-            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-                # Convert string timestamps back to datetime objects
-                for plz, data in cache_data.items():
-                    if 'timestamp' in data:
-                        data['timestamp'] = datetime.fromisoformat(data['timestamp'])
-                PLZ_CACHE = cache_data
-                print(f"✓ Loaded {len(PLZ_CACHE)} cached PLZ entries")
+            purged = CACHE_STORE.purge_expired()
+            if purged:
+                log.info("Purged %d expired cache entries", purged)
         except Exception as e:
-            print(f"Warning: Could not load cache: {e}")
-            PLZ_CACHE = {}
+            log.warning("Could not purge expired cache entries: %s", e)
+    count = PLZ_CACHE.load()
+    log.info("Loaded %d cached PLZ entries (%s store)", count, CACHE_BACKEND)
+    drop_orphaned_url_entries()
 
-def save_cache():
-    """Save cache to disk"""
-    try:
-        os.makedirs('data', exist_ok=True)
-        # Convert datetime objects to strings for JSON serialization
-        cache_data = {}
-        for plz, data in PLZ_CACHE.items():
-            cache_entry = data.copy()
-            if 'timestamp' in cache_entry:
-                cache_entry['timestamp'] = cache_entry['timestamp'].isoformat()
-            cache_data[plz] = cache_entry
-        
-        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, ensure_ascii=False, indent=2)
-        print(f"✓ Saved {len(cache_data)} PLZ entries to cache")
-    except Exception as e:
-        print(f"Warning: Could not save cache: {e}")
+def get_cache_entry(plz):
+    """Get the cache entry ({'data', 'timestamp', prepared response fields}) within the hard TTL, or None"""
+    # Past the soft TTL another worker may already have refreshed the entry in the shared store
+    with phase('cache_read'):
+        return PLZ_CACHE.get(plz, refresh_after=CACHE_SOFT_TTL)
 
 def get_cached_result(plz):
-    """Get cached result if available and not expired"""
-    if plz in PLZ_CACHE:
-        cache_entry = PLZ_CACHE[plz]
-        timestamp = cache_entry.get('timestamp')
-        if timestamp and datetime.now() - timestamp < CACHE_DURATION:
-            print(f"✓ Using cached result for PLZ {plz} (cached {(datetime.now() - timestamp).days} days ago)")
-            return cache_entry.get('data')
-        else:
-            print(f"Cache expired for PLZ {plz}")
-            del PLZ_CACHE[plz]
+    """Get cached result if available and still fresh (within the soft TTL)"""
+    cache_entry = get_cache_entry(plz)
+    data = cache_entry.get('data') if cache_entry else None
+    age = datetime.now() - cache_entry['timestamp'] if data else None
+    if data and age < CACHE_SOFT_TTL:
+        log.debug("Using cached result for %s (cached %d days ago)", plz, age.days)
+        return data
     return None
 
 def cache_result(plz, data):
     """Cache a result"""
-    PLZ_CACHE[plz] = {
-        'data': data,
-        'timestamp': datetime.now()
-    }
-    save_cache()
+    with phase('cache_write'):
+        PLZ_CACHE.put(plz, data)
 
+CACHE_STORE = create_cache_store()
+# Entries keep their response body (and its gzip/brotli encodings) ready to send
+PLZ_CACHE = ConcurrentCache(CACHE_STORE, CACHE_DURATION, prepare=prepare_entry)
+
+# Gauges and counters read from the components' own stats when /metrics is scraped
+METRICS.gauge('abgeordnetenwatch_cache_entries', 'Entries in the PLZ/URL cache', collect=lambda: len(PLZ_CACHE))
+METRICS.counter('abgeordnetenwatch_cache_expirations_total', 'Cache entries dropped after the hard TTL',
+                collect=lambda: PLZ_CACHE.stats()['expired'])
+METRICS.counter('abgeordnetenwatch_cache_store_errors_total', 'Failed cache store reads and writes',
+                collect=lambda: PLZ_CACHE.stats()['store_errors'])
+METRICS.gauge('abgeordnetenwatch_browser_pool_size', 'Maximum Firefox processes', collect=lambda: DRIVER_POOL.size)
+METRICS.gauge('abgeordnetenwatch_browser_pool_alive', 'Running (or starting) Firefox processes',
+              collect=lambda: DRIVER_POOL.stats()['alive'])
+METRICS.gauge('abgeordnetenwatch_browser_pool_in_use', 'Firefox processes leased by a scrape',
+              collect=lambda: DRIVER_POOL.stats()['in_use'])
+METRICS.gauge('abgeordnetenwatch_browser_pool_waiting', 'Scrapes waiting for a free browser',
+              collect=lambda: DRIVER_POOL.stats()['queue_depth'])
+METRICS.counter('abgeordnetenwatch_browser_pool_recycled_total', 'Browsers retired after DRIVER_MAX_USES scrapes',
+                collect=lambda: DRIVER_POOL.stats()['recycled'])
+METRICS.counter('abgeordnetenwatch_browser_pool_crashed_total', 'Browsers discarded as unresponsive',
+                collect=lambda: DRIVER_POOL.stats()['crashed'])
+METRICS.counter('abgeordnetenwatch_log_records_dropped_total', 'Log records dropped because the log queue was full',
+                collect=dropped_records)
+METRICS.gauge('abgeordnetenwatch_scrape_slots_in_use', 'Scrapes running in this worker',
+              collect=lambda: SCRAPE_ADMISSION.stats()['active'])
+METRICS.gauge('abgeordnetenwatch_scrape_queue_depth', 'Request scrapes waiting for a slot',
+              collect=lambda: SCRAPE_ADMISSION.stats()['waiting'])
+METRICS.gauge('abgeordnetenwatch_scrape_background_queue_depth', 'Batch, job and refresh scrapes waiting for a slot',
+              collect=lambda: SCRAPE_ADMISSION.stats()['background_waiting'])
+METRICS.counter('abgeordnetenwatch_scrape_rejected_total',
+                'Scrapes shed with a 503 (queue_full, timeout or background_timeout)', ['reason'],
+                collect=lambda: {(reason,): count for reason, count in SCRAPE_ADMISSION.stats()['rejected'].items()})
+METRICS.gauge('abgeordnetenwatch_sse_streams_open', 'Job event streams open in this worker',
+              collect=lambda: _sse_streams['open'])
+METRICS.counter('abgeordnetenwatch_sse_streams_rejected_total', 'Job event streams refused at SSE_MAX_STREAMS',
+                collect=lambda: _sse_streams['rejected'])
+METRICS.counter('abgeordnetenwatch_scrape_flights_coalesced_total', 'Requests that joined a scrape already in flight',
+                collect=lambda: SCRAPE_FLIGHTS.stats()['merged_callers'])
 load_cache()
 
+def enrich_politician(mp_data):
+    """
+    Add contact URL and gender to a scraped politician record
+    """
+    # Contact URL and gender come from the MP's record; unknown names fall back to name-based gender
+    mp = MP_INDEX.lookup(mp_data['name'])
+    if mp is None:
+        mp = FUZZY_NAMES.match(mp_data['name'], party=mp_data.get('party'), constituency=mp_data.get('constituency'))
+    mp_data['contact_url'] = mp.contact_url if mp else None
+    mp_data['gender'] = mp.gender if mp and mp.gender != 'unknown' else detect_gender(mp_data['name'])
+    
+    log.debug("Enriched %s (%s)", mp_data['name'], mp_data['party'],
+              extra={'mdb_id': mp.mdb_id if mp else None})
+    return mp_data
+
+
+def extract_politicians(driver):
+    """
+    Extract all politician tiles from the page currently loaded in the driver
+    """
+    records, seconds = TILE_EXTRACTOR.politicians(driver)
+    record_scrape_phase('selenium', 'extract', seconds)
+    # The browser resolved links against the host it loaded the page from
+    for mp_data in records:
+        mp_data['profile_url'] = site_url(mp_data['profile_url'])
+        mp_data['image_url'] = site_url(mp_data['image_url'])
+    POLITICIANS_PER_PAGE.observe(len(records), backend='selenium')
+    log.info("Found %d politicians", len(records),
+             extra={'backend': 'selenium', 'politicians': len(records), 'extract_ms': round(seconds * 1000, 1)})
+    
+    politicians = []
+    with scrape_phase('selenium', 'enrich'):
+        for mp_data in records:
+            try:
+                politicians.append(enrich_politician(mp_data))
+            except Exception as e:
+                log.warning("Error extracting politician: %s", e)
+                continue
+    
+    return politicians
+
+
 def scrape_abgeordnetenwatch_by_plz(plz):
     """
     Scrape MPs from abgeordnetenwatch.de for a given PLZ
     """
-    base_url = "https://www.abgeordnetenwatch.de/bundestag/abgeordnete"
+    base_url = f"{ABGEORDNETENWATCH_URL}/bundestag/abgeordnete"
     params = {
         'politician_search_keys': plz,
         'fraction': 'All',
@@ -228,124 +392,374 @@ def scrape_abgeordnetenwatch_by_plz(plz):
     
     url = f"{base_url}?{'&'.join([f'{k}={v}' for k, v in params.items()])}"
     
-    print(f"Scraping: {url}")
+    log.info("Scraping %s", url)
     
-    # Setup Firefox with headless mode
-    firefox_options = Options()
-    firefox_options.add_argument('--headless')
+    return scrape_listing(url)
+
+
+def scrape_abgeordnetenwatch_url(url):
+    """
+    Scrape MPs from a specific abgeordnetenwatch.de listing URL (e.g. one Wahlkreis option)
+    """
+    # Clients send site URLs; fetch them from ABGEORDNETENWATCH_URL when that is overridden
+    return scrape_listing(fetch_url(url), allow_multiple=False)
+
+
+def scrape_listing(url, allow_multiple=True):
+    """
+    Scrape a listing page with the configured backend, falling back to Selenium
+    when the HTTP backend cannot parse the page. Every scrape (request, batch,
+    job or background refresh) needs one of this worker's scrape slots; the
+    ones started in_background_lane() wait behind request scrapes.
+    """
+    with SCRAPE_ADMISSION.slot(background=getattr(_scrape_lane, 'background', False)) as queued:
+        record_timing('queue', queued)
+        if SCRAPER_BACKEND == 'http':
+            try:
+                return timed_scrape('http', scrape_with_http, url, allow_multiple)
+            except ListingParseError as e:
+                log.warning("HTTP scrape could not parse page (%s), falling back to Selenium", e)
+        
+        return timed_scrape('selenium', scrape_with_selenium, url, allow_multiple)
+
+
+def timed_scrape(backend, scrape, url, allow_multiple):
+    """Run one backend's scrape, recording its duration and any error by type"""
+    try:
+        with SCRAPE_SECONDS.time(backend=backend):
+            return scrape(url, allow_multiple)
+    except Exception as e:
+        SCRAPE_ERRORS.inc(backend=backend, type=type(e).__name__)
+        raise
+
+
+def scrape_with_http(url, allow_multiple=True):
+    """
+    Fetch the listing over the pooled HTTP session and parse it with lxml
+    """
+    with scrape_phase('http', 'fetch'):
+        content = fetch_listing(HTTP_SESSION, url, timeout=PAGE_WAIT_TIMEOUT)
+    with scrape_phase('http', 'parse'):
+        # Links are resolved against the public site, not the host the page came from
+        results = parse_listing(content, site_url(url), allow_multiple=allow_multiple)
     
-    driver = webdriver.Firefox(options=firefox_options)
+    if isinstance(results, dict):
+        log.info("Multiple Wahlkreis options found", extra={'backend': 'http', 'options': len(results['options'])})
+        for option in results['options']:
+            log.debug("Option: %s", option['title'])
+        return results
     
-    try:
-        driver.get(url)
-        time.sleep(3)  # Wait for page to load
+    log.info("Found %d politicians", len(results), extra={'backend': 'http', 'politicians': len(results)})
+    POLITICIANS_PER_PAGE.observe(len(results), backend='http')
+    with scrape_phase('http', 'enrich'):
+        return [enrich_politician(mp_data) for mp_data in results]
+
+
+def scrape_with_selenium(url, allow_multiple=True):
+    """
+    Load the listing in a pooled Firefox and extract it via WebDriver
+    """
+    wait_for = list(READY_CONDITIONS) if allow_multiple else ['politicians', 'empty']
+    
+    lease_started = time.perf_counter()
+    with DRIVER_POOL.lease() as driver:
+        record_scrape_phase('selenium', 'lease', time.perf_counter() - lease_started)
+        with scrape_phase('selenium', 'page_load'):
+            driver.get(url)
+        matched, waited = PAGE_WAITER.wait(driver, wait_for)
+        record_scrape_phase('selenium', 'wait', waited)
+        log.debug("Page ready after %.2fs (%s)", waited, matched)
         
         # CHECK IF MULTIPLE WAHLKREIS OPTIONS ARE SHOWN
-        try:
-            # Look for message indicating multiple results
-            multi_result_msg = driver.find_element(By.XPATH, "//p[contains(text(), 'wurden mehrere Ergebnisse gefunden')]")
-            if multi_result_msg:
-                print("Multiple Wahlkreis options found")
-                wahlkreis_options = []
-                
-                # Find all option tiles
-                option_tiles = driver.find_elements(By.CSS_SELECTOR, "article.tile")
-                
-                for tile in option_tiles:
-                    try:
-                        title_elem = tile.find_element(By.CSS_SELECTOR, ".tile__title")
-                        title = title_elem.text.strip()
-                        
-                        link_elem = tile.find_element(By.CSS_SELECTOR, ".tile__links a")
-                        link = link_elem.get_attribute('href')
-                        
-                        wahlkreis_options.append({
-                            'title': title,
-                            'url': link
-                        })
-                        print(f"  Option: {title}")
-                    except:
-                        continue
-                
-                if wahlkreis_options:
-                    return {
-                        'type': 'multiple_wahlkreis',
-                        'options': wahlkreis_options
-                    }
-        except:
-            # Not a multiple result page, continue with normal scraping
-            pass
-        
-        # Find all politician tiles
-        politician_elements = driver.find_elements(By.CSS_SELECTOR, "article.tile--politician")
-        print(f"Found {len(politician_elements)} politicians")
-        
-        politicians = []
-        
-        for element in politician_elements:
-            try:
-                mp_data = {}
-                
-                # Find name
-                try:
-                    name_div = element.find_element(By.CSS_SELECTOR, ".tile__politician__name")
-                    mp_data['name'] = name_div.text.strip()
-                except:
-                    continue
-                
-                # Find profile URL
-                try:
-                    profile_link = element.find_element(By.CSS_SELECTOR, "a[href*='/profile/']")
-                    href = profile_link.get_attribute('href')
-                    if href.startswith('/'):
-                        mp_data['profile_url'] = "https://www.abgeordnetenwatch.de" + href
-                    else:
-                        mp_data['profile_url'] = href
-                except:
-                    mp_data['profile_url'] = None
-                
-                # Find party
-                try:
-                    party_element = element.find_element(By.CSS_SELECTOR, ".tile__politician__party")
-                    mp_data['party'] = party_element.text.strip()
-                except:
-                    mp_data['party'] = 'Unknown'
-                
-                # Find constituency
-                try:
-                    constituency_element = element.find_element(By.CSS_SELECTOR, ".politician-tile__candidacy-mandate-constituency")
-                    mp_data['constituency'] = constituency_element.text.strip()
-                except:
-                    mp_data['constituency'] = 'N/A'
-                
-                # Find image
-                try:
-                    img_element = element.find_element(By.CSS_SELECTOR, ".tile__politician__image img")
-                    src = img_element.get_attribute('src')
-                    if src.startswith('/'):
-                        mp_data['image_url'] = "https://www.abgeordnetenwatch.de" + src
-                    else:
-                        mp_data['image_url'] = src
-                except:
-                    mp_data['image_url'] = None
-                                # Add contact URL from archived data (normalize name for matching)
-                name_key = normalize_name(mp_data['name']).lower()
-                mp_data['contact_url'] = CONTACT_URL_MAP.get(name_key, None)
-                
-                # Detect gender from name
-                mp_data['gender'] = detect_gender(mp_data['name'])
-                
-                politicians.append(mp_data)
-                print(f"✓ {mp_data['name']} ({mp_data['party']})")
+        if matched == 'multiple_wahlkreis':
+            wahlkreis_options, seconds = TILE_EXTRACTOR.wahlkreis_options(driver)
+            record_scrape_phase('selenium', 'extract', seconds)
+            for option in wahlkreis_options:
+                option['url'] = site_url(option['url'])
+            log.info("Multiple Wahlkreis options found", extra={
+                'backend': 'selenium', 'options': len(wahlkreis_options), 'extract_ms': round(seconds * 1000, 1)})
+            for option in wahlkreis_options:
+                log.debug("Option: %s", option['title'])
             
-            except Exception as e:
-                print(f"Error extracting politician: {e}")
-                continue
+            if wahlkreis_options:
+                return {
+                    'type': 'multiple_wahlkreis',
+                    'options': wahlkreis_options
+                }
         
-        return politicians
+        return extract_politicians(driver)
+
+
+def in_background_lane(fn):
+    """Wrap fn (run on an executor thread) so its scrapes use the background admission lane"""
+    def run(*args, **kwargs):
+        _scrape_lane.background = True
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _scrape_lane.background = False
+    return run
+
+
+def lookup_plz(plz):
+    """
+    Scrape and cache the response for a PLZ.
+    Concurrent callers for the same PLZ share a single scrape; returns (response_data, callers).
+    """
+    return SCRAPE_FLIGHTS.do(plz, lambda: scrape_plz_response(plz))
+
+
+def scrape_plz_response(plz, refresh=False):
+    """
+    Build (and cache) the /api/search response for a PLZ by scraping.
+    With refresh=True the PLZ is scraped even if a fresh cache entry exists.
+    """
+    # A previous flight may have filled the cache after our own cache miss
+    cached = None if refresh else get_cached_result(plz)
+    if cached:
+        return cached
     
-    finally:
-        driver.quit()
+    results = scrape_abgeordnetenwatch_by_plz(plz)
+    
+    # Check if results indicate multiple Wahlkreis options
+    if isinstance(results, dict) and results.get('type') == 'multiple_wahlkreis':
+        response_data = {
+            'plz': plz,
+            'type': 'multiple_wahlkreis',
+            'message': f'PLZ {plz} gehört zu mehreren Wahlkreisen',
+            'options': results['options']
+        }
+        # Cache the result
+        cache_result(plz, response_data)
+        return response_data
+    
+    response_data = {
+        'plz': plz,
+        'type': 'members',
+        'count': len(results),
+        'members': results
+    }
+    
+    # Cache the result
+    cache_result(plz, response_data)
+    
+    return response_data
+
+
+def lookup_url(url, url_cache_key):
+    """
+    Scrape and cache the response for a Wahlkreis URL, coalescing concurrent callers
+    """
+    return SCRAPE_FLIGHTS.do(url_cache_key, lambda: scrape_url_response(url, url_cache_key))
+
+
+def scrape_url_response(url, url_cache_key):
+    """
+    Build (and cache) the /api/scrape-url response for a URL by scraping
+    """
+    cached = get_cached_result(url_cache_key)
+    if cached:
+        return cached
+    
+    politicians = scrape_abgeordnetenwatch_url(url)
+    
+    response_data = {
+        'type': 'members',
+        'count': len(politicians),
+        'members': politicians
+    }
+    
+    # Cache the result
+    cache_result(url_cache_key, response_data)
+    
+    return response_data
+
+
+def schedule_refresh(key, refresh):
+    """
+    Queue a background re-scrape of a stale cache entry (at most one pending per key)
+    """
+    with PENDING_REFRESHES_LOCK:
+        if key in PENDING_REFRESHES:
+            return
+        PENDING_REFRESHES.add(key)
+    
+    def run():
+        try:
+            SCRAPE_FLIGHTS.do(key, refresh)
+        except Exception as e:
+            log.warning("Background refresh of %s failed: %s", key, e, extra={'error_type': type(e).__name__})
+        finally:
+            with PENDING_REFRESHES_LOCK:
+                PENDING_REFRESHES.discard(key)
+    
+    REFRESH_EXECUTOR.submit(in_background_lane(run))
+
+
+# A result answered without scraping; entry is the prepared cache entry (None for offline answers)
+LocalAnswer = namedtuple('LocalAnswer', 'data source last_modified entry')
+
+def lookup_plz_local(plz):
+    """
+    Answer a PLZ without scraping: from the offline Wahlkreis index or the cache
+    (stale entries are returned while a background refresh runs).
+    Returns a LocalAnswer with source 'OFFLINE', 'HIT' or 'STALE', or None.
+    """
+    # Answer from the local PLZ -> Wahlkreis index when the PLZ is mapped
+    with phase('offline'):
+        resolved = WAHLKREIS_RESOLVER.resolve_plz(plz)
+    if resolved:
+        return LocalAnswer(resolved, 'OFFLINE', WAHLKREIS_RESOLVER.modified, None)
+    
+    # Try to get cached result (stale results are served while a refresh runs)
+    cache_entry = get_cache_entry(plz)
+    if cache_entry:
+        timestamp = cache_entry['timestamp']
+        if datetime.now() - timestamp >= CACHE_SOFT_TTL:
+            log.info("Stale cache hit, refreshing in background", extra={'source': 'STALE', 'plz': plz})
+            schedule_refresh(plz, lambda: scrape_plz_response(plz))
+            return LocalAnswer(cache_entry['data'], 'STALE', timestamp, cache_entry)
+        log.info("Cache hit", extra={'source': 'HIT', 'plz': plz})
+        return LocalAnswer(cache_entry['data'], 'HIT', timestamp, cache_entry)
+    
+    return None
+
+
+def lookup_url_local(url, url_cache_key):
+    """
+    Answer a Wahlkreis URL without scraping; same contract as lookup_plz_local
+    """
+    # Follow-up clicks on options from the offline index resolve locally too
+    with phase('offline'):
+        resolved = WAHLKREIS_RESOLVER.resolve_url(url)
+    if resolved:
+        return LocalAnswer(resolved, 'OFFLINE', WAHLKREIS_RESOLVER.modified, None)
+    
+    cache_entry = get_cache_entry(url_cache_key)
+    if cache_entry:
+        timestamp = cache_entry['timestamp']
+        if datetime.now() - timestamp >= CACHE_SOFT_TTL:
+            log.info("Stale cache hit, refreshing in background", extra={'source': 'STALE', 'cache_key': url_cache_key})
+            schedule_refresh(url_cache_key, lambda: scrape_url_response(url, url_cache_key))
+            return LocalAnswer(cache_entry['data'], 'STALE', timestamp, cache_entry)
+        log.info("Cache hit", extra={'source': 'HIT', 'cache_key': url_cache_key})
+        return LocalAnswer(cache_entry['data'], 'HIT', timestamp, cache_entry)
+    
+    return None
+
+
+def cache_lifetimes(age):
+    """
+    (max_age, stale_while_revalidate) from the remaining cache TTL: clients may
+    reuse a response until the soft TTL runs out, then for the rest of the hard
+    TTL while they revalidate in the background (304 if unchanged)
+    """
+    max_age = max(CACHE_SOFT_TTL - age, timedelta(0))
+    return max_age, max(CACHE_DURATION - age - max_age, timedelta(0))
+
+
+def cached_json_response(data, last_modified, age=timedelta(0)):
+    """
+    JSON response with HTTP validators and freshness from the remaining cache TTL;
+    serialized like prepared cache entries so a later hit carries the same ETag
+    """
+    response = Response(serialize(data), mimetype='application/json')
+    return cacheable_response(response, last_modified, *cache_lifetimes(age))
+
+
+def local_response(answer):
+    """JSON response for a LocalAnswer; X-Cache names the source"""
+    if answer.entry is not None:
+        # Cache hit: send the bytes prepared when the entry was stored
+        age = datetime.now() - answer.last_modified
+        response = prepared_response(answer.entry, *cache_lifetimes(age))
+    else:
+        # Offline answers only change with the data files, so they start fresh
+        response = cached_json_response(answer.data, answer.last_modified)
+    response.headers['X-Cache'] = answer.source
+    return response
+
+
+def describe_scrape_error(e):
+    """(user-facing message, HTTP status) for an exception raised while scraping"""
+    if isinstance(e, (ScrapeRejected, DriverPoolTimeout)):
+        return 'Server is busy, please try again shortly', 503
+    if isinstance(e, (PageWaitTimeout, requests.Timeout)):
+        return 'abgeordnetenwatch.de did not respond in time, please try again', 504
+    if isinstance(e, requests.RequestException):
+        # The exception text names hosts and URLs of our upstream; it is only logged
+        return 'Could not reach abgeordnetenwatch.de, please try again', 502
+    return str(e), 500
+
+
+def log_scrape_error(e, status, **fields):
+    """Timeouts, unreachable upstreams and a busy pool are warnings; anything else is an error with its traceback"""
+    fields.update(status=status, error_type=type(e).__name__)
+    if status == 500:
+        log.error("Scrape failed: %s", e, exc_info=e, extra=fields)
+    else:
+        log.warning("Scrape failed: %s", e, extra=fields)
+
+
+def scrape_error_response(e):
+    """JSON error response for a failed scrape; a busy server says when to retry"""
+    message, status = describe_scrape_error(e)
+    log_scrape_error(e, status)
+    response = jsonify({'error': message})
+    response.status_code = status
+    if status == 503:
+        retry_after = e.retry_after if isinstance(e, ScrapeRejected) else SCRAPE_ADMISSION.retry_after()
+        response.headers['Retry-After'] = str(retry_after)
+    return response
+
+
+def coalesced_response(response_data, callers):
+    """JSON response that reports how many concurrent requests shared the scrape"""
+    if callers > 1:
+        log.info("%d concurrent requests shared one scrape", callers, extra={'callers': callers})
+    response = cached_json_response(response_data, datetime.now())
+    response.headers['X-Cache'] = 'MISS'
+    response.headers['X-Coalesced-Requests'] = str(callers)
+    return response
+
+
+def job_payload(job):
+    """Public view of a scrape job"""
+    payload = {'job_id': job.id, 'status': job.status}
+    if job.status == 'done':
+        payload['result'] = job.result
+    elif job.status == 'error':
+        payload['error'], payload['error_status'] = describe_scrape_error(job.error)
+    return payload
+
+
+def job_accepted_response(job):
+    """202 response pointing the client at the job's poll and event URLs"""
+    payload = job_payload(job)
+    payload['poll_url'] = f"/api/jobs/{job.id}"
+    payload['events_url'] = f"/api/jobs/{job.id}/events"
+    response = jsonify(payload)
+    response.status_code = 202
+    response.headers['Location'] = payload['poll_url']
+    response.headers['X-Cache'] = 'MISS'
+    return response
+
+
+@app.after_request
+def record_request_metrics(response):
+    """
+    Latency, status and cache result per route. Runs before compression; for
+    streamed responses (NDJSON, SSE) the latency is the time to the headers.
+    """
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    started = g.get('request_started')
+    if started is not None:
+        REQUEST_SECONDS.observe(time.perf_counter() - started, route=route, method=request.method)
+    REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+    cache_result_header = response.headers.get('X-Cache')
+    if cache_result_header:
+        CACHE_RESULTS.inc(route=route, result=cache_result_header.lower())
+    return response
 
 
 @app.route('/api/search', methods=['GET'])
@@ -362,44 +776,25 @@ def search_plz():
         return jsonify({'error': 'PLZ must be a 5-digit number'}), 400
     
     try:
-        print(f"Searching for PLZ: {plz}")
+        log.debug("Searching for PLZ %s", plz)
         
-        # Try to get cached result first
-        cached = get_cached_result(plz)
-        if cached:
-            print(f"⚡ Returning cached result for PLZ {plz}")
-            return jsonify(cached)
+        answer = lookup_plz_local(plz)
+        if answer:
+            return local_response(answer)
         
-        # If no cache, scrape the data
-        results = scrape_abgeordnetenwatch_by_plz(plz)
+        # In async mode hand the scrape to a job and answer immediately
+        if request.args.get('async') == '1':
+            job = SCRAPE_JOBS.submit(plz, in_background_lane(lambda: lookup_plz(plz)[0]))
+            return job_accepted_response(job)
         
-        # Check if results indicate multiple Wahlkreis options
-        if isinstance(results, dict) and results.get('type') == 'multiple_wahlkreis':
-            response_data = {
-                'plz': plz,
-                'type': 'multiple_wahlkreis',
-                'message': f'PLZ {plz} gehört zu mehreren Wahlkreisen',
-                'options': results['options']
-            }
-            # Cache the result
-            cache_result(plz, response_data)
-            return jsonify(response_data)
+        # If no cache, scrape the data (shared with concurrent requests for the same PLZ)
+        with phase('scrape'):
+            response_data, callers = lookup_plz(plz)
         
-        response_data = {
-            'plz': plz,
-            'type': 'members',
-            'count': len(results),
-            'members': results
-        }
-        
-        # Cache the result
-        cache_result(plz, response_data)
-        
-        return jsonify(response_data)
+        return coalesced_response(response_data, callers)
     
     except Exception as e:
-        print(f"Error: {e}")
-        return jsonify({'error': str(e)}), 500
+        return scrape_error_response(e)
 
 
 @app.route('/api/scrape-url', methods=['GET'])
@@ -412,118 +807,191 @@ def scrape_url():
     if not url:
         return jsonify({'error': 'URL parameter is required'}), 400
     
-    if not url.startswith('https://www.abgeordnetenwatch.de'):
+    if not url.startswith(SITE_URL):
         return jsonify({'error': 'Invalid URL - must be from abgeordnetenwatch.de'}), 400
     
     try:
-        print(f"Scraping URL: {url}")
+        log.debug("Looking up URL %s", url)
         
         # Create a cache key from the URL
-        url_cache_key = f"url_{hash(url)}"
+        url_cache_key = url_cache_key_for(url)
         
-        # Try to get cached result
-        cached = get_cached_result(url_cache_key)
-        if cached:
-            print(f"⚡ Returning cached result for URL")
-            return jsonify(cached)
+        answer = lookup_url_local(url, url_cache_key)
+        if answer:
+            return local_response(answer)
         
-        # Setup Firefox with headless mode
-        firefox_options = Options()
-        firefox_options.add_argument('--headless')
-        driver = webdriver.Firefox(options=firefox_options)
+        if request.args.get('async') == '1':
+            job = SCRAPE_JOBS.submit(url_cache_key, in_background_lane(lambda: lookup_url(url, url_cache_key)[0]))
+            return job_accepted_response(job)
         
-        try:
-            driver.get(url)
-            time.sleep(3)
-            
-            # Find all politician tiles
-            politician_elements = driver.find_elements(By.CSS_SELECTOR, "article.tile--politician")
-            print(f"Found {len(politician_elements)} politicians")
-            
-            politicians = []
-            
-            for element in politician_elements:
-                try:
-                    mp_data = {}
-                    
-                    # Find name
-                    try:
-                        name_div = element.find_element(By.CSS_SELECTOR, ".tile__politician__name")
-                        mp_data['name'] = name_div.text.strip()
-                    except:
-                        continue
-                    
-                    # Find profile URL
-                    try:
-                        profile_link = element.find_element(By.CSS_SELECTOR, "a[href*='/profile/']")
-                        href = profile_link.get_attribute('href')
-                        if href.startswith('/'):
-                            mp_data['profile_url'] = "https://www.abgeordnetenwatch.de" + href
-                        else:
-                            mp_data['profile_url'] = href
-                    except:
-                        mp_data['profile_url'] = None
-                    
-                    # Find party
-                    try:
-                        party_element = element.find_element(By.CSS_SELECTOR, ".tile__politician__party")
-                        mp_data['party'] = party_element.text.strip()
-                    except:
-                        mp_data['party'] = 'Unknown'
-                    
-                    # Find constituency
-                    try:
-                        constituency_element = element.find_element(By.CSS_SELECTOR, ".politician-tile__candidacy-mandate-constituency")
-                        mp_data['constituency'] = constituency_element.text.strip()
-                    except:
-                        mp_data['constituency'] = 'N/A'
-                    
-                    # Find image
-                    try:
-                        img_element = element.find_element(By.CSS_SELECTOR, ".tile__politician__image img")
-                        src = img_element.get_attribute('src')
-                        if src.startswith('/'):
-                            mp_data['image_url'] = "https://www.abgeordnetenwatch.de" + src
-                        else:
-                            mp_data['image_url'] = src
-                    except:
-                        mp_data['image_url'] = None
-                    
-                    # Add contact URL and gender
-                    name_key = normalize_name(mp_data['name']).lower()
-                    mp_data['contact_url'] = CONTACT_URL_MAP.get(name_key, None)
-                    mp_data['gender'] = detect_gender(mp_data['name'])
-                    
-                    politicians.append(mp_data)
-                    print(f"✓ {mp_data['name']} ({mp_data['party']})")
-                
-                except Exception as e:
-                    print(f"Error extracting politician: {e}")
-                    continue
-            
-            response_data = {
-                'type': 'members',
-                'count': len(politicians),
-                'members': politicians
-            }
-            
-            # Cache the result
-            cache_result(url_cache_key, response_data)
-            
-            return jsonify(response_data)
+        with phase('scrape'):
+            response_data, callers = lookup_url(url, url_cache_key)
         
-        finally:
-            driver.quit()
+        return coalesced_response(response_data, callers)
     
     except Exception as e:
-        print(f"Error: {e}")
-        return jsonify({'error': str(e)}), 500
+        return scrape_error_response(e)
+
+
+@app.route('/api/search/batch', methods=['POST'])
+def search_batch():
+    """
+    API endpoint to look up many PLZs in one request.
+    Body: {"plz": ["10961", "28195", ...]}. Results come back in request order;
+    with ?stream=1 (or Accept: application/x-ndjson) each result is streamed as
+    one NDJSON line as soon as it is ready, cached PLZs first.
+    """
+    payload = request.get_json(silent=True)
+    plzs = payload.get('plz') if isinstance(payload, dict) else payload
+    
+    if not isinstance(plzs, list) or not plzs:
+        return jsonify({'error': 'Request body must be {"plz": [<PLZ>, ...]}'}), 400
+    
+    # Dedupe while keeping the caller's order
+    unique = list(dict.fromkeys(str(plz).strip() for plz in plzs))
+    if len(unique) > BATCH_MAX_PLZ:
+        return jsonify({'error': f'At most {BATCH_MAX_PLZ} PLZs per batch'}), 400
+    
+    log.info("Batch lookup for %d PLZs (%d submitted)", len(unique), len(plzs))
+    
+    stream = request.args.get('stream') == '1' or \
+        request.accept_mimetypes.best == 'application/x-ndjson'
+    
+    def results():
+        misses = []
+        for plz in unique:
+            if not plz.isdigit() or len(plz) != 5:
+                yield {'plz': plz, 'error': 'PLZ must be a 5-digit number', 'status': 400}
+                continue
+            answer = lookup_plz_local(plz)
+            if answer:
+                yield {'plz': plz, 'source': answer.source, 'result': answer.data}
+            else:
+                misses.append(plz)
+        
+        # Scrape misses on the shared batch executor so one batch cannot launch unbounded scrapes
+        # and its scrapes only ever take slots interactive misses leave free
+        futures = {BATCH_EXECUTOR.submit(in_background_lane(lookup_plz), plz): plz for plz in misses}
+        for future in as_completed(futures):
+            plz = futures[future]
+            try:
+                data, callers = future.result()
+                yield {'plz': plz, 'source': 'MISS', 'result': data}
+            except Exception as e:
+                message, status = describe_scrape_error(e)
+                log_scrape_error(e, status, plz=plz)
+                yield {'plz': plz, 'error': message, 'status': status}
+    
+    if stream:
+        def ndjson():
+            for item in results():
+                yield json.dumps(item, ensure_ascii=False) + '\n'
+        return Response(ndjson(), mimetype='application/x-ndjson')
+    
+    order = {plz: index for index, plz in enumerate(unique)}
+    items = sorted(results(), key=lambda item: order[item['plz']])
+    return jsonify({
+        'count': len(items),
+        'errors': sum(1 for item in items if 'error' in item),
+        'results': items
+    })
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    API endpoint to poll an async scrape job
+    """
+    job = SCRAPE_JOBS.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    return jsonify(job_payload(job))
+
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """
+    Server-sent events for an async scrape job: 'status' events while it runs,
+    then a single 'done' or 'error' event carrying the same payload as polling.
+    A stream holds a server thread, so at most SSE_MAX_STREAMS are open per
+    worker; beyond that the client gets a 503 and should poll the job.
+    """
+    job = SCRAPE_JOBS.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    
+    with _sse_lock:
+        if _sse_streams['open'] >= SSE_MAX_STREAMS:
+            _sse_streams['rejected'] += 1
+            full = True
+        else:
+            _sse_streams['open'] += 1
+            full = False
+    if full:
+        response = jsonify({'error': 'Too many open event streams, poll the job instead',
+                            'poll_url': f"/api/jobs/{job.id}"})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(SSE_RETRY_AFTER)
+        return response
+    
+    def release():
+        with _sse_lock:
+            _sse_streams['open'] -= 1
+    
+    def events():
+        deadline = time.monotonic() + SSE_TIMEOUT
+        status = None
+        while time.monotonic() < deadline:
+            if job.status != status:
+                status = job.status
+                event = status if job.is_finished else 'status'
+                yield f"event: {event}\ndata: {json.dumps(job_payload(job), ensure_ascii=False)}\n\n"
+                if job.is_finished:
+                    return
+            # Wake up on the next status change, or send a keep-alive comment
+            if job.wait_for_change(status, timeout=15) == status:
+                yield ": keep-alive\n\n"
+        yield f"event: timeout\ndata: {json.dumps({'job_id': job.id, 'status': job.status})}\n\n"
+    
+    response = Response(events(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    # Runs when the server closes the response: finished, timed out or the client went away
+    response.call_on_close(release)
+    return response
+
+
+@app.route('/api/name-matches', methods=['GET'])
+def name_matches():
+    """Scraped names that missed the exact MP index, with their fuzzy match (or none)"""
+    return jsonify(FUZZY_NAMES.report())
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics of this worker process (text exposition format)"""
+    return Response(METRICS.render(), content_type=METRICS_CONTENT_TYPE)
 
 
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({'status': 'ok'})
+    return jsonify({
+        'status': 'ok',
+        'cache': PLZ_CACHE.stats(),
+        'name_cache': name_cache_stats(),
+        'mp_index': MP_INDEX.stats(),
+        'fuzzy_names': FUZZY_NAMES.stats(),
+        'driver_pool': DRIVER_POOL.stats(),
+        'page_waits': PAGE_WAITER.stats(),
+        'tile_extraction': TILE_EXTRACTOR.stats(),
+        'scrape_flights': SCRAPE_FLIGHTS.stats(),
+        'scrape_admission': SCRAPE_ADMISSION.stats(),
+        'offline_index': WAHLKREIS_RESOLVER.stats(),
+        'scrape_jobs': SCRAPE_JOBS.stats(),
+        'event_streams': {'open': _sse_streams['open'], 'max': SSE_MAX_STREAMS,
+                          'rejected': _sse_streams['rejected']}
+    })
 
 
 if __name__ == '__main__':
@@ -535,4 +1003,9 @@ if __name__ == '__main__':
     print("\nOpen abgeordnetenwatch_finder.html in your browser")
     print("=" * 80)
     
+    # With the reloader active only the serving child process should own browsers
+    # The HTTP backend only needs browsers as a fallback, so they start lazily there
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true' and SCRAPER_BACKEND == 'selenium':
+        DRIVER_POOL.start()
+    
     app.run(host='0.0.0.0', port=5000, debug=True)
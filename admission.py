@@ -0,0 +1,142 @@
+"""
+Admission control for scrapes: bounded concurrency, a bounded wait queue and load shedding
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ScrapeRejected(Exception):
+    """Raised when a scrape is not admitted; retry_after is a hint in seconds"""
+
+    def __init__(self, reason, retry_after):
+        self.reason = reason  # 'queue_full' or 'timeout'
+        self.retry_after = retry_after
+        super().__init__(f"Scrape not admitted ({reason}), retry in {retry_after}s")
+
+
+class AdmissionController:
+    """
+    Lets at most `limit` scrapes run at once. Further scrapes wait in FIFO
+    order, at most `max_queue` of them and each for at most `queue_timeout`
+    seconds; beyond that they are rejected immediately with ScrapeRejected
+    instead of piling up browsers and threads.
+
+    Background callers (batches, async jobs, refreshes) use a lane of their
+    own: they hold at most `limit - 1` slots (one when limit is 1), wait
+    behind every interactive caller for up to `background_timeout` seconds
+    and never take one of the `max_queue` places, so a big batch cannot get
+    interactive requests shed.
+
+    Use as `with controller.slot():` around the work. The Retry-After hint
+    is derived from how long recent scrapes held their slot.
+    """
+
+    def __init__(self, limit=2, max_queue=4, queue_timeout=10, max_retry_after=60, background_timeout=300):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_retry_after = max_retry_after
+        self.background_limit = max(1, limit - 1)
+        self.background_timeout = background_timeout
+
+        self._lock = threading.Lock()
+        self._queue = []  # Waiting interactive callers in arrival order, one Event each
+        self._background = []  # Waiting background callers, served only when no interactive caller waits
+        self._active = 0
+        self._background_active = 0
+        self._avg_hold = 1.0  # Seconds; moving average of slot hold times
+
+        self._admitted = 0
+        self._queued = 0
+        self._rejected = {'queue_full': 0, 'timeout': 0, 'background_timeout': 0}
+
+    def _retry_after(self):
+        """Seconds until the queue ahead of a new caller has likely drained (lock held)"""
+        rounds = (len(self._queue) + self._active) / max(self.limit, 1)
+        return min(self.max_retry_after, max(1, math.ceil(self._avg_hold * rounds)))
+
+    def retry_after(self):
+        with self._lock:
+            return self._retry_after()
+
+    def _can_admit(self, background):
+        """Whether a new caller of this lane may take a slot right now (lock held)"""
+        if self._active >= self.limit or self._queue:
+            return False
+        return not background or (not self._background and self._background_active < self.background_limit)
+
+    def _admit(self, background):
+        self._active += 1
+        self._admitted += 1
+        if background:
+            self._background_active += 1
+
+    def _acquire(self, background=False):
+        """Take a slot; returns the seconds spent queued"""
+        with self._lock:
+            if self._can_admit(background):
+                self._admit(background)
+                return 0.0
+            if background:
+                queue, timeout, reason = self._background, self.background_timeout, 'background_timeout'
+            else:
+                if len(self._queue) >= self.max_queue:
+                    self._rejected['queue_full'] += 1
+                    raise ScrapeRejected('queue_full', self._retry_after())
+                queue, timeout, reason = self._queue, self.queue_timeout, 'timeout'
+            turn = threading.Event()
+            queue.append(turn)
+            self._queued += 1
+
+        started = time.monotonic()
+        if turn.wait(timeout):
+            return time.monotonic() - started
+        with self._lock:
+            if turn.is_set():
+                # Handed a slot just as the wait timed out
+                return time.monotonic() - started
+            queue.remove(turn)
+            self._rejected[reason] += 1
+            raise ScrapeRejected(reason, self._retry_after())
+
+    def _release(self, held, background):
+        with self._lock:
+            self._avg_hold += 0.2 * (held - self._avg_hold)
+            self._active -= 1
+            if background:
+                self._background_active -= 1
+            # Hand the slot straight to the longest waiting interactive caller, else to the background lane
+            if self._queue:
+                self._admit(False)
+                self._queue.pop(0).set()
+            elif self._background and self._background_active < self.background_limit:
+                self._admit(True)
+                self._background.pop(0).set()
+
+    @contextmanager
+    def slot(self, background=False):
+        """Hold one scrape slot for the with-block; yields the seconds spent queued"""
+        waited = self._acquire(background)
+        started = time.monotonic()
+        try:
+            yield waited
+        finally:
+            self._release(time.monotonic() - started, background)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'active': self._active,
+                'waiting': len(self._queue),
+                'max_queue': self.max_queue,
+                'background_active': self._background_active,
+                'background_waiting': len(self._background),
+                'admitted': self._admitted,
+                'queued': self._queued,
+                'rejected': dict(self._rejected),
+                'avg_scrape_s': round(self._avg_hold, 2),
+                'retry_after_s': self._retry_after(),
+            }
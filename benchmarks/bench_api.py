@@ -0,0 +1,215 @@
+"""
+Offline latency and throughput of /api/search and /api/scrape-url
+
+Runs the Flask app in-process against the recorded fixtures: the HTTP
+backend fetches them from the local fixture server, the Selenium backend
+loads them through the driver pool with FakeDriver instead of Firefox.
+Nothing touches abgeordnetenwatch.de, and neither Firefox nor geckodriver
+is needed.
+
+For each endpoint it runs closed-loop workloads from --concurrency client
+threads (each request goes through the full WSGI stack and all hooks):
+
+    hit     keys cached beforehand (the same for both backends)
+    miss    a new key per request, so every request scrapes
+    mixed   --hit-ratio of the requests go to cached keys, the rest scrape
+
+and reports throughput and p50/p95/p99 latency of the answered requests,
+plus the requests shed with 503 + Retry-After because more misses arrived
+than SCRAPE_CONCURRENCY and SCRAPE_QUEUE_SIZE allow (set both in the
+environment to try other limits). /api/search misses cycle
+through the single MP, list, multiple Wahlkreis and empty result pages;
+/api/scrape-url misses load the list page for a new constituency URL.
+Clients, server and fixture site share one process (and its GIL), so
+compare runs of this script with each other rather than with production.
+
+Usage: python benchmarks/bench_api.py [--duration 5] [--concurrency 8] [--backend both]
+                                      [--site-delay-ms 0] [--page-load-ms 0] [--command-ms 0]
+                                      [--json results.json]
+       SCRAPE_CONCURRENCY=8 SCRAPE_QUEUE_SIZE=8 python benchmarks/bench_api.py   # no shedding at 8 clients
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import quote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from benchmarks.fake_driver import FakeDriver  # noqa: E402
+from benchmarks.fixture_server import FixtureServer  # noqa: E402
+
+FIXTURES = ['single_mp.html', 'list_mps.html', 'multiple_wahlkreis.html', 'empty.html']
+# PLZs the fixture server answers with FIXTURES[plz % 4]; misses take fresh ones from this range
+PLZ_RANGE = range(20000, 100000)
+WARM_KEYS = 200
+# /api/scrape-url only accepts site URLs; the server fetches them from ABGEORDNETENWATCH_URL
+LISTING_URL = 'https://www.abgeordnetenwatch.de/bundestag/abgeordnete?constituency={}'
+
+
+class Keys:
+    """Cached keys for hits and a supply of never-requested keys for misses"""
+
+    def __init__(self, fresh):
+        self._fresh = fresh
+        self._lock = threading.Lock()
+        self.warm = [self.fresh() for _ in range(WARM_KEYS)]
+
+    def fresh(self):
+        with self._lock:
+            return next(self._fresh)
+
+
+def search_path(plz):
+    return f"/api/search?plz={plz}"
+
+
+def scrape_url_path(constituency):
+    return f"/api/scrape-url?url={quote(LISTING_URL.format(constituency), safe='')}"
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
+
+
+def run_workload(app, keys, path_for, hit_ratio, concurrency, duration):
+    """Closed loop: every thread sends its next request as soon as the previous one is answered"""
+    latencies = []
+    unexpected = []
+    shed = [0]
+    lock = threading.Lock()
+    barrier = threading.Barrier(concurrency + 1)
+    deadline = [0.0]
+
+    def client(seed):
+        rng = random.Random(seed)
+        local, errors, rejected = [], [], 0
+        with app.test_client() as http:
+            barrier.wait()
+            while time.perf_counter() < deadline[0]:
+                hit = rng.random() < hit_ratio
+                path = path_for(rng.choice(keys.warm) if hit else keys.fresh())
+                started = time.perf_counter()
+                response = http.get(path)
+                response.get_data()
+                seconds = time.perf_counter() - started
+                expected = 'HIT' if hit else 'MISS'
+                if response.status_code == 503 and 'Retry-After' in response.headers:
+                    rejected += 1
+                elif response.status_code != 200 or response.headers.get('X-Cache') != expected:
+                    errors.append(f"{path}: {response.status_code} {response.headers.get('X-Cache')}")
+                else:
+                    local.append(seconds)
+        with lock:
+            latencies.extend(local)
+            unexpected.extend(errors)
+            shed[0] += rejected
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    deadline[0] = time.perf_counter() + duration
+    started = time.perf_counter()
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ms = lambda p: percentile(latencies, p) * 1000 if latencies else float('nan')
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed,
+        'p50_ms': ms(0.50),
+        'p95_ms': ms(0.95),
+        'p99_ms': ms(0.99),
+        'shed': shed[0],
+        'unexpected': len(unexpected),
+        'unexpected_sample': unexpected[:3],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--duration', type=float, default=5, help='Seconds per workload (default: 5)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Client threads (default: 8)')
+    parser.add_argument('--hit-ratio', type=float, default=0.9, help='Share of cached keys in the mixed workload')
+    parser.add_argument('--backend', choices=['http', 'selenium', 'both'], default='both')
+    parser.add_argument('--site-delay-ms', type=float, default=0, help='Latency the fixture server adds per page')
+    parser.add_argument('--page-load-ms', type=float, default=0, help='Extra page load time of the fake browser')
+    parser.add_argument('--command-ms', type=float, default=0, help='Latency of one fake WebDriver command')
+    parser.add_argument('--json', metavar='PATH', help='Also write the results to PATH for later comparison')
+    args = parser.parse_args()
+
+    routes = {f"{plz:05d}": FIXTURES[plz % len(FIXTURES)] for plz in PLZ_RANGE}
+    fixtures = FixtureServer(routes=routes, delay=args.site_delay_ms / 1000).start()
+
+    # The server reads these at import: a throw-away cache, no offline index answering PLZs, the fixture site
+    tmp = tempfile.mkdtemp(prefix='bench_api_')
+    os.environ['CACHE_DB_FILE'] = os.path.join(tmp, 'plz_cache.db')
+    os.environ['PLZ_WAHLKREIS_FILE'] = os.path.join(tmp, 'no_offline_index.csv')
+    os.environ['ABGEORDNETENWATCH_URL'] = fixtures.base_url
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    with contextlib.redirect_stdout(io.StringIO()):
+        import abgeordnetenwatch_server as server
+
+    # Start empty (the SQLite store imports a legacy data/plz_cache.json on creation)
+    server.PLZ_CACHE.delete_many(list(server.PLZ_CACHE.keys()))
+
+    def start_fake_browser():
+        with server.scrape_phase('selenium', 'browser_start'):
+            return FakeDriver(page_load_delay=args.page_load_ms / 1000, command_delay=args.command_ms / 1000)
+
+    server.DRIVER_POOL.factory = start_fake_browser
+
+    endpoints = {
+        '/api/search': (Keys(f"{plz:05d}" for plz in PLZ_RANGE), search_path),
+        '/api/scrape-url': (Keys(itertools.count(1)), scrape_url_path),
+    }
+    backends = ['http', 'selenium'] if args.backend == 'both' else [args.backend]
+
+    with server.app.test_client() as http:
+        for keys, path_for in endpoints.values():
+            for key in keys.warm:
+                assert http.get(path_for(key)).status_code == 200
+
+    print(f"{args.concurrency} client threads, {args.duration:g}s per workload, mixed = {args.hit_ratio:.0%} hits; "
+          f"site delay {args.site_delay_ms:g} ms, page load {args.page_load_ms:g} ms, "
+          f"WebDriver command {args.command_ms:g} ms; driver pool size {server.DRIVER_POOL.size}")
+    print(f"{'endpoint':<16} {'workload':<8} {'backend':<9} {'requests':>8} {'req/s':>9} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'pages':>6} {'shed':>6}")
+    results = []
+    for endpoint, (keys, path_for) in endpoints.items():
+        runs = [('hit', 'any', 1.0)]
+        runs += [(workload, backend, ratio) for workload, ratio in (('miss', 0.0), ('mixed', args.hit_ratio))
+                 for backend in backends]
+        for workload, backend, hit_ratio in runs:
+            if backend != 'any':
+                server.SCRAPER_BACKEND = backend
+            pages = fixtures.requests
+            result = run_workload(server.app, keys, path_for, hit_ratio, args.concurrency, args.duration)
+            result.update(endpoint=endpoint, workload=workload, backend=backend, pages=fixtures.requests - pages)
+            results.append(result)
+            print(f"{endpoint:<16} {workload:<8} {backend:<9} {result['requests']:>8} {result['rps']:>9,.1f} "
+                  f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['pages']:>6} {result['shed']:>6}"
+                  + (f"  ({result['unexpected']} unexpected, e.g. {result['unexpected_sample'][0]})"
+                     if result['unexpected'] else ''))
+
+    fixtures.stop()
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'args': vars(args), 'results': results}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Cache-hit throughput of /api/search: jsonify per hit vs prepared response bytes
+
+Fills a throw-away SQLite cache with PLZ answers built from the recorded
+fixtures, then serves hits through the /api/search handler (prepared bytes)
+and through the previous path that re-encoded the cached dict with jsonify on
+every hit. Both run inside a Flask request context, with and without
+Accept-Encoding: gzip; a full WSGI round-trip through the test client is
+measured too.
+
+Usage: python benchmarks/bench_cache_hits.py [--plz 2000] [--seconds 2]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+TMP = tempfile.mkdtemp(prefix='bench_cache_hits_')
+os.environ['CACHE_DB_FILE'] = os.path.join(TMP, 'plz_cache.db')
+os.environ['PLZ_WAHLKREIS_FILE'] = os.path.join(TMP, 'no_offline_index.csv')
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import abgeordnetenwatch_server as server  # noqa: E402
+    from html_scraper import parse_listing  # noqa: E402
+
+
+def fixture_members():
+    with open(os.path.join('benchmarks', 'fixtures', 'list_mps.html'), 'rb') as f:
+        politicians = parse_listing(f.read(), server.ABGEORDNETENWATCH_URL)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [server.enrich_politician(p) for p in politicians]
+
+
+def fill_cache(count):
+    """Answers with 1-4 MPs each, the usual size of a PLZ lookup"""
+    members = fixture_members()
+    plzs = []
+    for index in range(count):
+        plz = f"{10000 + index:05d}"
+        size = 1 + index % 4
+        chosen = [members[(index + offset) % len(members)] for offset in range(size)]
+        server.cache_result(plz, {'plz': plz, 'type': 'members', 'count': size, 'members': chosen})
+        plzs.append(plz)
+    return plzs
+
+
+def legacy_hit(plz):
+    """The previous hit path: look the entry up, then jsonify the dict for every request"""
+    answer = server.lookup_plz_local(plz)
+    age = server.datetime.now() - answer.last_modified
+    response = server.cached_json_response(answer.data, answer.last_modified, age)
+    response = server.compress_response(response)
+    response.headers['X-Cache'] = answer.source
+    return response
+
+
+def prepared_hit(plz):
+    return server.compress_response(server.search_plz())
+
+
+def run(handler, plzs, encoding, seconds):
+    """Handler-only throughput; building the test request context is not timed"""
+    headers = {'Accept-Encoding': encoding} if encoding else {}
+    hits = 0
+    sizes = 0
+    elapsed = 0.0
+    deadline = time.perf_counter() + seconds
+    with contextlib.redirect_stdout(io.StringIO()) as sink:
+        while time.perf_counter() < deadline:
+            for plz in plzs[:200]:
+                with server.app.test_request_context(f'/api/search?plz={plz}', headers=headers):
+                    started = time.perf_counter()
+                    response = handler(plz)
+                    body = response.get_data()
+                    elapsed += time.perf_counter() - started
+                    sizes += len(body)
+                hits += 1
+            sink.seek(0)
+            sink.truncate()
+    return hits / elapsed, sizes / hits
+
+
+def check_identical(plzs):
+    """Both paths must send the same JSON document, Last-Modified and Cache-Control directives"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        for plz in plzs:
+            with server.app.test_request_context(f'/api/search?plz={plz}'):
+                legacy, prepared = legacy_hit(plz), prepared_hit(plz)
+                # ETags differ (jsonify pretty-prints), max-age may tick over between the calls
+                if legacy.get_json() != prepared.get_json() \
+                        or legacy.headers['Last-Modified'] != prepared.headers['Last-Modified'] \
+                        or set(legacy.cache_control) != set(prepared.cache_control):
+                    return False
+    return True
+
+
+def run_wsgi(plzs, seconds):
+    client = server.app.test_client()
+    hits = 0
+    deadline = time.perf_counter() + seconds
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()) as sink:
+        while time.perf_counter() < deadline:
+            for plz in plzs[:200]:
+                client.get(f'/api/search?plz={plz}', headers={'Accept-Encoding': 'gzip'})
+                hits += 1
+            sink.seek(0)
+            sink.truncate()
+    return hits / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--plz', type=int, default=2000, help='Cached PLZs (default: 2000)')
+    parser.add_argument('--seconds', type=float, default=2.0, help='Duration of each run (default: 2)')
+    args = parser.parse_args()
+
+    plzs = fill_cache(args.plz)
+    print(f"{len(plzs)} cached PLZs in {TMP}")
+    print(f"{'path':<22} {'encoding':<9} {'hits/s':>9} {'µs/hit':>8} {'bytes':>7}")
+    results = {}
+    for encoding in (None, 'gzip'):
+        for label, handler in (('jsonify per hit', legacy_hit), ('prepared bytes', prepared_hit)):
+            rate, size = run(handler, plzs, encoding, args.seconds)
+            results[label, encoding] = rate
+            print(f"{label:<22} {encoding or 'identity':<9} {rate:>9,.0f} {1e6 / rate:>8.1f} {size:>7.0f}")
+    for encoding in (None, 'gzip'):
+        speedup = results['prepared bytes', encoding] / results['jsonify per hit', encoding]
+        print(f"speed-up ({encoding or 'identity'}): {speedup:.2f}x")
+    print(f"full WSGI round-trip (test client, gzip): {run_wsgi(plzs, args.seconds):,.0f} hits/s")
+    print(f"responses identical: {check_identical(plzs[:50])}")
+
+
+if __name__ == '__main__':
+    main()
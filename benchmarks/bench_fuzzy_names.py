@@ -0,0 +1,90 @@
+"""
+Latency and accuracy of the fuzzy MP name index
+
+Every MP name in data/bundestag_contacts.csv is perturbed the ways scraped
+names differ from the CSV (added middle name, dropped accents, added title,
+double-barrelled surname, first-name typo) and must resolve to the same MP.
+Names made of one MP's first name and another MP's surname must not resolve.
+
+Usage: python benchmarks/bench_fuzzy_names.py [--threshold 0.85]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from fuzzy_names import FuzzyNameIndex, FUZZY_MATCH_THRESHOLD  # noqa: E402
+from mp_index import MPIndex, fold_accents  # noqa: E402
+from name_processing import detect_gender  # noqa: E402
+
+
+def perturbations(name):
+    parts = name.split()
+    first, last = parts[0], parts[-1]
+    yield 'middle name', f"{first} Maria {' '.join(parts[1:])}"
+    yield 'no accents', fold_accents(name)
+    yield 'title', f"Dr. {name}"
+    yield 'double surname', f"{name}-Schmidt"
+    if len(first) > 4:
+        yield 'first-name typo', f"{first[:-2]}{first[-1]}{first[-2]} {' '.join(parts[1:])}"
+    yield 'last, first', f"{last}, {' '.join(parts[:-1])}"
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threshold', type=float, default=FUZZY_MATCH_THRESHOLD)
+    args = parser.parse_args()
+
+    mp_index = MPIndex(os.path.join('data', 'bundestag_contacts.csv'), detect_gender=detect_gender)
+    mp_index.load()
+    started = time.perf_counter()
+    fuzzy = FuzzyNameIndex(mp_index, threshold=args.threshold)
+    fuzzy.load()
+    print(f"Indexed {len(mp_index)} MPs in {(time.perf_counter() - started) * 1000:.1f} ms, "
+          f"threshold {args.threshold}")
+
+    records = mp_index.records()
+    latencies = []
+    outcomes = {}
+    for mp in records:
+        for kind, name in perturbations(mp.name):
+            started = time.perf_counter()
+            match = fuzzy.match(name, party=mp.fraktion)
+            latencies.append(time.perf_counter() - started)
+            right, wrong, missed = outcomes.setdefault(kind, [0, 0, 0])
+            if match is None:
+                outcomes[kind][2] += 1
+            elif match.mdb_id == mp.mdb_id:
+                outcomes[kind][0] += 1
+            else:
+                outcomes[kind][1] += 1
+
+    print(f"{'perturbation':<18} {'right':>6} {'wrong':>6} {'missed':>7}")
+    for kind, (right, wrong, missed) in outcomes.items():
+        print(f"{kind:<18} {right:>6} {wrong:>6} {missed:>7}")
+
+    impostors = 0
+    false_matches = 0
+    for mp, other in zip(records, records[1:]):
+        name = f"{mp.name.split()[0]} {other.name.split()[-1]}"
+        if mp_index.lookup(name) is not None:
+            continue
+        impostors += 1
+        if fuzzy.match(name) is not None:
+            false_matches += 1
+    print(f"mixed names:       {false_matches} of {impostors} wrongly resolved")
+    print(f"lookup latency:    p50 {percentile(latencies, 0.5) * 1e6:.0f} µs, "
+          f"p99 {percentile(latencies, 0.99) * 1e6:.0f} µs, max {max(latencies) * 1e6:.0f} µs")
+
+
+if __name__ == '__main__':
+    main()
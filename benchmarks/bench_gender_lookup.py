@@ -0,0 +1,92 @@
+"""
+Startup time, memory and lookup cost of the gender lookup: gender_data.py dict vs compiled index
+
+Each variant is imported in a fresh interpreter, with a warm bytecode cache
+and with an empty one (first start after a deploy), and the import time and
+resident-memory growth up to the first lookup are reported. Linux only (RSS
+is read from /proc).
+
+Usage: python benchmarks/bench_gender_lookup.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import gender_index  # noqa: E402
+from gender_data import GENDER_LOOKUP as SOURCE  # noqa: E402
+
+CHILD = '''
+import json, os, sys, time
+def rss():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+before = rss()
+started = time.perf_counter()
+from {module} import GENDER_LOOKUP
+GENDER_LOOKUP.get('abdi, sanae')
+elapsed = time.perf_counter() - started
+print(json.dumps({{'ms': elapsed * 1000, 'rss_kb': (rss() - before) / 1024}}))
+'''
+
+VARIANTS = [('dict (gender_data.py)', 'gender_data'), ('index (gender_index.py)', 'gender_index')]
+
+
+def measure(module, runs, pycache):
+    """Median (ms, RSS KB) of `runs` fresh interpreters using the bytecode cache in pycache"""
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=pycache)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', CHILD.format(module=module)],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return statistics.median(s['ms'] for s in samples), statistics.median(s['rss_kb'] for s in samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=5, help='Interpreter starts per variant (default: 5)')
+    args = parser.parse_args()
+
+    if not os.path.exists(gender_index.INDEX_FILE):
+        print(f"{gender_index.INDEX_FILE} missing - run 'python gender_index.py' first")
+        sys.exit(1)
+
+    print(f"{'variant':<26} {'import+get warm':>16} {'cold (no .pyc)':>16} {'RSS growth':>12}")
+    for label, module in VARIANTS:
+        cold = []
+        for _ in range(args.runs):
+            with tempfile.TemporaryDirectory() as pycache:
+                cold.append(measure(module, 1, pycache)[0])
+        with tempfile.TemporaryDirectory() as pycache:
+            measure(module, 1, pycache)  # populate the bytecode cache
+            warm_ms, rss_kb = measure(module, args.runs, pycache)
+        print(f"{label:<26} {warm_ms:>13.2f} ms {statistics.median(cold):>13.2f} ms {rss_kb:>9.0f} KB")
+
+    print(f"index file: {os.path.getsize(gender_index.INDEX_FILE):,} bytes, "
+          f"gender_data.py: {os.path.getsize('gender_data.py'):,} bytes")
+
+    keys = [key for key, gender in SOURCE.items() if gender in gender_index.CODES]
+    mismatched = [key for key in keys if gender_index.GENDER_LOOKUP.get(key) != SOURCE[key]]
+    for label, lookup in (('dict', SOURCE), ('index', gender_index.GENDER_LOOKUP)):
+        seconds = timeit.timeit(lambda: [lookup.get(key) for key in keys], number=20)
+        print(f"{label:<6} lookup: {seconds / (20 * len(keys)) * 1e6:.2f} µs/name")
+    if mismatched:
+        print(f"FAIL {len(mismatched)} names differ, e.g. {mismatched[:3]}")
+        sys.exit(1)
+    print(f"OK all {len(keys)} names resolve identically")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Cost of logging on the /api/search cache-hit path: LOG_LEVEL INFO vs WARNING
+
+Fills a throw-away SQLite cache, then serves hits from several threads through
+the /api/search handler with the app's before/after-request hooks and
+reports throughput and per-hit latency percentiles for:
+
+    queue INFO      the default: JSON records handed to the batching writer thread
+    queue WARNING   per-request INFO lines filtered out
+    sync INFO       JSON records written on the request thread (a plain StreamHandler)
+
+each against a fast sink (/dev/null) and a slow one whose writes block for
+--slow-write-us, like a congested terminal or log pipe.
+
+Usage: python benchmarks/bench_logging.py [--threads 8] [--hits 2000] [--slow-write-us 200]
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+TMP = tempfile.mkdtemp(prefix='bench_logging_')
+os.environ['CACHE_DB_FILE'] = os.path.join(TMP, 'plz_cache.db')
+os.environ['PLZ_WAHLKREIS_FILE'] = os.path.join(TMP, 'no_offline_index.csv')
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import abgeordnetenwatch_server as server  # noqa: E402
+    import structured_logging  # noqa: E402
+
+
+class SlowSink(io.TextIOBase):
+    """A stream whose writes block (releasing the GIL) like a slow stdout consumer"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.lines = 0
+
+    def write(self, text):
+        if self.delay:
+            time.sleep(self.delay)
+        self.lines += text.count('\n')
+        return len(text)
+
+
+def fill_cache(count):
+    member = {'name': 'Pascal Meiser', 'party': 'Die Linke', 'constituency': 'Wahlkreis: 83',
+              'profile_url': None, 'image_url': None, 'contact_url': None, 'gender': 'male'}
+    plzs = [f"{10000 + index:05d}" for index in range(count)]
+    for plz in plzs:
+        server.cache_result(plz, {'plz': plz, 'type': 'members', 'count': 1, 'members': [member]})
+    return plzs
+
+
+def configure(mode, level, sink):
+    """Install the logging variant under test on the root logger"""
+    structured_logging.shutdown_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    if mode == 'queue':
+        structured_logging.configure_logging(level=level, fmt='json', stream=sink)
+        return
+    handler = logging.StreamHandler(sink)
+    handler.setFormatter(structured_logging.JsonFormatter())
+    handler.addFilter(structured_logging.RequestContextFilter())
+    root.addHandler(handler)
+    root.setLevel(level)
+
+
+def hit(plz):
+    with server.app.test_request_context(f'/api/search?plz={plz}'):
+        started = time.perf_counter()
+        server.app.preprocess_request()
+        response = server.app.process_response(server.search_plz())
+        seconds = time.perf_counter() - started
+        assert response.status_code == 200 and response.headers['X-Cache'] == 'HIT'
+    return seconds
+
+
+def run(plzs, threads, hits):
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(offset):
+        local = []
+        barrier.wait()
+        for index in range(hits):
+            local.append(hit(plzs[(offset + index) % len(plzs)]))
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(n * hits,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1e6
+    return {
+        'rate': len(latencies) / elapsed,
+        'p50': statistics.median(latencies) * 1e6,
+        'p99': percentile(0.99),
+        'p999': percentile(0.999),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent request threads (default: 8)')
+    parser.add_argument('--hits', type=int, default=2000, help='Hits per thread and variant (default: 2000)')
+    parser.add_argument('--slow-write-us', type=float, default=200, help='Blocking time per write of the slow sink')
+    args = parser.parse_args()
+
+    plzs = fill_cache(2000)
+    # Warm the in-memory cache and the code paths
+    configure('queue', 'WARNING', open(os.devnull, 'w'))
+    for plz in plzs:
+        hit(plz)
+
+    print(f"{args.threads} threads x {args.hits} cache hits per variant")
+    print(f"{'sink':<6} {'logging':<14} {'hits/s':>9} {'p50 µs':>8} {'p99 µs':>8} {'p99.9 µs':>9} {'lines':>7}")
+    for sink_name in ('fast', 'slow'):
+        for mode, level in (('queue', 'INFO'), ('queue', 'WARNING'), ('sync', 'INFO')):
+            sink = SlowSink(args.slow_write_us / 1e6 if sink_name == 'slow' else 0)
+            configure(mode, level, sink)
+            dropped = structured_logging.dropped_records()
+            result = run(plzs, args.threads, args.hits)
+            structured_logging.shutdown_logging()  # Drain the queue before counting lines
+            dropped = structured_logging.dropped_records() - dropped
+            print(f"{sink_name:<6} {mode + ' ' + level:<14} {result['rate']:>9,.0f} {result['p50']:>8.1f} "
+                  f"{result['p99']:>8.1f} {result['p999']:>9.1f} {sink.lines:>7}"
+                  + (f"  ({dropped} dropped)" if dropped else ''))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Micro-benchmark of name normalization and gender detection
+
+Runs the previous per-call implementation and name_processing over every
+contact name in data/bundestag_contacts.csv (both "Last, First" and
+"First Last" forms, as the scraper sees them) and every GENDER_LOOKUP key,
+and checks that both give identical results.
+
+Usage: python benchmarks/bench_names.py [--rounds 20]
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import name_processing  # noqa: E402
+from gender_data import GENDER_LOOKUP  # noqa: E402
+from name_processing import MALE_FIRST_NAMES, FEMALE_FIRST_NAMES  # noqa: E402
+
+
+def legacy_normalize_name(name):
+    import re
+    normalized = re.sub(r'\b[Pp][Rr][Oo][Ff]\.?\s+[Dd][Rr]\.?\s+', '', name)
+    normalized = re.sub(r'\b[Dd][Rr]\.?\s+[Mm][Ee][Dd]\.?\s+', '', normalized)
+    normalized = re.sub(r'\b[Pp][Rr][Oo][Ff]\.?\s+', '', normalized)
+    normalized = re.sub(r'\b[Dd][Rr]\.?\s+', '', normalized)
+    normalized = ' '.join(normalized.split())
+    return normalized.strip()
+
+
+def legacy_extract_first_name(full_name):
+    normalized = legacy_normalize_name(full_name)
+    if ',' in normalized:
+        parts = normalized.split(',', 1)
+        if len(parts) > 1 and parts[1].split():
+            return parts[1].strip().split()[0].lower()
+        return ''
+    parts = normalized.split()
+    return parts[0].lower() if parts else ''
+
+
+def legacy_detect_gender(full_name):
+    gender = GENDER_LOOKUP.get(legacy_normalize_name(full_name).lower())
+    if gender and gender != 'unknown':
+        return gender
+    first_name = legacy_extract_first_name(full_name)
+    if first_name in MALE_FIRST_NAMES:
+        return 'male'
+    elif first_name in FEMALE_FIRST_NAMES:
+        return 'female'
+    return 'unknown'
+
+
+def legacy_enrich(name):
+    """What enrich_politician did per politician: contact key plus gender"""
+    return legacy_normalize_name(name).lower(), legacy_detect_gender(name)
+
+
+def enrich(name):
+    key, _ = name_processing.name_parts(name)
+    return key, name_processing.detect_gender(name)
+
+
+def load_names():
+    names = []
+    with open(os.path.join('data', 'bundestag_contacts.csv'), 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            name = row['name'].strip()
+            names.append(name)
+            if ',' in name:
+                last, first = name.split(',', 1)
+                names.append(f"{first.strip()} {last.strip()}")
+    # Skip junk rows like '-----------' that the compiled gender index drops
+    names.extend(key for key in GENDER_LOOKUP if any(c.isalpha() for c in key))
+    return names
+
+
+def timed(fn, names, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for name in names:
+            fn(name)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rounds', type=int, default=20, help='Passes over the name list (default: 20)')
+    args = parser.parse_args()
+
+    names = load_names()
+    mismatches = [name for name in names if legacy_enrich(name) != enrich(name)]
+
+    calls = len(names) * args.rounds
+    legacy = timed(legacy_enrich, names, args.rounds)
+    name_processing.analyze_name.cache_clear()
+    name_processing.detect_gender.cache_clear()
+    cold = timed(enrich, names, 1)
+    warm = timed(enrich, names, args.rounds)
+
+    print(f"{len(names)} names ({len(set(names))} unique), {args.rounds} rounds")
+    print(f"legacy:          {legacy / calls * 1e6:6.2f} µs/name")
+    print(f"precompiled:     {cold / len(names) * 1e6:6.2f} µs/name (first pass, memo empty)")
+    print(f"memoized:        {warm / calls * 1e6:6.2f} µs/name ({legacy / warm:.1f}x faster)")
+    print(f"memo:            {name_processing.name_cache_stats()}")
+    if mismatches:
+        print(f"FAIL {len(mismatches)} names differ, e.g. {mismatches[:3]}")
+        sys.exit(1)
+    print("OK results identical")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Compare the HTTP/lxml and Selenium scraping backends on the recorded fixtures
+
+Usage: python benchmarks/bench_scrapers.py [--iterations 20] [--skip-selenium]
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from benchmarks.fixture_server import FixtureServer  # noqa: E402
+
+FIXTURES = ['single_mp.html', 'list_mps.html', 'multiple_wahlkreis.html', 'empty.html']
+
+
+def children_rss_mb():
+    """Resident memory of all descendant processes (geckodriver + Firefox), Linux only"""
+    total = 0
+    pending = [str(os.getpid())]
+    while pending:
+        pid = pending.pop()
+        try:
+            with open(f'/proc/{pid}/task/{pid}/children') as f:
+                children = f.read().split()
+        except OSError:
+            continue
+        for child in children:
+            pending.append(child)
+            try:
+                with open(f'/proc/{child}/statm') as f:
+                    total += int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+            except OSError:
+                pass
+    return total / 1024 / 1024
+
+
+def run(label, scrape, url, iterations):
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = scrape(url)
+        for _ in range(iterations):
+            started = time.perf_counter()
+            scrape(url)
+            timings.append((time.perf_counter() - started) * 1000)
+    count = len(result['options']) if isinstance(result, dict) else len(result)
+    print(f"  {label:<9} {statistics.median(timings):8.2f} ms median "
+          f"{max(timings):8.2f} ms max  ({count} records)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--skip-selenium', action='store_true')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        import abgeordnetenwatch_server as server
+
+    with FixtureServer() as fixtures:
+        print(f"HTTP backend (requests + lxml), {args.iterations} iterations")
+        tracemalloc.start()
+        for name in FIXTURES:
+            print(name)
+            run('http', server.scrape_with_http, fixtures.url(name), args.iterations)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Peak Python heap during HTTP scrapes: {peak / 1024 / 1024:.1f} MB\n")
+
+        if args.skip_selenium:
+            return
+
+        print(f"Selenium backend (pooled headless Firefox), {args.iterations} iterations")
+        try:
+            with server.DRIVER_POOL.lease():
+                pass
+        except Exception as e:
+            print(f"Skipped: could not start Firefox ({e.__class__.__name__}: {e})")
+            return
+        try:
+            for name in FIXTURES:
+                print(name)
+                run('selenium', server.scrape_with_selenium, fixtures.url(name), args.iterations)
+            print(f"Resident memory of browser processes: {children_rss_mb():.0f} MB")
+        finally:
+            server.DRIVER_POOL.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+"""
+Stand-in for the Firefox WebDriver that serves pages from the fixture server
+
+FakeDriver implements the part of the Selenium WebDriver API the server
+uses: get(), current_url, find_element(s) with CSS or XPath selectors,
+execute_script() for the two tile extraction scripts (answered with lxml
+the way the in-page JavaScript would) and quit(). Pages are downloaded
+over HTTP, so a scrape through the driver pool exercises the same
+lease/page_load/wait/extract path as with a real browser, without
+Firefox or geckodriver.
+
+`page_load_delay` and `command_delay` (seconds) add the latency of the
+browser rendering a page and of one WebDriver round-trip.
+"""
+import re
+import time
+from urllib.parse import urljoin
+
+import requests
+from lxml import html as lxml_html
+from selenium.common.exceptions import (
+    InvalidSelectorException, JavascriptException, NoSuchElementException, WebDriverException,
+)
+from selenium.webdriver.common.by import By
+
+from html_scraper import (
+    OPTION_LINK, OPTION_TILES, OPTION_TITLE, POLITICIAN_CONSTITUENCY, POLITICIAN_IMAGE,
+    POLITICIAN_NAME, POLITICIAN_PARTY, POLITICIAN_PROFILE_LINK, POLITICIAN_TILES, _has_class,
+)
+from tile_extraction import EXTRACT_OPTIONS_JS, EXTRACT_POLITICIANS_JS
+
+# One step of the CSS selectors the server uses: tag, .class and [attr*='value']
+CSS_STEP = re.compile(r"^(?P<tag>[a-z][a-z0-9]*|\*)?(?P<rest>(?:\.[\w-]+|\[[\w-]+\*=['\"][^'\"]*['\"]\])*)$")
+CSS_PART = re.compile(r"\.([\w-]+)|\[([\w-]+)\*=['\"]([^'\"]*)['\"]\]")
+
+
+def css_to_xpath(selector):
+    """XPath for a descendant chain of simple CSS steps, e.g. 'article.tile .tile__title'"""
+    steps = []
+    for step in selector.split():
+        match = CSS_STEP.match(step)
+        if not match:
+            raise InvalidSelectorException(f"Unsupported CSS selector: {selector}")
+        predicates = []
+        for class_name, attr, value in CSS_PART.findall(match.group('rest')):
+            predicates.append(_has_class(class_name) if class_name else f"contains(@{attr}, '{value}')")
+        steps.append((match.group('tag') or '*') + ''.join(f'[{p}]' for p in predicates))
+    return '//' + '//'.join(steps)
+
+
+def inner_text(element):
+    return ' '.join(element.text_content().split())
+
+
+class FakeElement:
+    """A WebElement backed by an lxml element"""
+
+    def __init__(self, driver, element):
+        self._driver = driver
+        self._element = element
+
+    @property
+    def tag_name(self):
+        return self._element.tag
+
+    @property
+    def text(self):
+        self._driver._command()
+        return inner_text(self._element)
+
+    def get_attribute(self, name):
+        self._driver._command()
+        value = self._element.get(name)
+        # Like the DOM properties, href/src come back resolved against the page URL
+        if value is not None and name in ('href', 'src'):
+            return urljoin(self._driver.current_url, value)
+        return value
+
+    def find_elements(self, by=By.ID, value=None):
+        return self._driver._find(self._element, by, value, relative=True)
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"Unable to locate element: {value}")
+        return elements[0]
+
+
+class FakeDriver:
+    """WebDriver surface used by DriverPool, PageWaiter and TileExtractor"""
+
+    def __init__(self, page_load_delay=0.0, command_delay=0.0, session=None):
+        self.page_load_delay = page_load_delay
+        self.command_delay = command_delay
+        self.session = session or requests.Session()
+        self.pages_loaded = 0
+        self._url = 'about:blank'
+        self._tree = lxml_html.fromstring('<html><body></body></html>')
+        self._quit = False
+
+    def _command(self):
+        """One WebDriver round-trip; fails like a dead browser after quit()"""
+        if self._quit:
+            raise WebDriverException('Browser has been closed')
+        if self.command_delay:
+            time.sleep(self.command_delay)
+
+    @property
+    def current_url(self):
+        self._command()
+        return self._url
+
+    def get(self, url):
+        self._command()
+        response = self.session.get(url, timeout=30)
+        # Browsers render error pages too; the page waits then time out as they would in Firefox
+        self._tree = lxml_html.fromstring(response.content or b'<html></html>')
+        self._url = response.url
+        if self.page_load_delay:
+            time.sleep(self.page_load_delay)
+        self.pages_loaded += 1
+
+    def _find(self, root, by, value, relative=False):
+        self._command()
+        if by == By.XPATH:
+            xpath = value
+        elif by == By.CSS_SELECTOR:
+            xpath = css_to_xpath(value)
+        elif by == By.CLASS_NAME:
+            xpath = f"//*[{_has_class(value)}]"
+        elif by == By.TAG_NAME:
+            xpath = f"//{value}"
+        else:
+            raise InvalidSelectorException(f"Unsupported locator strategy: {by}")
+        if relative and xpath.startswith('/'):
+            xpath = '.' + xpath
+        return [FakeElement(self, element) for element in root.xpath(xpath) if isinstance(element.tag, str)]
+
+    def find_elements(self, by=By.ID, value=None):
+        return self._find(self._tree, by, value)
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"Unable to locate element: {value}")
+        return elements[0]
+
+    def execute_script(self, script, *args):
+        self._command()
+        if script == EXTRACT_POLITICIANS_JS:
+            return self._politician_tiles()
+        if script == EXTRACT_OPTIONS_JS:
+            return self._wahlkreis_options()
+        raise JavascriptException('FakeDriver only runs the tile extraction scripts')
+
+    def _first(self, element, xpath):
+        matches = element.xpath(xpath)
+        return matches[0] if matches else None
+
+    def _politician_tiles(self):
+        """What EXTRACT_POLITICIANS_JS returns: null for missing fields, absolute href/src"""
+        def text(tile, xpath):
+            element = self._first(tile, xpath)
+            return inner_text(element) if element is not None else None
+
+        def link(tile, xpath, name):
+            element = self._first(tile, xpath)
+            value = element.get(name) if element is not None else None
+            return urljoin(self._url, value) if value else None
+
+        return [{
+            'name': text(tile, POLITICIAN_NAME),
+            'profile_url': link(tile, POLITICIAN_PROFILE_LINK, 'href'),
+            'party': text(tile, POLITICIAN_PARTY),
+            'constituency': text(tile, POLITICIAN_CONSTITUENCY),
+            'image_url': link(tile, POLITICIAN_IMAGE, 'src'),
+        } for tile in self._tree.xpath(POLITICIAN_TILES)]
+
+    def _wahlkreis_options(self):
+        options = []
+        for tile in self._tree.xpath(OPTION_TILES):
+            title = self._first(tile, OPTION_TITLE)
+            link = self._first(tile, OPTION_LINK)
+            if title is not None and link is not None:
+                href = link.get('href')
+                options.append({'title': inner_text(title), 'url': urljoin(self._url, href) if href else None})
+        return options
+
+    def quit(self):
+        self._quit = True
+        self.session.close()
@@ -0,0 +1,116 @@
+"""
+Local stand-in for abgeordnetenwatch.de that serves the recorded HTML fixtures
+"""
+import os
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# PLZ searches that map to a specific recorded page (the README smoke-test PLZs)
+SEARCH_ROUTES = {
+    '10961': 'single_mp.html',
+    '40213': 'multiple_wahlkreis.html',
+    '12345': 'empty.html',
+}
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+        return f.read()
+
+
+class FixtureServer:
+    """
+    Serves `/<fixture>.html` straight from benchmarks/fixtures, and answers
+    `/bundestag/abgeordnete?politician_search_keys=<plz>` like the real site:
+    PLZs in `routes` get their recorded page, a search narrowed to one
+    constituency gets the list page, and any other PLZ gets `default_fixture`.
+
+    `delay` adds a fixed per-request latency. Runs in a daemon thread; use as
+    a context manager or call start()/stop().
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, routes=None, default_fixture='single_mp.html', delay=0.0):
+        fixtures = {
+            name: load_fixture(name)
+            for name in os.listdir(FIXTURE_DIR) if name.endswith('.html')
+        }
+        routes = dict(SEARCH_ROUTES if routes is None else routes)
+        server = self
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        def resolve(path):
+            parts = urlsplit(path)
+            if parts.path.rstrip('/') != '/bundestag/abgeordnete':
+                return parts.path.lstrip('/')
+            query = parse_qs(parts.query)
+            if any(value.isdigit() for value in query.get('constituency', [])):
+                return 'list_mps.html'
+            plz = query.get('politician_search_keys', [''])[0]
+            return routes.get(plz, default_fixture)
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                if delay:
+                    time.sleep(delay)
+                body = fixtures.get(resolve(self.path))
+                if body is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, fixture):
+        return f"{self.base_url}/{fixture}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.0, help='Simulated per-request latency in seconds')
+    args = parser.parse_args()
+    server = FixtureServer(port=args.port, delay=args.delay)
+    print(f"Serving {FIXTURE_DIR} on {server.base_url}")
+    server.httpd.serve_forever()
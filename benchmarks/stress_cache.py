@@ -0,0 +1,136 @@
+"""
+Multithreaded stress test for ConcurrentCache: no lost or reordered updates
+
+Writers put unique keys, then all overwrite a few shared hot keys, while
+readers look keys up and iterate the cache. Afterwards every unique key must
+be cached, and memory and a freshly reopened store must agree on every key.
+tests/test_concurrent_cache.py runs a short version of this under pytest;
+this script runs it at full size and reports throughput.
+
+Usage: python benchmarks/stress_cache.py [--writers 8] [--readers 4] [--puts 500] [--backend sqlite|json|both]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cache_store import JsonCacheStore, SqliteCacheStore  # noqa: E402
+from concurrent_cache import ConcurrentCache  # noqa: E402
+
+HOT_KEYS = ['10961', '40213', '80331']
+TTL = timedelta(days=7)
+
+
+def open_store(backend, directory):
+    if backend == 'json':
+        return JsonCacheStore(os.path.join(directory, 'plz_cache.json'))
+    return SqliteCacheStore(os.path.join(directory, 'plz_cache.db'), TTL)
+
+
+def run(backend, writers, readers, puts):
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ConcurrentCache(open_store(backend, directory), TTL)
+        cache.load()
+        start = threading.Barrier(writers + readers + 1)
+        hot_phase = threading.Barrier(writers)
+        writing = threading.Event()
+        writing.set()
+        errors = []
+        reads = [0]
+
+        def writer(worker):
+            start.wait()
+            try:
+                for seq in range(puts):
+                    cache.put(f"w{worker}_{seq}", {'worker': worker, 'seq': seq})
+                # All writers then race on the same few keys, so their last writes overlap
+                hot_phase.wait()
+                for seq in range(puts):
+                    cache.put(HOT_KEYS[seq % len(HOT_KEYS)], {'worker': worker, 'seq': seq})
+            except Exception as e:
+                errors.append(e)
+
+        def reader():
+            start.wait()
+            count = 0
+            try:
+                while writing.is_set():
+                    for key in HOT_KEYS:
+                        cache.get(key)
+                    # Iterating while writers insert used to risk "dictionary changed size during iteration"
+                    count += len(cache.keys())
+                    time.sleep(0.001)
+            except Exception as e:
+                errors.append(e)
+            reads[0] += count
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        threads += [threading.Thread(target=reader) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        started = time.perf_counter()
+        start.wait()
+        for thread in threads[:writers]:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        writing.clear()
+        for thread in threads[writers:]:
+            thread.join()
+
+        failures = [f"{e.__class__.__name__}: {e}" for e in errors]
+        missing = [
+            f"w{worker}_{seq}" for worker in range(writers) for seq in range(puts)
+            if cache.get(f"w{worker}_{seq}") is None
+        ]
+        if missing:
+            failures.append(f"{len(missing)} lost updates, e.g. {missing[:3]}")
+
+        # Reopen the store from disk: persistence must match memory key for key
+        persisted = open_store(backend, directory).load_all()
+        mismatched = [
+            key for key in cache.keys()
+            if key not in persisted or persisted[key]['data'] != cache.get(key)['data']
+        ]
+        if mismatched:
+            failures.append(f"{len(mismatched)} keys differ between memory and store, e.g. {mismatched[:3]}")
+        expected = writers * puts + len(HOT_KEYS)
+        if len(cache) != expected:
+            failures.append(f"{len(cache)} entries cached, expected {expected}")
+
+        total_puts = writers * puts * 2
+        print(f"{backend:<7} {total_puts} puts in {elapsed:.2f}s ({total_puts / elapsed:,.0f}/s), "
+              f"{reads[0]:,} keys iterated by readers, stats {cache.stats()}")
+        for failure in failures:
+            print(f"  FAIL {failure}")
+        return not failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--puts', type=int, default=500, help='Unique keys per writer')
+    parser.add_argument('--backend', choices=['sqlite', 'json', 'both'], default='both')
+    args = parser.parse_args()
+
+    # Switch threads far more often than the default 5ms to provoke interleavings
+    sys.setswitchinterval(1e-5)
+
+    backends = ['sqlite', 'json'] if args.backend == 'both' else [args.backend]
+    ok = True
+    for backend in backends:
+        # The JSON store rewrites the whole file per put; keep its run short
+        puts = args.puts if backend == 'sqlite' else min(args.puts, 50)
+        ok = run(backend, args.writers, args.readers, puts) and ok
+    print('OK' if ok else 'FAILED')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""
+Persistent backends for the PLZ cache
+
+Every store keeps entries of the form {'data': <response dict>, 'timestamp': datetime}
+and exposes the same small interface: load_all(), get(), put(), delete(), delete_many().
+An entry may also carry 'body', the compact JSON encoding of 'data' as UTF-8 bytes;
+the SQLite store persists it as is and returns it on reads, so the JSON is encoded
+only once per entry.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+log = logging.getLogger(__name__)
+
+
+class JsonCacheStore:
+    """
+    Legacy store: the whole cache as one JSON file, rewritten on every write.
+    Not safe to share between processes.
+    """
+
+    shared = False
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def load_all(self):
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                cache_data = json.load(f)
+            # Convert string timestamps back to datetime objects
+            for data in cache_data.values():
+                if 'timestamp' in data:
+                    data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+            self._entries = cache_data
+        return dict(self._entries)
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._flush()
+
+    def delete(self, key):
+        self.delete_many([key])
+
+    def delete_many(self, keys):
+        with self._lock:
+            removed = [key for key in keys if self._entries.pop(key, None) is not None]
+            if removed:
+                self._flush()
+
+    def _flush(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        # Convert datetime objects to strings for JSON serialization
+        cache_data = {}
+        for key, data in self._entries.items():
+            # Only the stored fields; prepared response bytes are rebuilt on load
+            cache_entry = {'data': data.get('data')}
+            if 'timestamp' in data:
+                cache_entry['timestamp'] = data['timestamp'].isoformat()
+            cache_data[key] = cache_entry
+
+        # Write to a temp file first so a crash cannot truncate the cache
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache_data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class SqliteCacheStore:
+    """
+    Embedded SQLite store: one row per cache key, upserted individually.
+
+    Runs in WAL mode so readers never wait on a writer, and keeps an index on
+    expires_at for purging. Each thread gets its own connection, and several
+    processes can use the same database file at once.
+    """
+
+    shared = True
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            key TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at ON cache_entries (expires_at);
+        CREATE TABLE IF NOT EXISTS cache_meta (
+            name TEXT PRIMARY KEY,
+            value TEXT
+        );
+    '''
+
+    def __init__(self, path, ttl, import_json_path=None):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._connect().executescript(self.SCHEMA)
+        if import_json_path:
+            self.import_json(import_json_path)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _row_to_entry(data, timestamp):
+        return {
+            'data': json.loads(data),
+            'timestamp': datetime.fromisoformat(timestamp),
+            'body': data.encode('utf-8'),
+        }
+
+    def load_all(self):
+        # Expired rows are skipped (via the expires_at index) rather than loaded and prepared
+        rows = self._connect().execute(
+            'SELECT key, data, timestamp FROM cache_entries WHERE expires_at > ?', (datetime.now().timestamp(),)
+        )
+        return {key: self._row_to_entry(data, timestamp) for key, data, timestamp in rows}
+
+    def get(self, key):
+        row = self._connect().execute(
+            'SELECT data, timestamp FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        return self._row_to_entry(*row) if row else None
+
+    def put(self, key, entry):
+        timestamp = entry['timestamp']
+        self._connect().execute(
+            '''INSERT INTO cache_entries (key, data, timestamp, expires_at) VALUES (?, ?, ?, ?)
+               ON CONFLICT(key) DO UPDATE SET
+                   data = excluded.data,
+                   timestamp = excluded.timestamp,
+                   expires_at = excluded.expires_at''',
+            (
+                key,
+                entry['body'].decode('utf-8') if entry.get('body')
+                else json.dumps(entry['data'], ensure_ascii=False, separators=(',', ':')),
+                timestamp.isoformat(),
+                (timestamp + self.ttl).timestamp(),
+            )
+        )
+
+    def delete(self, key):
+        self._connect().execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+
+    def delete_many(self, keys):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany('DELETE FROM cache_entries WHERE key = ?', [(key,) for key in keys])
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def purge_expired(self, now=None):
+        """Delete all entries past their expiry; returns the number removed"""
+        now = (now or datetime.now()).timestamp()
+        return self._connect().execute(
+            'DELETE FROM cache_entries WHERE expires_at <= ?', (now,)
+        ).rowcount
+
+    def import_json(self, json_path):
+        """One-time import of a legacy plz_cache.json into an empty store"""
+        if not os.path.exists(json_path):
+            return 0
+
+        conn = self._connect()
+        # Check the marker inside the write transaction so concurrent workers import once
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if conn.execute("SELECT 1 FROM cache_meta WHERE name = 'json_imported'").fetchone():
+                conn.execute('ROLLBACK')
+                return 0
+            entries = JsonCacheStore(json_path).load_all()
+            for key, entry in entries.items():
+                if 'timestamp' not in entry or 'data' not in entry:
+                    continue
+                # Never overwrite rows written since the store was created
+                conn.execute(
+                    'INSERT OR IGNORE INTO cache_entries (key, data, timestamp, expires_at) VALUES (?, ?, ?, ?)',
+                    (
+                        key,
+                        json.dumps(entry['data'], ensure_ascii=False, separators=(',', ':')),
+                        entry['timestamp'].isoformat(),
+                        (entry['timestamp'] + self.ttl).timestamp(),
+                    )
+                )
+            conn.execute(
+                "INSERT INTO cache_meta (name, value) VALUES ('json_imported', ?)",
+                (datetime.now().isoformat(),)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        log.info("Imported %d entries from %s into %s", len(entries), json_path, self.path)
+        return len(entries)
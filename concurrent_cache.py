@@ -0,0 +1,175 @@
+"""
+Thread-safe in-memory PLZ cache in front of a persistent cache store
+"""
+import logging
+import threading
+import zlib
+from datetime import datetime
+
+log = logging.getLogger(__name__)
+
+
+class ConcurrentCache:
+    """
+    Owns the cached entries, their expiry and their persistence.
+
+    Keys are spread over `stripes` independently locked shards, so threads
+    working on different keys rarely contend. Each stripe has two locks:
+    the entry lock only guards the in-memory dict and is held for a few
+    dictionary operations, while the write lock serializes writers of the
+    stripe around the store call. Readers only take the entry lock, so a
+    lookup never waits for a disk flush, and because writers of a stripe
+    persist in the order they update memory, the store always ends up with
+    the same entry as memory.
+
+    `prepare(entry)`, if given, returns extra fields (e.g. the serialized
+    response) that are added to every entry once, when it is put or loaded.
+    """
+
+    def __init__(self, store, ttl, stripes=16, prepare=None):
+        self.store = store
+        self.ttl = ttl
+        self.prepare = prepare
+        self._stripes = [{} for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._write_locks = [threading.Lock() for _ in range(stripes)]
+        self._stats_lock = threading.Lock()
+        self._store_errors = 0
+        self._expired = 0
+
+    def _index(self, key):
+        # Stable across processes, unlike hash()
+        return zlib.crc32(key.encode('utf-8')) % len(self._stripes)
+
+    def load(self):
+        """Replace the in-memory entries with everything in the store; returns the count"""
+        try:
+            entries = self.store.load_all()
+        except Exception as e:
+            log.warning("Could not load cache: %s", e)
+            entries = {}
+        shards = [{} for _ in self._stripes]
+        for key, entry in entries.items():
+            shards[self._index(key)][key] = self._prepared(entry)
+        for index, shard in enumerate(shards):
+            with self._locks[index]:
+                self._stripes[index] = shard
+        return len(entries)
+
+    def _prepared(self, entry):
+        if self.prepare is not None and 'data' in entry:
+            entry.update(self.prepare(entry))
+        return entry
+
+    def _read_through(self, key, index, entry):
+        """
+        Pick up an entry another worker process wrote (or refreshed) after this
+        process loaded its in-memory copy
+        """
+        try:
+            stored = self.store.get(key)
+        except Exception as e:
+            self._store_error('read', e)
+            return entry
+        if stored and (entry is None or stored['timestamp'] > entry.get('timestamp', datetime.min)):
+            stored = self._prepared(stored)
+            with self._locks[index]:
+                current = self._stripes[index].get(key)
+                # A local write may have landed meanwhile; keep whichever is newer
+                if current is not None and current.get('timestamp', datetime.min) >= stored['timestamp']:
+                    return current
+                self._stripes[index][key] = stored
+            return stored
+        return entry
+
+    def get(self, key, refresh_after=None):
+        """
+        The entry ({'data', 'timestamp'}) for key within the TTL, or None.
+
+        With a shared store, a missing entry or one older than refresh_after
+        is looked up in the store first. Expired entries are evicted.
+        """
+        index = self._index(key)
+        with self._locks[index]:
+            entry = self._stripes[index].get(key)
+
+        timestamp = entry.get('timestamp') if entry else None
+        if self.store.shared and (not timestamp or (refresh_after is not None and datetime.now() - timestamp >= refresh_after)):
+            entry = self._read_through(key, index, entry)
+            timestamp = entry.get('timestamp') if entry else None
+
+        if entry is None:
+            return None
+        if timestamp and datetime.now() - timestamp < self.ttl:
+            return entry
+        log.info("Cache entry expired", extra={'cache_key': key})
+        self._evict(key, index, entry)
+        return None
+
+    def put(self, key, data):
+        """Store data under key with the current time; returns the new entry"""
+        entry = self._prepared({
+            'data': data,
+            'timestamp': datetime.now()
+        })
+        index = self._index(key)
+        with self._write_locks[index]:
+            with self._locks[index]:
+                self._stripes[index][key] = entry
+            try:
+                self.store.put(key, entry)
+            except Exception as e:
+                self._store_error('save', e)
+        return entry
+
+    def _evict(self, key, index, entry):
+        """Drop key only if it still holds the expired entry (a fresh put may have replaced it)"""
+        with self._write_locks[index]:
+            with self._locks[index]:
+                if self._stripes[index].get(key) is not entry:
+                    return
+                del self._stripes[index][key]
+            with self._stats_lock:
+                self._expired += 1
+            try:
+                self.store.delete(key)
+            except Exception as e:
+                self._store_error('delete expired', e)
+
+    def delete_many(self, keys):
+        """Remove keys from memory and from the store"""
+        keys = list(keys)
+        for key in keys:
+            index = self._index(key)
+            with self._locks[index]:
+                self._stripes[index].pop(key, None)
+        try:
+            self.store.delete_many(keys)
+        except Exception as e:
+            self._store_error('delete', e)
+
+    def keys(self):
+        """Snapshot of the cached keys; safe to iterate while other threads write"""
+        keys = []
+        for index, shard in enumerate(self._stripes):
+            with self._locks[index]:
+                keys.extend(shard)
+        return keys
+
+    def __len__(self):
+        return sum(len(shard) for shard in self._stripes)
+
+    def _store_error(self, action, error):
+        with self._stats_lock:
+            self._store_errors += 1
+        log.warning("Could not %s cache entry: %s", action, error)
+
+    def stats(self):
+        sizes = [len(shard) for shard in self._stripes]
+        return {
+            'entries': sum(sizes),
+            'stripes': len(sizes),
+            'largest_stripe': max(sizes) if sizes else 0,
+            'expired': self._expired,
+            'store_errors': self._store_errors,
+        }
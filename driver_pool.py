@@ -0,0 +1,221 @@
+"""
+Bounded pool of warm headless Firefox drivers for scraping
+"""
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.firefox.options import Options
+
+log = logging.getLogger(__name__)
+
+
+def create_firefox_driver():
+    """Start a new headless Firefox instance"""
+    firefox_options = Options()
+    firefox_options.add_argument('--headless')
+    # Return from driver.get() at DOMContentLoaded; readiness is decided by page_waits
+    firefox_options.page_load_strategy = 'eager'
+    return webdriver.Firefox(options=firefox_options)
+
+
+class DriverPoolTimeout(Exception):
+    """Raised when no driver could be leased within the lease timeout"""
+
+
+class DriverPool:
+    """
+    Keeps up to `size` Firefox drivers alive between scrapes.
+
+    Drivers are leased with `with pool.lease() as driver:`. A driver is
+    health-checked before it is handed out, recycled after `max_uses`
+    leases and thrown away if a scrape leaves it unresponsive.
+    """
+
+    def __init__(self, size=2, max_uses=50, lease_timeout=30, factory=create_firefox_driver):
+        self.size = size
+        self.max_uses = max_uses
+        self.lease_timeout = lease_timeout
+        self.factory = factory
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._uses = {}  # id(driver) -> number of completed leases
+        self._alive = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+
+        # Lease statistics
+        self._leases = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._last_wait = 0.0
+        self._recycled = 0
+        self._crashed = 0
+
+    def start(self):
+        """Warm up the pool in the background so boot is not blocked by browser launches"""
+        for _ in range(self.size):
+            threading.Thread(target=self._spawn_idle, daemon=True).start()
+
+    def _reserve_slot(self):
+        with self._lock:
+            if self._closed or self._alive >= self.size:
+                return False
+            self._alive += 1
+            return True
+
+    def _create(self):
+        """Create a driver for an already reserved slot"""
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._alive -= 1
+            raise
+        with self._lock:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def _spawn_idle(self):
+        if not self._reserve_slot():
+            return
+        try:
+            driver = self._create()
+        except Exception as e:
+            log.warning("Could not start Firefox for driver pool: %s", e)
+            return
+        self._idle.put(driver)
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+            self._alive -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _acquire(self):
+        deadline = time.monotonic() + self.lease_timeout
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                if self._reserve_slot():
+                    return self._create()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DriverPoolTimeout(f"No browser available after {self.lease_timeout}s")
+                with self._lock:
+                    self._waiting += 1
+                try:
+                    driver = self._idle.get(timeout=remaining)
+                except queue.Empty:
+                    raise DriverPoolTimeout(f"No browser available after {self.lease_timeout}s")
+                finally:
+                    with self._lock:
+                        self._waiting -= 1
+
+            if self._is_healthy(driver):
+                return driver
+            with self._lock:
+                self._crashed += 1
+            self._discard(driver)
+
+    def _release(self, driver, failed):
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+            closed = self._closed
+
+        if failed and not self._is_healthy(driver):
+            with self._lock:
+                self._crashed += 1
+            self._discard(driver)
+        elif closed or uses >= self.max_uses:
+            with self._lock:
+                self._recycled += 1
+            self._discard(driver)
+        else:
+            try:
+                # Drop the previous page so an idle browser does not hold its DOM
+                driver.get('about:blank')
+            except Exception:
+                with self._lock:
+                    self._crashed += 1
+                self._discard(driver)
+                threading.Thread(target=self._spawn_idle, daemon=True).start()
+                return
+            self._idle.put(driver)
+            return
+
+        # Keep the pool warm by replacing the driver we just dropped
+        if not closed:
+            threading.Thread(target=self._spawn_idle, daemon=True).start()
+
+    @contextmanager
+    def lease(self):
+        """Lease a warm driver for the duration of the with-block"""
+        started = time.monotonic()
+        driver = self._acquire()
+        waited = time.monotonic() - started
+        with self._lock:
+            self._in_use += 1
+            self._leases += 1
+            self._total_wait += waited
+            self._last_wait = waited
+            self._max_wait = max(self._max_wait, waited)
+
+        failed = False
+        try:
+            yield driver
+        except WebDriverException:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._release(driver, failed)
+
+    def stats(self):
+        """Snapshot of pool occupancy and lease wait times"""
+        with self._lock:
+            return {
+                'size': self.size,
+                'alive': self._alive,
+                'idle': self._idle.qsize(),
+                'in_use': self._in_use,
+                'queue_depth': self._waiting,
+                'leases': self._leases,
+                'recycled': self._recycled,
+                'crashed': self._crashed,
+                'lease_wait_ms': {
+                    'last': round(self._last_wait * 1000, 1),
+                    'avg': round(self._total_wait / self._leases * 1000, 1) if self._leases else 0.0,
+                    'max': round(self._max_wait * 1000, 1),
+                },
+            }
+
+    def shutdown(self):
+        """Quit all idle drivers; leased drivers are quit when they are released"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
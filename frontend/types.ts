@@ -4,10 +4,10 @@ export interface MP {
   name: string;
   party: string;
   constituency: string;
-  image_url?: string;
+  image_url?: string | null;  // null in offline (X-Cache: OFFLINE) answers
   contact_url?: string;
   gender?: string;
-  profile_url?: string;
+  profile_url?: string | null;  // null in offline answers
 }
 
 export interface TimelineEvent {
@@ -0,0 +1,192 @@
+"""
+Approximate MP name matching for scraped names the exact MPIndex lookup misses
+
+Catches middle names, double-barrelled names, spelling and diacritic
+variants and leftover titles. Every MP's name is split into character
+trigrams once at startup; a lookup only considers the MPs that share
+trigrams with the query (inverted index), so it never scans the whole list.
+"""
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+from mp_index import fold_accents
+from name_processing import name_parts
+
+FUZZY_MATCH_THRESHOLD = float(os.environ.get('FUZZY_MATCH_THRESHOLD', '0.85'))
+# Candidates scoring within this margin of the best are tied and go to the tie-breakers
+TIE_MARGIN = 0.05
+SHORTLIST = 10  # Best trigram candidates that get the token-level score
+EXTRA_TOKEN_PENALTY = 0.02  # Per query token beyond the candidate's, so exact names win
+REPORT_LIMIT = 1000  # Distinct names kept for report()
+WAHLKREIS_NUMBER = re.compile(r'Wahlkreis:?\s*0*(\d+)')
+PARENTHESES = re.compile(r'\([^)]*\)')
+SEPARATORS = re.compile(r'[^\w\s]|_')
+
+
+def name_tokens(name):
+    """
+    Lower-case, accent-folded, title-free name tokens in 'First Last' order;
+    hyphenated names become separate tokens and '(Erfurt)'-style suffixes are dropped
+    """
+    key, _ = name_parts(name)
+    if ',' in key:
+        last, first = key.split(',', 1)
+        key = f"{first} {last}"
+    return SEPARATORS.sub(' ', PARENTHESES.sub(' ', fold_accents(key))).split()
+
+
+def token_trigrams(token):
+    padded = f" {token} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def dice(a, b):
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def same_party(scraped, fraktion):
+    """'CDU' matches 'CDU/CSU', 'Die Grünen' matches 'Bündnis 90/Die Grünen'"""
+    if not scraped or not fraktion:
+        return False
+    scraped, fraktion = fold_accents(scraped.lower()), fold_accents(fraktion.lower())
+    return scraped in fraktion or fraktion in scraped
+
+
+def wahlkreis_number(constituency):
+    match = WAHLKREIS_NUMBER.search(constituency or '')
+    return int(match.group(1)) if match else None
+
+
+class FuzzyNameIndex:
+    """
+    Trigram index over the MPs of an MPIndex.
+
+    The inverted index shortlists the MPs sharing the most trigrams with the
+    query. Each shortlisted name is then scored token by token: every token
+    of the MP's name is paired with its most similar query token (Dice over
+    trigrams), the surname counts double, and each extra query token (a
+    middle name) costs a little. Below `threshold` there is no match.
+    Near-ties are broken by party, then by Wahlkreis; a tie that survives
+    both is left unresolved.
+
+    Every fuzzy lookup is recorded for report().
+    """
+
+    def __init__(self, mp_index, threshold=FUZZY_MATCH_THRESHOLD):
+        self.mp_index = mp_index
+        self.threshold = threshold
+        self._tokens = {}  # mdbId -> tuple of (token trigrams, weight)
+        self._sizes = {}  # mdbId -> number of distinct trigrams
+        self._postings = {}  # trigram -> list of mdbIds
+        self._lock = threading.Lock()
+        self._report = {}  # scraped name -> report row
+
+    def load(self):
+        """Build the trigram index from the MP records; returns the number of indexed MPs"""
+        tokens = {}
+        sizes = {}
+        postings = {}
+        for mp in self.mp_index.records():
+            names = name_tokens(mp.name)
+            if not names:
+                continue
+            # The last token is the surname
+            tokens[mp.mdb_id] = tuple(
+                (token_trigrams(token), 2 if index == len(names) - 1 else 1)
+                for index, token in enumerate(names)
+            )
+            grams = frozenset().union(*(grams for grams, _ in tokens[mp.mdb_id]))
+            sizes[mp.mdb_id] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(mp.mdb_id)
+        self._tokens = tokens
+        self._sizes = sizes
+        self._postings = postings
+        return len(tokens)
+
+    def _score(self, query, mdb_id):
+        candidate = self._tokens[mdb_id]
+        total = sum(weight * max(dice(grams, q) for q in query) for grams, weight in candidate)
+        score = total / sum(weight for _, weight in candidate)
+        return score - EXTRA_TOKEN_PENALTY * max(0, len(query) - len(candidate))
+
+    def candidates(self, name):
+        """[(score, mdbId)] of the shortlisted MPs for name, best first"""
+        query = [token_trigrams(token) for token in name_tokens(name)]
+        if not query:
+            return []
+        shared = Counter()
+        for gram in frozenset().union(*query):
+            shared.update(self._postings.get(gram, ()))
+        shortlist = sorted(shared, key=lambda mdb_id: shared[mdb_id] / self._sizes[mdb_id], reverse=True)
+        scored = [(self._score(query, mdb_id), mdb_id) for mdb_id in shortlist[:SHORTLIST]]
+        scored.sort(reverse=True)
+        return scored
+
+    def _break_tie(self, tied, party, constituency):
+        records = [self.mp_index.get(mdb_id) for _, mdb_id in tied]
+        if party:
+            by_party = [mp for mp in records if same_party(party, mp.fraktion)]
+            if by_party:
+                records = by_party
+        number = wahlkreis_number(constituency)
+        if len(records) > 1 and number is not None:
+            by_wahlkreis = [mp for mp in records if mp.wahlkreis_number == number]
+            if by_wahlkreis:
+                records = by_wahlkreis
+        return records[0] if len(records) == 1 else None
+
+    def match(self, name, party=None, constituency=None):
+        """The MP record the scraped name most likely refers to, or None"""
+        started = time.perf_counter()
+        scored = self.candidates(name)
+        best = scored[0][0] if scored else 0.0
+        mp = None
+        if best >= self.threshold:
+            tied = [(score, mdb_id) for score, mdb_id in scored if best - score <= TIE_MARGIN]
+            if len(tied) == 1:
+                mp = self.mp_index.get(tied[0][1])
+            else:
+                mp = self._break_tie(tied, party, constituency)
+        self._record(name, mp, best, time.perf_counter() - started)
+        return mp
+
+    def _record(self, name, mp, score, seconds):
+        with self._lock:
+            row = self._report.get(name)
+            if row is None:
+                if len(self._report) >= REPORT_LIMIT:
+                    return
+                row = self._report[name] = {'name': name, 'lookups': 0}
+            row.update({
+                'matched': mp.name if mp else None,
+                'mdb_id': mp.mdb_id if mp else None,
+                'score': round(score, 3),
+                'lookup_ms': round(seconds * 1000, 3),
+            })
+            row['lookups'] += 1
+
+    def report(self):
+        """Scraped names that needed fuzzy resolution, unresolved ones first"""
+        with self._lock:
+            rows = [dict(row) for row in self._report.values()]
+        rows.sort(key=lambda row: (row['matched'] is not None, -row['lookups'], row['name']))
+        return {
+            'threshold': self.threshold,
+            'resolved': sum(1 for row in rows if row['matched']),
+            'unresolved': sum(1 for row in rows if not row['matched']),
+            'names': rows,
+        }
+
+    def stats(self):
+        with self._lock:
+            resolved = sum(1 for row in self._report.values() if row['matched'])
+            return {
+                'indexed': len(self._tokens),
+                'trigrams': len(self._postings),
+                'fuzzy_names': len(self._report),
+                'fuzzy_resolved': resolved,
+            }
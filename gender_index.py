@@ -0,0 +1,191 @@
+"""
+Compact, memory-mapped gender lookup compiled from gender_data.py
+
+Build (after editing gender_data.py):
+    python gender_index.py
+
+gender_data.py stays the editable source list. The build validates it,
+drops rows without a usable gender (junk rows and explicit 'unknown', which
+detect_gender treats like a missing name anyway), and writes
+data/gender_lookup.bin:
+
+    header   b'GLK2', uint32 count, uint32 size and CRC-32 of gender_data.py
+    offsets  (count + 1) uint32, start of each key in the key blob
+    codes    2 bits per key, four keys per byte (1 = male, 2 = female)
+    keys     UTF-8 keys, sorted bytewise, concatenated
+
+At runtime GENDER_LOOKUP maps the file on first use and answers .get() by
+binary search, so importing it costs nothing and all worker processes share
+the same page-cache pages instead of each holding a dict. If gender_data.py
+no longer matches the size and checksum the index was built from, the index
+is ignored (with a warning) and the source is compiled in memory instead.
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+INDEX_FILE = os.path.join('data', 'gender_lookup.bin')
+SOURCE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gender_data.py')
+MAGIC = b'GLK2'
+HEADER = struct.Struct('<4sIII')  # magic, count, source size, source CRC-32
+OFFSET = struct.Struct('<I')
+
+CODES = {'male': 1, 'female': 2}
+GENDERS = {code: gender for gender, code in CODES.items()}
+
+
+def validate(source):
+    """Usable (key, gender) pairs from the source dict; returns (pairs, dropped rows)"""
+    pairs = []
+    dropped = []
+    for key, gender in source.items():
+        if not isinstance(key, str) or not any(c.isalpha() for c in key) or gender not in CODES:
+            dropped.append((key, gender))
+            continue
+        normalized = ' '.join(key.split()).lower()
+        if normalized != key:
+            raise ValueError(f"Gender lookup key {key!r} is not normalized (expected {normalized!r})")
+        pairs.append((key, gender))
+    return pairs, dropped
+
+
+def source_fingerprint(path=SOURCE_FILE):
+    """(size, CRC-32) of the source list, or None if it is not there (index-only deployments)"""
+    size, crc = 0, 0
+    try:
+        with open(path, 'rb', buffering=0) as f:
+            # In chunks, so checking the source does not add its size to every worker's memory
+            while chunk := f.read(8192):
+                size += len(chunk)
+                crc = zlib.crc32(chunk, crc)
+    except OSError:
+        return None
+    return size, crc
+
+
+def compile_lookup(source, fingerprint=(0, 0)):
+    """Serialize the validated source dict; returns (bytes, dropped rows)"""
+    pairs, dropped = validate(source)
+    entries = sorted((key.encode('utf-8'), CODES[gender]) for key, gender in pairs)
+
+    offsets = bytearray()
+    blob = bytearray()
+    for key, _ in entries:
+        offsets += OFFSET.pack(len(blob))
+        blob += key
+    offsets += OFFSET.pack(len(blob))
+
+    codes = bytearray((len(entries) + 3) // 4)
+    for index, (_, code) in enumerate(entries):
+        codes[index // 4] |= code << (index % 4 * 2)
+
+    return HEADER.pack(MAGIC, len(entries), *fingerprint) + bytes(offsets) + bytes(codes) + bytes(blob), dropped
+
+
+class GenderLookup:
+    """
+    Read-only mapping of normalized MP names to 'male'/'female' backed by
+    the compiled index; opened lazily on the first lookup
+    """
+
+    def __init__(self, path, source_path=SOURCE_FILE):
+        self.path = path
+        self.source_path = source_path
+        self._buffer = None
+        self._count = 0
+
+    def _map_index(self):
+        """The mapped index file and None, or None and why it cannot be used"""
+        if not os.path.exists(self.path):
+            return None, f"{self.path} not found"
+        with open(self.path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(buffer) < HEADER.size or buffer[:len(MAGIC)] != MAGIC:
+            return None, f"{self.path} is not a current gender lookup index"
+        built_from = HEADER.unpack_from(buffer, 0)[2:]
+        fingerprint = source_fingerprint(self.source_path)
+        if fingerprint is not None and fingerprint != built_from:
+            return None, f"{self.path} is out of date with gender_data.py"
+        return buffer, None
+
+    def _open(self):
+        # Concurrent first lookups may each map the file; either mapping is valid
+        buffer, problem = self._map_index()
+        if buffer is None:
+            # Not built or stale: compile the source in memory so lookups are still right
+            import logging  # Only this fallback logs; keeps the import of the module light
+            logging.getLogger(__name__).warning("%s, compiling gender_data.py in memory "
+                                                "(run 'python gender_index.py' to rebuild it)", problem)
+            from gender_data import GENDER_LOOKUP as source
+            buffer = compile_lookup(source)[0]
+        count = HEADER.unpack_from(buffer, 0)[1]
+        codes_start = HEADER.size + (count + 1) * OFFSET.size
+        if sys.byteorder == 'little':
+            # Zero-copy view of the little-endian uint32 offsets
+            self._offsets = memoryview(buffer)[HEADER.size:codes_start].cast('I')
+        else:
+            self._offsets = [OFFSET.unpack_from(buffer, HEADER.size + i * OFFSET.size)[0] for i in range(count + 1)]
+        self._codes = codes_start
+        self._keys = codes_start + (count + 3) // 4
+        self._count = count
+        self._buffer = buffer
+
+    def _key(self, index):
+        return self._buffer[self._keys + self._offsets[index]:self._keys + self._offsets[index + 1]]
+
+    def _code(self, index):
+        return self._buffer[self._codes + index // 4] >> (index % 4 * 2) & 0b11
+
+    def get(self, key, default=None):
+        if self._buffer is None:
+            self._open()
+        target = key.encode('utf-8')
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._key(low) == target:
+            return GENDERS.get(self._code(low), default)
+        return default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        if self._buffer is None:
+            self._open()
+        return self._count
+
+
+GENDER_LOOKUP = GenderLookup(INDEX_FILE)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compile gender_data.py into ' + INDEX_FILE)
+    parser.add_argument('--output', default=INDEX_FILE, help=f'Index file (default: {INDEX_FILE})')
+    args = parser.parse_args()
+
+    from gender_data import GENDER_LOOKUP as source
+    data, dropped = compile_lookup(source, source_fingerprint())
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    tmp_path = args.output + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, args.output)
+
+    print(f"✓ Wrote {len(source) - len(dropped)} names ({len(data):,} bytes) to {args.output}")
+    if dropped:
+        print(f"  Dropped {len(dropped)} rows without a usable gender:")
+        for key, gender in dropped:
+            print(f"    {key!r}: {gender!r}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Gunicorn settings for the production serving mode (see README, "Production Deployment")
+
+All values can be overridden through environment variables.
+"""
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+
+# Worker processes; the master restarts any worker that crashes. A small fixed default: every
+# worker owns browsers, and the host's SCRAPE_CONCURRENCY is split evenly between the workers
+workers = int(os.environ.get('WEB_WORKERS', '2'))
+os.environ['WEB_WORKERS'] = str(workers)
+scrape_concurrency = int(os.environ.get('SCRAPE_CONCURRENCY', '2'))
+
+# Every worker serves its own /metrics; label the samples so they can be summed
+if workers > 1:
+    os.environ.setdefault('METRICS_WORKER_LABEL', '1')
+
+# Threads per worker serve requests while other threads wait on scrapes or SSE streams
+worker_class = 'gthread'
+threads = int(os.environ.get('WEB_THREADS', '8'))
+
+timeout = int(os.environ.get('WEB_TIMEOUT', '60'))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers periodically so a slow leak (e.g. in a browser driver) cannot accumulate
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', '5000'))
+max_requests_jitter = max_requests // 10
+
+# Every worker must open its own SQLite connections, thread pools and browsers
+preload_app = False
+
+
+def on_starting(server):
+    if scrape_concurrency < workers:
+        raise RuntimeError(
+            f'SCRAPE_CONCURRENCY={scrape_concurrency} is the scrape (and browser) limit for the whole host '
+            f'and must be at least WEB_WORKERS={workers}, so that every worker gets a slot'
+        )
+    if workers > 1 and os.environ.get('CACHE_BACKEND', 'sqlite').lower() == 'json':
+        raise RuntimeError(
+            'CACHE_BACKEND=json cannot be shared between worker processes; '
+            'use the default sqlite backend or WEB_WORKERS=1'
+        )
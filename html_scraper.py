@@ -0,0 +1,140 @@
+"""
+Browserless scraping backend: pooled HTTP session + lxml parsing of abgeordnetenwatch.de listings
+"""
+from urllib.parse import urljoin
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import html as lxml_html
+
+USER_AGENT = (
+    'Mozilla/5.0 (X11; Linux x86_64; rv:133.0) Gecko/20100101 Firefox/133.0'
+)
+
+
+def _has_class(name):
+    """XPath predicate matching elements that carry the given CSS class"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# XPath equivalents of the CSS selectors used by the Selenium scraper
+POLITICIAN_TILES = f"//article[{_has_class('tile--politician')}]"
+POLITICIAN_NAME = f".//*[{_has_class('tile__politician__name')}]"
+POLITICIAN_PROFILE_LINK = ".//a[contains(@href, '/profile/')]"
+POLITICIAN_PARTY = f".//*[{_has_class('tile__politician__party')}]"
+POLITICIAN_CONSTITUENCY = f".//*[{_has_class('politician-tile__candidacy-mandate-constituency')}]"
+POLITICIAN_IMAGE = f".//*[{_has_class('tile__politician__image')}]//img"
+MULTIPLE_RESULTS_MESSAGE = "//p[contains(text(), 'wurden mehrere Ergebnisse gefunden')]"
+OPTION_TILES = f"//article[{_has_class('tile')}]"
+OPTION_TITLE = f".//*[{_has_class('tile__title')}]"
+OPTION_LINK = f".//*[{_has_class('tile__links')}]//a"
+EMPTY_RESULT = f"//*[{_has_class('view-empty')}]"
+
+
+class ListingParseError(Exception):
+    """Raised when a fetched page does not look like a politician listing"""
+
+
+def create_session(pool_size=10):
+    """HTTP session with keep-alive connections reused across scrapes"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml',
+        'Accept-Language': 'de-DE,de;q=0.9',
+    })
+    return session
+
+
+def fetch_listing(session, url, timeout=10):
+    """Download a listing page; non-200 answers count as parse failures"""
+    response = session.get(url, timeout=timeout)
+    if response.status_code != 200:
+        raise ListingParseError(f"HTTP {response.status_code} for {url}")
+    return response.content
+
+
+def _text(element):
+    return ' '.join(element.text_content().split())
+
+
+def _first(element, xpath):
+    matches = element.xpath(xpath)
+    return matches[0] if matches else None
+
+
+def parse_politicians(tree, base_url):
+    """
+    Extract raw politician records (without contact URL / gender enrichment)
+    """
+    politicians = []
+    for tile in tree.xpath(POLITICIAN_TILES):
+        name_div = _first(tile, POLITICIAN_NAME)
+        if name_div is None:
+            continue
+        mp_data = {'name': _text(name_div)}
+
+        profile_link = _first(tile, POLITICIAN_PROFILE_LINK)
+        mp_data['profile_url'] = urljoin(base_url, profile_link.get('href')) if profile_link is not None else None
+
+        party_element = _first(tile, POLITICIAN_PARTY)
+        mp_data['party'] = _text(party_element) if party_element is not None else 'Unknown'
+
+        constituency_element = _first(tile, POLITICIAN_CONSTITUENCY)
+        mp_data['constituency'] = _text(constituency_element) if constituency_element is not None else 'N/A'
+
+        img_element = _first(tile, POLITICIAN_IMAGE)
+        src = img_element.get('src') if img_element is not None else None
+        mp_data['image_url'] = urljoin(base_url, src) if src else None
+
+        politicians.append(mp_data)
+    return politicians
+
+
+def parse_wahlkreis_options(tree, base_url):
+    """Extract the options of a 'mehrere Ergebnisse' page"""
+    options = []
+    for tile in tree.xpath(OPTION_TILES):
+        title_elem = _first(tile, OPTION_TITLE)
+        link_elem = _first(tile, OPTION_LINK)
+        if title_elem is None or link_elem is None or not link_elem.get('href'):
+            continue
+        options.append({
+            'title': _text(title_elem),
+            'url': urljoin(base_url, link_elem.get('href'))
+        })
+    return options
+
+
+def parse_listing(content, base_url, allow_multiple=True):
+    """
+    Parse a listing page into the same structure the Selenium scraper returns:
+    a list of politicians, or {'type': 'multiple_wahlkreis', 'options': [...]}.
+
+    Raises ListingParseError if the page carries none of the expected markers.
+    """
+    try:
+        tree = lxml_html.fromstring(content)
+    except Exception as e:
+        raise ListingParseError(f"Unparseable HTML: {e}")
+
+    if allow_multiple and tree.xpath(MULTIPLE_RESULTS_MESSAGE):
+        options = parse_wahlkreis_options(tree, base_url)
+        if options:
+            return {
+                'type': 'multiple_wahlkreis',
+                'options': options
+            }
+
+    if tree.xpath(POLITICIAN_TILES):
+        politicians = parse_politicians(tree, base_url)
+        if not politicians:
+            raise ListingParseError("Politician tiles found but none could be parsed")
+        return politicians
+
+    if tree.xpath(EMPTY_RESULT):
+        return []
+
+    raise ListingParseError("Page has no politician tiles and no empty-result marker")
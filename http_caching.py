@@ -0,0 +1,146 @@
+"""
+HTTP caching and compression for API responses
+
+Cacheable responses get a weak ETag (hash of the JSON body), Last-Modified
+(time the answer was scraped) and Cache-Control derived from the remaining
+cache TTL, and are answered with 304 Not Modified when the client already
+has them. Large responses are gzip-compressed, or brotli-compressed when the
+optional `brotli` package is installed and the client accepts it.
+
+Cache entries are prepared once when they are stored (prepare_entry): the
+response body as bytes, its ETag and its compressed encodings. A cache hit
+then only writes those bytes (prepared_response).
+"""
+import gzip
+import hashlib
+import json
+import os
+from datetime import timezone
+
+from flask import Response, request
+from werkzeug.http import http_date
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '1024'))  # Bytes
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/plain'}
+# Store gzip/brotli encodings of cached bodies next to the plain body
+PRECOMPRESS = os.environ.get('PRECOMPRESS', '1') == '1'
+
+
+def content_etag(body):
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def http_timestamp(timestamp):
+    """Cache timestamps are naive local time; HTTP dates are UTC"""
+    return timestamp.astimezone(timezone.utc)
+
+
+def serialize(data):
+    """Compact UTF-8 JSON; also the encoding the SQLite cache store persists"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def cacheable_response(response, last_modified, max_age, stale_while_revalidate):
+    """
+    Add validators and freshness directives to a 200 response and turn it into
+    a 304 if the request's If-None-Match / If-Modified-Since still match.
+    max_age and stale_while_revalidate are timedeltas.
+    """
+    # Weak: the gzip and brotli encodings of the body are equivalent representations
+    response.set_etag(content_etag(response.get_data()), weak=True)
+    response.last_modified = http_timestamp(last_modified)
+    response.cache_control.public = True
+    response.cache_control.max_age = max(0, int(max_age.total_seconds()))
+    response.cache_control.stale_while_revalidate = max(0, int(stale_while_revalidate.total_seconds()))
+    response.vary.add('Accept-Encoding')
+    return response.make_conditional(request)
+
+
+def negotiate_encoding():
+    """'br', 'gzip' or None for the current request's Accept-Encoding"""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_response(response):
+    """after_request hook: compress large, complete bodies the client can decode"""
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding()
+    body = response.get_data()
+    if encoding is None or len(body) < COMPRESS_MIN_SIZE:
+        return response
+    response.set_data(compress(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def prepare_entry(entry):
+    """
+    Ready-to-send fields for a cache entry: 'body' (reused if the store already
+    loaded it), the 'etag' and 'last_modified' header values and the
+    pre-compressed 'encodings'
+    """
+    body = entry.get('body') or serialize(entry['data'])
+    encodings = {}
+    if PRECOMPRESS and len(body) >= COMPRESS_MIN_SIZE:
+        encodings['gzip'] = compress(body, 'gzip')
+        if brotli is not None:
+            encodings['br'] = compress(body, 'br')
+    etag = content_etag(body)
+    return {
+        'body': body,
+        'etag': etag,
+        'etag_header': f'W/"{etag}"',
+        'last_modified': http_date(http_timestamp(entry['timestamp'])),
+        'encodings': encodings,
+    }
+
+
+def not_modified(etag, timestamp):
+    """Whether the request's validators still match (If-None-Match takes precedence)"""
+    if 'If-None-Match' in request.headers:
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    return since is not None and since >= http_timestamp(timestamp).replace(microsecond=0)
+
+
+def prepared_response(entry, max_age, stale_while_revalidate):
+    """
+    Same headers and 304 handling as cacheable_response, for a prepared cache
+    entry: nothing is re-encoded or re-hashed, the headers are plain strings
+    """
+    headers = {
+        'ETag': entry['etag_header'],
+        'Last-Modified': entry['last_modified'],
+        'Cache-Control': f"public, max-age={max(0, int(max_age.total_seconds()))}, "
+                         f"stale-while-revalidate={max(0, int(stale_while_revalidate.total_seconds()))}",
+        'Vary': 'Accept-Encoding',
+    }
+    if not_modified(entry['etag'], entry['timestamp']):
+        return Response(status=304, headers=headers)
+    encoding = negotiate_encoding() if entry['encodings'] else None
+    if encoding in entry['encodings']:
+        headers['Content-Encoding'] = encoding
+        return Response(entry['encodings'][encoding], mimetype='application/json', headers=headers)
+    return Response(entry['body'], mimetype='application/json', headers=headers)
@@ -0,0 +1,187 @@
+"""
+Minimal Prometheus metrics for GET /metrics
+
+Counters, gauges and histograms with labels, rendered in the Prometheus text
+exposition format (0.0.4). Components that already keep their own stats()
+(driver pool, cache, single-flight) are read through `collect` callbacks
+when /metrics is scraped instead of being updated twice.
+
+Metrics live in the process that records them: under gunicorn every worker
+answers /metrics with its own numbers, so the server adds a `worker` label
+(see METRICS_WORKER_LABEL) and dashboards sum over it.
+"""
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+log = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; request latencies of cache hits sit in the low buckets, scrapes in the high ones
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in pairs) + '}'
+
+
+def format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """
+    A named metric family; one value per combination of label values.
+
+    `collect()`, if given, is called at render time and returns the current
+    value (no labels) or a {label values tuple: value} dict.
+    """
+
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=(), collect=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+        self._lock = threading.Lock()
+        self._values = {}  # label values tuple -> value
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self):
+        """[(suffix, label pairs, value)] for rendering"""
+        if self.collect is not None:
+            values = self.collect()
+            if not isinstance(values, dict):
+                values = {(): values}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return [('', list(zip(self.labelnames, key)), value) for key, value in sorted(values.items())]
+
+    def render(self, const_labels=()):
+        lines = [f'# HELP {self.name} {escape(self.documentation)}', f'# TYPE {self.name} {self.kind}']
+        for suffix, pairs, value in self._samples():
+            lines.append(f'{self.name}{suffix}{format_labels(list(const_labels) + pairs)} {format_value(value)}')
+        return lines
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    """Cumulative buckets plus _sum and _count per label combination"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['buckets'][index] += 1
+                    break
+            series['sum'] += value
+            series['count'] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block in seconds (also when it raises)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self):
+        with self._lock:
+            values = {key: {'buckets': list(series['buckets']), 'sum': series['sum'], 'count': series['count']}
+                      for key, series in self._values.items()}
+        samples = []
+        for key, series in sorted(values.items()):
+            pairs = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, series['buckets']):
+                cumulative += count
+                samples.append(('_bucket', pairs + [('le', format_value(float(bound)))], cumulative))
+            samples.append(('_sum', pairs, series['sum']))
+            samples.append(('_count', pairs, series['count']))
+        return samples
+
+
+class Registry:
+    """The metrics of one process; `const_labels()` returns labels added to every sample"""
+
+    def __init__(self, const_labels=None):
+        self.const_labels = const_labels
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=(), collect=None):
+        return self._register(Counter(name, documentation, labelnames, collect))
+
+    def gauge(self, name, documentation, labelnames=(), collect=None):
+        return self._register(Gauge(name, documentation, labelnames, collect))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        """All metrics in the text exposition format"""
+        const_labels = sorted(self.const_labels().items()) if self.const_labels else []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            try:
+                lines.extend(metric.render(const_labels))
+            except Exception as e:
+                # A failing collect callback must not take the other metrics down
+                log.warning("Could not collect metric %s: %s", metric.name, e)
+        return '\n'.join(lines) + '\n'
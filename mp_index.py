@@ -0,0 +1,132 @@
+"""
+In-memory index of Bundestag members built from data/bundestag_contacts.csv
+
+One record per mdbId holds everything the API needs about an MP; a secondary
+hash index maps every normalized spelling of the name to that mdbId.
+"""
+import csv
+import os
+import unicodedata
+from collections import namedtuple
+
+from name_processing import normalize_name, name_parts
+
+MP = namedtuple('MP', 'mdb_id name fraktion wahlkreis_number wahlkreis_name contact_url gender')
+
+
+def display_name(csv_name):
+    """'Meiser, Pascal' -> 'Pascal Meiser'"""
+    if ',' in csv_name:
+        last, first = csv_name.split(',', 1)
+        return f"{first.strip()} {last.strip()}"
+    return csv_name.strip()
+
+
+def fold_accents(text):
+    """'ahmetović' -> 'ahmetovic'; lookup keys are already lower-case"""
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).replace('ß', 'ss')
+
+
+def name_variants(csv_name):
+    """
+    Lookup keys for a contacts CSV name: 'Last, First' and 'First Last',
+    without Dr./Prof. titles, each also accent-folded
+    """
+    normalized = normalize_name(csv_name)
+    variants = {normalized.lower()}
+    if ',' in normalized:
+        last, first = normalized.split(',', 1)
+        variants.add(f"{first.strip()} {last.strip()}".lower())
+    variants |= {fold_accents(variant) for variant in variants}
+    return variants
+
+
+class MPIndex:
+    """
+    MP records keyed by mdbId, a name-variant -> mdbId index and the members
+    of each Wahlkreis. A variant shared by two MPs is dropped rather than
+    guessed.
+    """
+
+    def __init__(self, contacts_path, detect_gender=None):
+        self.contacts_path = contacts_path
+        self.detect_gender = detect_gender
+        self._records = {}  # mdbId -> MP
+        self._names = {}  # name variant -> mdbId
+        self._wahlkreise = {}  # Wahlkreis number -> tuple of mdbIds
+        self._ambiguous = set()
+
+    def load(self):
+        """Build the indexes; returns the number of MPs"""
+        if not os.path.exists(self.contacts_path):
+            return 0
+
+        records = {}
+        names = {}
+        ambiguous = set()
+        wahlkreise = {}
+        with open(self.contacts_path, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                csv_name = row['name'].strip()
+                number = row['wahlkreis_number'].strip()
+                number = int(number) if number.isdigit() and int(number) else None
+                mp = MP(
+                    mdb_id=row['mdbId'].strip(),
+                    name=display_name(csv_name),
+                    fraktion=row['fraktion'].strip() or None,
+                    wahlkreis_number=number,
+                    wahlkreis_name=row['wahlkreis_name'].strip() or None,
+                    contact_url=row['contact_url'].strip() or None,
+                    gender=self.detect_gender(csv_name) if self.detect_gender else 'unknown',
+                )
+                records[mp.mdb_id] = mp
+                if number is not None:
+                    wahlkreise.setdefault(number, []).append(mp.mdb_id)
+                for variant in name_variants(csv_name):
+                    if names.setdefault(variant, mp.mdb_id) != mp.mdb_id:
+                        ambiguous.add(variant)
+
+        for variant in ambiguous:
+            del names[variant]
+        self._records = records
+        self._names = names
+        self._ambiguous = ambiguous
+        self._wahlkreise = {number: tuple(ids) for number, ids in wahlkreise.items()}
+        return len(records)
+
+    def get(self, mdb_id):
+        return self._records.get(mdb_id)
+
+    def lookup(self, name):
+        """The MP for a scraped or CSV name in any supported spelling, or None"""
+        key, _ = name_parts(name)
+        mdb_id = self._names.get(key)
+        if mdb_id is None:
+            mdb_id = self._names.get(fold_accents(key))
+        return self._records.get(mdb_id) if mdb_id else None
+
+    def records(self):
+        return list(self._records.values())
+
+    def members(self, wahlkreis_number):
+        """MP records of a Wahlkreis in CSV order"""
+        return [self._records[mdb_id] for mdb_id in self._wahlkreise.get(wahlkreis_number, ())]
+
+    def members_by_wahlkreis(self):
+        """All MPs that hold a Wahlkreis, grouped by Wahlkreis number"""
+        for number in self._wahlkreise:
+            yield from self.members(number)
+
+    def __len__(self):
+        return len(self._records)
+
+    def stats(self):
+        return {
+            'mps': len(self._records),
+            'name_variants': len(self._names),
+            'ambiguous_variants': len(self._ambiguous),
+            'wahlkreise': len(self._wahlkreise),
+        }
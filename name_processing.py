@@ -0,0 +1,141 @@
+"""
+Name normalization and gender detection for MP names
+
+Names are normalized in a single pass with precompiled patterns, and the
+result (normalized name, lookup key, first name) and the detected gender are
+memoized per raw name, so the contact lookup and gender detection of a
+politician share the work.
+"""
+import os
+import re
+from functools import lru_cache
+
+from gender_index import GENDER_LOOKUP
+
+NAME_CACHE_SIZE = int(os.environ.get('NAME_CACHE_SIZE', '8192'))
+
+# Academic prefixes, removed in this order (with or without dot, with optional spaces)
+TITLE_PATTERNS = (
+    re.compile(r'\b[Pp][Rr][Oo][Ff]\.?\s+[Dd][Rr]\.?\s+'),
+    re.compile(r'\b[Dd][Rr]\.?\s+[Mm][Ee][Dd]\.?\s+'),
+    re.compile(r'\b[Pp][Rr][Oo][Ff]\.?\s+'),
+    re.compile(r'\b[Dd][Rr]\.?\s+'),
+)
+
+# Comprehensive German first names for fallback gender detection
+MALE_FIRST_NAMES = {
+    'achim', 'adam', 'adis', 'adrian', 'alaa', 'albert', 'alexander', 'alexis', 'alois', 'andreas',
+    'ansgar', 'anton', 'armin', 'arne', 'artur', 'ates', 'axel', 'balten', 'bastian', 'benedikt',
+    'benjamin', 'bernd', 'boris', 'carl', 'carl-philipp', 'carsten', 'cem', 'christian', 'christoph',
+    'christopher', 'daniel', 'david', 'denis', 'dennis', 'dietmar', 'dirk', 'enrico', 'erhard',
+    'erik', 'fabian', 'falko', 'felix', 'ferat', 'florian', 'frank', 'frederik', 'friedrich',
+    'fritz', 'georg', 'gereon', 'gerhard', 'gerold', 'gerrit', 'gottfried', 'gregor', 'gunther',
+    'günter', 'götz', 'gökay', 'hans', 'hans-jürgen', 'hansjörg', 'hannes', 'harald', 'hauke',
+    'heiko', 'heinrich', 'helge', 'helmut', 'hendrik', 'henning', 'henri', 'herbert', 'hermann',
+    'holger', 'hubertus', 'ingo', 'isaac', 'jakob', 'jan', 'jan-marco', 'jan-niclas', 'jan-wilhelm',
+    'janosch', 'joachim', 'jochen', 'johann', 'johannes', 'jonas', 'jorrit', 'josef', 'julian',
+    'jörg', 'jörn', 'jürgen', 'kai', 'karl', 'karsten', 'kay', 'klaus', 'knut', 'konstantin',
+    'konrad', 'kurt', 'lars', 'leif', 'leif-erik', 'leon', 'lorenz', 'lukas', 'luke', 'luigi',
+    'lutz', 'macit', 'maik', 'malte', 'manfred', 'manuel', 'marc', 'marcel', 'marco', 'marcus',
+    'mario', 'mark', 'markus', 'martin', 'marvin', 'matthias', 'max', 'maximilian', 'metin',
+    'micha', 'michael', 'mirco', 'moritz', 'nicolai', 'niklas', 'nils', 'norbert', 'olaf', 'olav',
+    'oliver', 'omid', 'oskar', 'otto', 'parsa', 'pascal', 'patrick', 'paul', 'peter', 'philipp',
+    'philip', 'pierre', 'rainer', 'raimond', 'ralf', 'ralph', 'reinhard', 'rene', 'rené', 'reza',
+    'richard', 'robert', 'robin', 'rocco', 'roderich', 'roland', 'rolf', 'ronald', 'ruben', 'rüdiger',
+    'sascha', 'sebastian', 'sepp', 'sergej', 'sieghard', 'stefan', 'steffen', 'stephan', 'sven',
+    'tarek', 'theo', 'theodor', 'thomas', 'thorsten', 'til', 'tilman', 'tim', 'timon', 'tino',
+    'tobias', 'torben', 'truels', 'udo', 'ulrich', 'uwe', 'vinzenz', 'volker', 'waldemar', 'walter',
+    'werner', 'wilfried', 'wilhelm', 'wolfgang'
+}
+
+FEMALE_FIRST_NAMES = {
+    'agnieszka', 'alexandra', 'andrea', 'angela', 'angelika', 'anja', 'anke', 'anna', 'annalena',
+    'anne', 'anne-mieke', 'anette', 'annette', 'annika', 'astrid', 'ayse', 'barbara', 'beate',
+    'bettina', 'birgit', 'britta', 'bärbel', 'cansin', 'caren', 'carina', 'carolin', 'caroline',
+    'catarina', 'chantal', 'charlotte', 'christiane', 'christina', 'christine', 'clara', 'claudia',
+    'corinna', 'cornelia', 'dagmar', 'daniela', 'deborah', 'denise', 'desiree', 'diana', 'doris',
+    'dorothee', 'dunja', 'elena', 'elisabeth', 'elke', 'ellen', 'emilia', 'emma', 'erika', 'esra',
+    'esther', 'eva', 'filiz', 'franziska', 'frauke', 'gabriela', 'gitta', 'gisela', 'gudrun',
+    'hannah', 'heide', 'heidi', 'heike', 'helga', 'hilde', 'hildegard', 'hülya', 'ida', 'ilse',
+    'ina', 'ines', 'inge', 'ingeborg', 'ingrid', 'irene', 'iris', 'isabel', 'isabell', 'isabelle',
+    'jamila', 'jana', 'janina', 'jasmin', 'jasmina', 'jeanne', 'jennifer', 'jessica', 'johanna',
+    'josephine', 'julia', 'juliane', 'jutta', 'karin', 'karla', 'karoline', 'katalin', 'katharina',
+    'kathrin', 'katja', 'katrin', 'kerstin', 'kirsten', 'klara', 'kristin', 'lamya', 'lara', 'laura',
+    'lea', 'lena', 'linda', 'lisa', 'luise', 'mandy', 'manuela', 'margarete', 'mareike', 'maren',
+    'maria', 'marie', 'marion', 'marlene', 'marta', 'martha', 'martina', 'mechthild', 'melanie',
+    'michaela', 'monika', 'nadine', 'nancy', 'natalie', 'nicole', 'nina', 'ophelia', 'ottilie',
+    'patricia', 'paula', 'petra', 'pia', 'rasha', 'rebecca', 'reem', 'regina', 'renate', 'ricarda',
+    'rita', 'ronja', 'rosa', 'rosemarie', 'ruth', 'sabine', 'sabrina', 'sahra', 'sanae', 'sandra',
+    'sara', 'sarah', 'saskia', 'schahina', 'serap', 'siemtje', 'silke', 'silvia', 'simone', 'sofia',
+    'sonja', 'sophie', 'stefanie', 'steffi', 'stella', 'susanne', 'svenja', 'swantje', 'sylvia',
+    'tamara', 'tanja', 'teresa', 'theresa', 'tijen', 'ulrike', 'ursula', 'ute', 'vanessa', 'vera',
+    'verena', 'veronika', 'victoria', 'violetta', 'waltraud', 'wiebke', 'zada', 'zoe'
+}
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def analyze_name(name):
+    """
+    Normalize a raw name once; returns (normalized, key, first_name) where key
+    is the lower-cased normalized name used by the contact and gender lookups
+    """
+    normalized = name
+    for pattern in TITLE_PATTERNS:
+        normalized = pattern.sub('', normalized)
+    # Remove extra spaces
+    normalized = ' '.join(normalized.split())
+
+    # Handle "Last, First" format, then "First Last"
+    first_name = ''
+    if ',' in normalized:
+        given = normalized.split(',', 1)[1].split()
+        first_name = given[0] if given else ''
+    else:
+        parts = normalized.split()
+        if parts:
+            first_name = parts[0]
+    return normalized, normalized.lower(), first_name.lower()
+
+
+def normalize_name(name):
+    """Normalize name by removing Dr./Prof. prefix and extra spaces"""
+    return analyze_name(name)[0]
+
+
+def name_parts(name):
+    """(lookup key, first name) of a raw name"""
+    _, key, first_name = analyze_name(name)
+    return key, first_name
+
+
+def extract_first_name(full_name):
+    """Extract first name from full name (handles 'Last, First' or 'First Last' formats)"""
+    return analyze_name(full_name)[2]
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def detect_gender(full_name):
+    """Detect gender using comprehensive MP database with first-name fallback"""
+    _, key, first_name = analyze_name(full_name)
+
+    # First try exact match (case-insensitive)
+    gender = GENDER_LOOKUP.get(key)
+    if gender and gender != 'unknown':
+        return gender
+
+    # Fallback: try first name pattern matching
+    if first_name in MALE_FIRST_NAMES:
+        return 'male'
+    elif first_name in FEMALE_FIRST_NAMES:
+        return 'female'
+    else:
+        return 'unknown'
+
+
+def name_cache_stats():
+    stats = {}
+    for label, fn in (('names', analyze_name), ('genders', detect_gender)):
+        info = fn.cache_info()
+        stats[label] = {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
+    stats['max_size'] = NAME_CACHE_SIZE
+    return stats
@@ -0,0 +1,84 @@
+"""
+Readiness-driven page waits for abgeordnetenwatch.de listings
+"""
+import threading
+import time
+from selenium.webdriver.common.by import By
+
+# DOM markers that tell us a listing page has finished rendering
+READY_CONDITIONS = {
+    'multiple_wahlkreis': (By.XPATH, "//p[contains(text(), 'wurden mehrere Ergebnisse gefunden')]"),
+    'politicians': (By.CSS_SELECTOR, "article.tile--politician"),
+    'empty': (By.CSS_SELECTOR, ".view-empty"),
+}
+
+
+class PageWaitTimeout(Exception):
+    """Raised when none of the expected DOM conditions appeared before the deadline"""
+
+    def __init__(self, url, waited, conditions):
+        self.url = url
+        self.waited = waited
+        self.conditions = conditions
+        super().__init__(
+            f"Page not ready after {waited:.1f}s (waiting for {', '.join(conditions)}): {url}"
+        )
+
+
+class PageWaiter:
+    """
+    Polls the loaded page until one of the named conditions is present.
+
+    Conditions are checked in the order given, so more specific markers
+    (e.g. the multiple Wahlkreis message) should come first. Every wait
+    is timed and the durations are kept per matched condition.
+    """
+
+    def __init__(self, conditions=None, timeout=10, poll_interval=0.1):
+        self.conditions = dict(conditions or READY_CONDITIONS)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._stats = {}  # condition -> {'count', 'total', 'max'}
+
+    def wait(self, driver, names=None, timeout=None):
+        """
+        Block until one of `names` is present; returns (matched_name, seconds_waited)
+        """
+        names = list(names or self.conditions)
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        started = time.monotonic()
+
+        while True:
+            for name in names:
+                by, selector = self.conditions[name]
+                if driver.find_elements(by, selector):
+                    waited = time.monotonic() - started
+                    self._record(name, waited)
+                    return name, waited
+
+            if time.monotonic() >= deadline:
+                waited = time.monotonic() - started
+                self._record('timeout', waited)
+                raise PageWaitTimeout(driver.current_url, waited, names)
+            time.sleep(self.poll_interval)
+
+    def _record(self, name, waited):
+        with self._lock:
+            entry = self._stats.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0})
+            entry['count'] += 1
+            entry['total'] += waited
+            entry['max'] = max(entry['max'], waited)
+
+    def stats(self):
+        """Wait durations per matched condition in milliseconds"""
+        with self._lock:
+            return {
+                name: {
+                    'count': entry['count'],
+                    'avg_ms': round(entry['total'] / entry['count'] * 1000, 1),
+                    'max_ms': round(entry['max'] * 1000, 1),
+                }
+                for name, entry in self._stats.items()
+            }
@@ -0,0 +1,223 @@
+"""
+Pre-warm the PLZ cache by crawling a list of PLZs before a campaign launch
+
+Usage:
+    python prewarm_cache.py --plz-file plz.txt --workers 4 --rate 2
+    python prewarm_cache.py --plz-file plz.txt --base-url http://127.0.0.1:8765   # local fixture server
+
+A --base-url dry run fills data/dryrun/ (its own cache database and
+checkpoint) unless --cache-db/--checkpoint say otherwise, so fixture
+results never end up in the production cache or mark PLZs as done.
+
+The PLZ file holds one PLZ per line (or a CSV whose first column is the PLZ).
+Progress is checkpointed, so re-running the same command resumes where an
+interrupted crawl stopped; --restart ignores the checkpoint.
+"""
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+DEFAULT_CHECKPOINT = os.path.join('data', 'prewarm_checkpoint.json')
+DRY_RUN_DIR = os.path.join('data', 'dryrun')
+DRY_RUN_CHECKPOINT = os.path.join(DRY_RUN_DIR, 'prewarm_checkpoint.json')
+DRY_RUN_CACHE_DB = os.path.join(DRY_RUN_DIR, 'plz_cache.db')
+
+
+class RateLimiter:
+    """Global politeness limit: at most `rate` scrapes start per second across all workers"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class Checkpoint:
+    """Set of finished PLZs, flushed atomically to a JSON file every `every` updates"""
+
+    def __init__(self, path, every=20):
+        self.path = path
+        self.every = every
+        self.done = set()
+        self.failed = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.done = set(state.get('done', []))
+            self.failed = state.get('failed', {})
+
+    def mark(self, plz, error=None):
+        with self._lock:
+            if error is None:
+                self.done.add(plz)
+                self.failed.pop(plz, None)
+            else:
+                self.failed[plz] = error
+            self._pending += 1
+            if self._pending >= self.every:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        self._pending = 0
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'done': sorted(self.done), 'failed': self.failed}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def read_plz_file(path):
+    """Unique, valid PLZs from the file in their original order"""
+    plzs = []
+    seen = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            plz = line.split(',', 1)[0].strip().strip('"').zfill(5)
+            if plz.isdigit() and len(plz) == 5 and plz not in seen:
+                seen.add(plz)
+                plzs.append(plz)
+    return plzs
+
+
+def crawl(server, plzs, workers, rate, checkpoint, force=False):
+    """
+    Scrape and cache every PLZ; returns the crawl statistics
+    """
+    limiter = RateLimiter(rate)
+    stats = {'scraped': 0, 'cached': 0, 'failed': Counter(), 'latencies': []}
+    lock = threading.Lock()
+
+    def warm(plz):
+        if not force and server.get_cached_result(plz):
+            return 'cached', 0.0
+        limiter.wait()
+        started = time.monotonic()
+        server.scrape_plz_response(plz, refresh=force)
+        return 'scraped', time.monotonic() - started
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prewarm')
+    try:
+        futures = {executor.submit(warm, plz): plz for plz in plzs}
+        for index, future in enumerate(as_completed(futures), 1):
+            plz = futures[future]
+            try:
+                outcome, latency = future.result()
+            except Exception as e:
+                with lock:
+                    stats['failed'][e.__class__.__name__] += 1
+                checkpoint.mark(plz, error=f"{e.__class__.__name__}: {e}")
+            else:
+                with lock:
+                    stats[outcome] += 1
+                    if outcome == 'scraped':
+                        stats['latencies'].append(latency)
+                checkpoint.mark(plz)
+            if index % 50 == 0 or index == len(plzs):
+                print(f"[{index}/{len(plzs)}] scraped {stats['scraped']}, "
+                      f"cached {stats['cached']}, failed {sum(stats['failed'].values())}")
+    finally:
+        # On Ctrl+C drop queued PLZs instead of finishing the whole crawl
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    checkpoint.flush()
+    return stats
+
+
+def print_report(stats, total, skipped, elapsed):
+    print("=" * 60)
+    print(f"PLZs in list:        {total}")
+    print(f"Done earlier:        {skipped}")
+    print(f"Already cached:      {stats['cached']}")
+    print(f"Scraped:             {stats['scraped']}")
+    print(f"Failed:              {sum(stats['failed'].values())}")
+    for error_type, count in stats['failed'].most_common():
+        print(f"  {error_type}: {count}")
+    print(f"Elapsed:             {elapsed:.1f}s")
+    processed = stats['scraped'] + stats['cached'] + sum(stats['failed'].values())
+    if elapsed > 0:
+        print(f"Throughput:          {processed / elapsed:.2f} PLZ/s ({stats['scraped'] / elapsed:.2f} scrapes/s)")
+    if stats['latencies']:
+        latencies = sorted(stats['latencies'])
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"Scrape latency:      median {statistics.median(latencies) * 1000:.0f} ms, "
+              f"p95 {p95 * 1000:.0f} ms")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--plz-file', required=True, help='One PLZ per line (or CSV with PLZ first)')
+    parser.add_argument('--workers', type=int, default=2, help='Concurrent scrapes (default: 2)')
+    parser.add_argument('--rate', type=float, default=1.0,
+                        help='Max scrapes started per second across all workers, 0 = unlimited (default: 1)')
+    parser.add_argument('--checkpoint', help=f'Progress file (default: {DEFAULT_CHECKPOINT}, '
+                                             f'{DRY_RUN_CHECKPOINT} with --base-url)')
+    parser.add_argument('--cache-db', help=f'SQLite cache to fill (default: CACHE_DB_FILE or data/plz_cache.db, '
+                                           f'{DRY_RUN_CACHE_DB} with --base-url)')
+    parser.add_argument('--restart', action='store_true', help='Ignore an existing checkpoint')
+    parser.add_argument('--force', action='store_true', help='Re-scrape PLZs even if they are cached')
+    parser.add_argument('--base-url', help='Scrape this site instead of abgeordnetenwatch.de (e.g. a fixture server)')
+    args = parser.parse_args()
+
+    if args.base_url:
+        os.environ['ABGEORDNETENWATCH_URL'] = args.base_url
+        # Keep dry runs out of the production cache and checkpoint
+        args.cache_db = args.cache_db or DRY_RUN_CACHE_DB
+        args.checkpoint = args.checkpoint or DRY_RUN_CHECKPOINT
+    if args.cache_db:
+        os.environ['CACHE_DB_FILE'] = args.cache_db
+    args.checkpoint = args.checkpoint or DEFAULT_CHECKPOINT
+    # The crawl prints its own progress; only show the server's warnings, as plain text
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    os.environ.setdefault('LOG_FORMAT', 'text')
+    # Run every worker's scrape at once instead of queueing (and shedding) it like a request;
+    # the crawl is a single process, so it gets all of the slots
+    os.environ.setdefault('SCRAPE_CONCURRENCY', str(args.workers))
+    os.environ['WEB_WORKERS'] = '1'
+    import abgeordnetenwatch_server as server
+
+    plzs = read_plz_file(args.plz_file)
+    checkpoint = Checkpoint(args.checkpoint)
+    if not args.restart:
+        checkpoint.load()
+    todo = [plz for plz in plzs if plz not in checkpoint.done]
+    skipped = len(plzs) - len(todo)
+    print(f"Pre-warming {len(todo)} PLZs ({skipped} already done) with {args.workers} workers at <= {args.rate}/s")
+
+    started = time.monotonic()
+    try:
+        stats = crawl(server, todo, args.workers, args.rate, checkpoint, force=args.force)
+    except KeyboardInterrupt:
+        checkpoint.flush()
+        print("\nInterrupted - progress saved, re-run the same command to resume")
+        raise SystemExit(130)
+    finally:
+        server.DRIVER_POOL.shutdown()
+    print_report(stats, len(plzs), skipped, time.monotonic() - started)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Per-request performance forensics: Server-Timing phases and opt-in cProfile traces
+
+Code on the request path wraps its work in `with phase('wait'):` (or calls
+record()); the durations of the current request are summed per phase and
+sent back as
+
+    Server-Timing: cache_read;dur=0.1, lease;dur=0.3, page_load;dur=812.4, ..., total;dur=1204.9
+
+Work that runs outside a request (background refreshes, batch and async job
+executors) is not attributed to any response, so phase() is a no-op there.
+
+With PROFILE_TOKEN set, a request with ?profile=1 and a matching
+X-Profile-Token header is run under cProfile and the stats are written to
+PROFILE_DIR (open with `python -m pstats <file>` or snakeviz). Only the
+request thread is profiled; a request that joins a scrape already running
+on another thread shows the wait, not the scrape.
+"""
+import cProfile
+import hmac
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from flask import g, has_request_context, request
+
+log = logging.getLogger(__name__)
+
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN', '')  # Empty: ?profile=1 is ignored
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join('data', 'profiles'))
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', '50'))  # Newest profiles kept on disk
+
+# cProfile (sys.monitoring based since Python 3.12) allows one active profiler per process
+_PROFILE_LOCK = threading.Lock()
+
+
+def record(name, seconds):
+    """Add seconds to phase `name` of the current request"""
+    if not has_request_context():
+        return
+    phases = g.get('server_timing')
+    if phases is not None:
+        phases[name] = phases.get(name, 0.0) + seconds
+
+
+@contextmanager
+def phase(name):
+    """Time the with-block as phase `name` of the current request (also when it raises)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def server_timing_header(phases, total):
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in phases.items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ', '.join(entries)
+
+
+def profile_requested():
+    """?profile=1 with the admin token; anything else profiles nothing"""
+    if not PROFILE_TOKEN or request.args.get('profile') != '1':
+        return False
+    return hmac.compare_digest(request.headers.get('X-Profile-Token', ''), PROFILE_TOKEN)
+
+
+def start_request():
+    """before_request hook"""
+    g.request_started = time.perf_counter()
+    g.server_timing = {}
+    if profile_requested():
+        if _PROFILE_LOCK.acquire(blocking=False):
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+        else:
+            g.profile_busy = True
+
+
+def finish_request(response):
+    """after_request hook: Server-Timing header and the profile dump, if any"""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        try:
+            response.headers['X-Profile'] = save_profile(profiler)
+        except Exception as e:
+            log.warning("Could not write profile: %s", e)
+        finally:
+            _PROFILE_LOCK.release()
+    elif g.pop('profile_busy', False):
+        response.headers['X-Profile'] = 'busy'
+
+    started = g.get('request_started')
+    phases = g.get('server_timing')
+    if started is not None and phases is not None:
+        response.headers['Server-Timing'] = server_timing_header(phases, time.perf_counter() - started)
+        # Lets the cross-origin frontend read the timings through the Resource Timing API
+        response.headers['Timing-Allow-Origin'] = '*'
+    return response
+
+
+def teardown_request(error=None):
+    """teardown_request hook: stop a profiler that after_request never saw (unhandled error)"""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        _PROFILE_LOCK.release()
+
+
+def save_profile(profiler):
+    """Write the stats to PROFILE_DIR, drop the oldest beyond PROFILE_KEEP; returns the file name"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    route = re.sub(r'\W+', '_', request.url_rule.rule if request.url_rule else 'unmatched').strip('_') or 'root'
+    name = f"{datetime.now():%Y%m%d-%H%M%S-%f}-{route}.prof"
+    profiler.dump_stats(os.path.join(PROFILE_DIR, name))
+
+    profiles = sorted(f for f in os.listdir(PROFILE_DIR) if f.endswith('.prof'))
+    for old in profiles[:-PROFILE_KEEP] if PROFILE_KEEP > 0 else []:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, old))
+        except OSError:
+            pass
+    log.info("Profile written to %s", os.path.join(PROFILE_DIR, name))
+    return name
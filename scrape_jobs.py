@@ -0,0 +1,107 @@
+"""
+Asynchronous scrape jobs: run lookups on a bounded executor and let clients poll or subscribe
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Job:
+    """One scrape job; status moves from 'pending' to 'running' to 'done' or 'error'"""
+
+    def __init__(self, key):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.status = 'pending'
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self.changed = threading.Condition()
+
+    @property
+    def is_finished(self):
+        return self.status in ('done', 'error')
+
+    def _set(self, status, result=None, error=None):
+        with self.changed:
+            self.status = status
+            self.result = result
+            self.error = error
+            if self.is_finished:
+                self.finished = time.time()
+            self.changed.notify_all()
+
+    def wait_for_change(self, seen_status, timeout):
+        """Block until the status differs from seen_status or timeout passes; returns the status"""
+        with self.changed:
+            self.changed.wait_for(lambda: self.status != seen_status, timeout=timeout)
+            return self.status
+
+
+class JobManager:
+    """
+    Runs jobs on `workers` threads. Submitting a key that already has an
+    unfinished job returns that job instead of starting another one.
+    Finished jobs are kept for `ttl` seconds so clients can collect them.
+    """
+
+    def __init__(self, workers=2, ttl=600):
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scrape-job')
+        self._lock = threading.Lock()
+        self._jobs = {}  # job id -> Job
+        self._active = {}  # key -> unfinished Job
+        self._submitted = 0
+        self._deduped = 0
+
+    def submit(self, key, fn):
+        """Start fn() as a job for key (or join the unfinished one); returns the Job"""
+        with self._lock:
+            self._purge()
+            job = self._active.get(key)
+            if job is not None:
+                self._deduped += 1
+                return job
+            job = Job(key)
+            self._jobs[job.id] = job
+            self._active[key] = job
+            self._submitted += 1
+
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def _run(self, job, fn):
+        job._set('running')
+        try:
+            result = fn()
+        except Exception as e:
+            job._set('error', error=e)
+        else:
+            job._set('done', result=result)
+        finally:
+            with self._lock:
+                if self._active.get(job.key) is job:
+                    del self._active[job.key]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _purge(self):
+        cutoff = time.time() - self.ttl
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished and job.finished < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def stats(self):
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+            return {
+                'pending': statuses.count('pending'),
+                'running': statuses.count('running'),
+                'finished': statuses.count('done') + statuses.count('error'),
+                'submitted': self._submitted,
+                'deduped': self._deduped,
+            }
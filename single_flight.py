@@ -0,0 +1,65 @@
+"""
+Single-flight coalescing: concurrent calls for the same key share one execution
+"""
+import threading
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.callers = 1
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    The first caller for a key runs the function; every caller that arrives
+    while it is still running blocks and receives the same result (or error).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._executions = 0
+        self._merged = 0
+
+    def do(self, key, fn):
+        """
+        Run fn() once per in-flight key; returns (result, callers) where
+        callers is the number of requests that shared this execution
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self._executions += 1
+            else:
+                flight.callers += 1
+                self._merged += 1
+
+        if leader:
+            try:
+                flight.result = fn()
+            except BaseException as e:
+                flight.error = e
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+        else:
+            flight.done.wait()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.result, flight.callers
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._flights),
+                'executions': self._executions,
+                'merged_callers': self._merged,
+            }
@@ -0,0 +1,232 @@
+"""
+Structured, non-blocking logging for the server
+
+configure_logging() routes the root logger through a bounded queue: the
+request thread only formats the message and enqueues it, and a writer
+thread drains the queue and writes everything queued with one write() call
+to stdout every LOG_FLUSH_INTERVAL, one JSON object per line:
+
+    {"ts": "2026-10-18T12:34:56.789+00:00", "level": "INFO", "logger": "abgeordnetenwatch",
+     "msg": "Cache hit", "request_id": "3f9c0a1b2d4e5f60", "plz": "10115", "elapsed_ms": 0.4, "source": "HIT"}
+
+Records logged during a request carry its request id (taken from an
+incoming X-Request-ID header or generated, and echoed in the response),
+the PLZ of /api/search requests and the milliseconds since the request
+started. Keyword fields passed as `extra={...}` are added as JSON keys.
+
+LOG_LEVEL (default INFO) controls the volume: per-politician and
+per-option lines are DEBUG, one line per request/scrape is INFO.
+LOG_FORMAT=text prints plain lines for local development. If the writer
+falls behind, records beyond LOG_QUEUE_SIZE are dropped (and counted)
+rather than blocking requests.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from flask import g, has_request_context, request
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json').lower()  # 'json' or 'text'
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
+LOG_BATCH_SIZE = 512  # Records joined into one write
+LOG_FLUSH_INTERVAL = 0.05  # Seconds the writer waits between batches
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+REQUEST_ID_PATTERN = re.compile(r'^[\w.-]{1,64}$')  # Accepted from clients as-is
+
+# LogRecord attributes that are not user fields
+RESERVED_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+_state = {'listener': None, 'handler': None}
+_dropped = 0
+_dropped_lock = threading.Lock()
+
+
+class RequestContextFilter(logging.Filter):
+    """Adds request_id, plz and elapsed_ms of the current request; runs on the calling thread"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get('request_id')
+            plz = request.args.get('plz')
+            if plz and not hasattr(record, 'plz'):
+                record.plz = plz
+            started = g.get('request_started')
+            if started is not None:
+                record.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, msg, request context and extra fields"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in RESERVED_ATTRS and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Readable lines for local development; extra fields are appended as key=value"""
+
+    def format(self, record):
+        line = f"{self.formatTime(record, '%H:%M:%S')} {record.levelname:<7} {record.getMessage()}"
+        fields = [f"{key}={value}" for key, value in vars(record).items()
+                  if key not in RESERVED_ATTRS and value is not None]
+        if fields:
+            line += f"  [{' '.join(fields)}]"
+        if record.exc_text:
+            line += '\n' + record.exc_text
+        return line
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks: beyond `maxsize` queued records it drops
+    the record and counts it. Uses the C SimpleQueue, whose put() is several
+    times cheaper than queue.Queue's
+    """
+
+    def __init__(self, maxsize):
+        super().__init__(queue.SimpleQueue())
+        self.maxsize = maxsize
+
+    def prepare(self, record):
+        # Resolve the message and traceback on the calling thread; fields stay separate.
+        # The root handler runs last, so other handlers have already seen the original record.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        global _dropped
+        if self.queue.qsize() >= self.maxsize:
+            with _dropped_lock:
+                _dropped += 1
+            return
+        self.queue.put(record)
+
+
+class LogWriter:
+    """
+    Writer thread: takes every record that is queued, formats them and writes
+    them with a single write() + flush(), so a slow stdout costs one blocking
+    call per batch instead of one per record
+    """
+
+    _STOP = object()
+
+    def __init__(self, log_queue, stream, formatter):
+        self.queue = log_queue
+        self.stream = stream
+        self.formatter = formatter
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < LOG_BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(record is self._STOP for record in batch)
+            lines = []
+            for record in batch:
+                if record is self._STOP:
+                    continue
+                try:
+                    lines.append(self.formatter.format(record))
+                except Exception as e:
+                    lines.append(json.dumps({'level': 'ERROR', 'msg': f"Unformattable log record: {e}"}))
+            if lines:
+                try:
+                    self.stream.write('\n'.join(lines) + '\n')
+                    self.stream.flush()
+                except Exception:
+                    pass
+            if stop:
+                return
+            if len(batch) < LOG_BATCH_SIZE:
+                # Queue drained: let records accumulate instead of waking (and taking the GIL) for each one
+                time.sleep(LOG_FLUSH_INTERVAL)
+
+    def stop(self, timeout=5):
+        """Write out what is queued and end the thread"""
+        self.queue.put(self._STOP)
+        self._thread.join(timeout)
+
+
+def configure_logging(level=LOG_LEVEL, fmt=LOG_FORMAT, stream=None, queue_size=LOG_QUEUE_SIZE):
+    """
+    Install the queue handler on the root logger and start the writer thread.
+    Calling it again replaces the previous configuration (flushing it first).
+    """
+    shutdown_logging()
+    handler = DroppingQueueHandler(queue_size)
+    handler.addFilter(RequestContextFilter())
+    listener = LogWriter(handler.queue, stream or sys.stdout, TextFormatter() if fmt == 'text' else JsonFormatter())
+    listener.start()
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(level)
+    _state.update(listener=listener, handler=handler)
+
+
+def shutdown_logging():
+    """Write out queued records and detach the handler"""
+    handler, listener = _state['handler'], _state['listener']
+    if handler is not None:
+        logging.getLogger().removeHandler(handler)
+    if listener is not None:
+        listener.stop()
+    _state.update(listener=None, handler=None)
+
+
+atexit.register(shutdown_logging)
+
+
+def dropped_records():
+    return _dropped
+
+
+def assign_request_id():
+    """before_request hook: reuse a sane incoming X-Request-ID or generate one"""
+    incoming = request.headers.get(REQUEST_ID_HEADER, '')
+    g.request_id = incoming if REQUEST_ID_PATTERN.match(incoming) else uuid.uuid4().hex[:16]
+
+
+def add_request_id_header(response):
+    """after_request hook"""
+    request_id = g.get('request_id')
+    if request_id:
+        response.headers[REQUEST_ID_HEADER] = request_id
+    return response
@@ -0,0 +1,52 @@
+"""
+Shared fixtures: the server module imported against a throw-away cache, and
+the recorded pages served by benchmarks/fixture_server.py
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# The server resolves data/ relative to the working directory
+os.chdir(ROOT)
+
+from benchmarks.fixture_server import FixtureServer  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def server():
+    """abgeordnetenwatch_server, imported once with its cache in a temporary directory and no offline index"""
+    tmp = tempfile.mkdtemp(prefix='abgeordnetenwatch_tests_')
+    os.environ['CACHE_DB_FILE'] = os.path.join(tmp, 'plz_cache.db')
+    os.environ['PLZ_WAHLKREIS_FILE'] = os.path.join(tmp, 'no_offline_index.csv')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    import abgeordnetenwatch_server
+    return abgeordnetenwatch_server
+
+
+@pytest.fixture
+def app(server):
+    """The server with an empty cache; each test starts from cold misses"""
+    server.PLZ_CACHE.delete_many(list(server.PLZ_CACHE.keys()))
+    yield server
+    server.PLZ_CACHE.delete_many(list(server.PLZ_CACHE.keys()))
+
+
+@pytest.fixture
+def site(app, monkeypatch):
+    """Factory for a local fixture site the server scrapes instead of abgeordnetenwatch.de"""
+    started = []
+
+    def start(**kwargs):
+        fixtures = FixtureServer(**kwargs).start()
+        started.append(fixtures)
+        monkeypatch.setattr(app, 'ABGEORDNETENWATCH_URL', fixtures.base_url)
+        monkeypatch.setattr(app, 'SCRAPER_BACKEND', 'http')
+        return fixtures
+
+    yield start
+    for fixtures in started:
+        fixtures.stop()
@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+
+from admission import AdmissionController, ScrapeRejected
+
+
+def hold(controller, background, release, admitted):
+    """Take a slot in a thread and keep it until `release` is set"""
+    def run():
+        with controller.slot(background=background):
+            admitted.append(background)
+            release.wait(5)
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'condition not reached'
+        time.sleep(0.005)
+
+
+def test_background_callers_never_take_interactive_queue_places():
+    controller = AdmissionController(limit=1, max_queue=1, queue_timeout=5)
+    release, admitted = threading.Event(), []
+    threads = [hold(controller, True, release, admitted) for _ in range(4)]
+    wait_for(lambda: controller.stats()['background_waiting'] == 3)
+
+    # The single queue place is still free for a request
+    waiter = hold(controller, False, release, admitted)
+    wait_for(lambda: controller.stats()['waiting'] == 1)
+    with pytest.raises(ScrapeRejected) as rejected:
+        controller._acquire()
+    assert rejected.value.reason == 'queue_full'
+
+    release.set()
+    for thread in threads + [waiter]:
+        thread.join(5)
+    # The request was served right after the first background scrape, ahead of the other three
+    assert admitted == [True, False, True, True, True]
+
+
+def test_background_lane_leaves_a_slot_for_requests():
+    controller = AdmissionController(limit=2, max_queue=0)
+    release, admitted = threading.Event(), []
+    threads = [hold(controller, True, release, admitted) for _ in range(3)]
+    wait_for(lambda: controller.stats()['background_waiting'] == 2)
+    assert controller.stats()['active'] == 1
+
+    # No queueing needed (and none allowed): the second slot is free for a request
+    with controller.slot() as queued:
+        assert queued == 0.0
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert controller.stats()['background_active'] == 0
+
+
+def test_background_wait_times_out():
+    controller = AdmissionController(limit=1, background_timeout=0.05)
+    release, admitted = threading.Event(), []
+    thread = hold(controller, False, release, admitted)
+    wait_for(lambda: admitted)
+    with pytest.raises(ScrapeRejected) as rejected:
+        controller._acquire(background=True)
+    assert rejected.value.reason == 'background_timeout'
+    release.set()
+    thread.join(5)
+
+
+def test_interactive_miss_succeeds_while_a_batch_is_running(app, site, monkeypatch):
+    # One scrape slot per worker, as with the gunicorn defaults; a page takes longer than
+    # the queue timeout divided by the batch executor's workers
+    site(delay=0.5)
+    admission = AdmissionController(limit=1, max_queue=4, queue_timeout=1.0)
+    monkeypatch.setattr(app, 'SCRAPE_ADMISSION', admission)
+
+    batch = {}
+    def run_batch():
+        with app.app.test_client() as http:
+            batch['response'] = http.post('/api/search/batch', json={'plz': [str(plz) for plz in range(30001, 30013)]})
+    thread = threading.Thread(target=run_batch)
+    thread.start()
+    wait_for(lambda: admission.stats()['background_waiting'] == app.BATCH_SCRAPE_WORKERS - 1)
+
+    with app.app.test_client() as http:
+        response = http.get('/api/search?plz=30000')
+    assert response.status_code == 200, response.get_json()
+    assert response.headers['X-Cache'] == 'MISS'
+    assert admission.stats()['background_waiting'] > 0  # The batch was still running
+
+    thread.join(30)
+    body = batch['response'].get_json()
+    assert body['count'] == 12 and body['errors'] == 0
+
+
+def test_interactive_miss_succeeds_while_async_jobs_are_queued(app, site, monkeypatch):
+    site(delay=0.5)
+    admission = AdmissionController(limit=1, max_queue=4, queue_timeout=1.0)
+    monkeypatch.setattr(app, 'SCRAPE_ADMISSION', admission)
+
+    with app.app.test_client() as http:
+        jobs = [http.get(f'/api/search?plz={plz}&async=1').get_json() for plz in range(31001, 31005)]
+        assert all(job['status'] in ('pending', 'running') for job in jobs)
+        response = http.get('/api/search?plz=31000')
+        assert response.status_code == 200, response.get_json()
+        assert admission.stats()['rejected']['queue_full'] == 0
+
+        deadline = time.monotonic() + 30
+        while any(job['status'] not in ('done', 'error') for job in jobs) and time.monotonic() < deadline:
+            time.sleep(0.05)
+            jobs = [http.get(f"/api/jobs/{job['job_id']}").get_json() for job in jobs]
+    assert [job['status'] for job in jobs] == ['done'] * 4
@@ -0,0 +1,146 @@
+"""
+Short, deterministic version of benchmarks/stress_cache.py: concurrent puts,
+gets and iteration must not lose updates, and a second process's cache must
+read through to what the first one wrote
+"""
+import sys
+import threading
+from datetime import timedelta
+
+import pytest
+
+from cache_store import JsonCacheStore, SqliteCacheStore
+from concurrent_cache import ConcurrentCache
+
+TTL = timedelta(days=7)
+HOT_KEYS = ['10961', '40213', '80331']
+WRITERS = 6
+PUTS = 60
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    # Switch threads far more often than the default 5ms to provoke interleavings
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def open_store(backend, directory):
+    if backend == 'json':
+        return JsonCacheStore(str(directory / 'plz_cache.json'))
+    return SqliteCacheStore(str(directory / 'plz_cache.db'), TTL)
+
+
+def run_threads(*groups):
+    """Start every (target, count) group behind one barrier and join them; returns the raised exceptions"""
+    errors = []
+    start = threading.Barrier(sum(count for _, count in groups))
+
+    def wrap(target, number):
+        def run():
+            start.wait()
+            try:
+                target(number)
+            except Exception as e:
+                errors.append(e)
+        return run
+
+    threads = [threading.Thread(target=wrap(target, n)) for target, count in groups for n in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(60)
+    return errors
+
+
+@pytest.mark.parametrize('backend', ['sqlite', 'json'])
+def test_concurrent_puts_lose_no_updates(tmp_path, backend):
+    cache = ConcurrentCache(open_store(backend, tmp_path), TTL)
+    cache.load()
+    puts = PUTS if backend == 'sqlite' else 15  # The JSON store rewrites its file per put
+    writing = threading.Event()
+    writing.set()
+    hot_phase = threading.Barrier(WRITERS)
+    finished = []
+
+    def writer(worker):
+        for seq in range(puts):
+            cache.put(f"w{worker}_{seq}", {'worker': worker, 'seq': seq})
+        # All writers then race on the same few keys
+        hot_phase.wait()
+        for seq in range(puts):
+            cache.put(HOT_KEYS[seq % len(HOT_KEYS)], {'worker': worker, 'seq': seq})
+        finished.append(worker)
+        if len(finished) == WRITERS:
+            writing.clear()
+
+    def reader(_):
+        while writing.is_set():
+            for key in HOT_KEYS:
+                entry = cache.get(key)
+                assert entry is None or set(entry['data']) == {'worker', 'seq'}
+            cache.keys()  # Iterating while writers insert must not raise
+
+    assert run_threads((writer, WRITERS), (reader, 3)) == []
+
+    for worker in range(WRITERS):
+        for seq in range(puts):
+            assert cache.get(f"w{worker}_{seq}")['data'] == {'worker': worker, 'seq': seq}
+    assert len(cache) == WRITERS * puts + len(HOT_KEYS)
+
+    # Memory and a freshly opened store agree on every key, including the contended ones
+    persisted = open_store(backend, tmp_path).load_all()
+    assert set(persisted) == set(cache.keys())
+    for key in cache.keys():
+        assert persisted[key]['data'] == cache.get(key)['data'], key
+
+
+def test_read_through_sees_another_processs_writes(tmp_path):
+    writer_cache = ConcurrentCache(open_store('sqlite', tmp_path), TTL)
+    reader_cache = ConcurrentCache(open_store('sqlite', tmp_path), TTL)
+    reader_cache.load()
+    keys = [f"{30000 + n}" for n in range(PUTS)]
+    seen = {}
+
+    def writer(_):
+        for key in keys:
+            writer_cache.put(key, {'plz': key})
+
+    def reader(_):
+        # Each key must show up once the other cache has written it, and never with the wrong data
+        for key in keys:
+            while True:
+                entry = reader_cache.get(key)
+                if entry is not None:
+                    assert entry['data'] == {'plz': key}
+                    seen[key] = True
+                    break
+
+    assert run_threads((writer, 1), (reader, 2)) == []
+    assert len(seen) == len(keys)
+
+
+def test_read_through_picks_up_a_newer_entry(tmp_path):
+    writer_cache = ConcurrentCache(open_store('sqlite', tmp_path), TTL)
+    reader_cache = ConcurrentCache(open_store('sqlite', tmp_path), TTL)
+    writer_cache.put('10961', {'version': 1})
+    assert reader_cache.get('10961')['data'] == {'version': 1}
+
+    def writer(_):
+        for version in range(2, PUTS):
+            writer_cache.put('10961', {'version': version})
+
+    def reader(_):
+        last = 1
+        for _ in range(PUTS):
+            version = reader_cache.get('10961', refresh_after=timedelta(0))['data']['version']
+            assert version >= last  # Never goes back to an older entry
+            last = version
+
+    assert run_threads((writer, 1), (reader, 2)) == []
+    assert reader_cache.get('10961', refresh_after=timedelta(0))['data'] == {'version': PUTS - 1}
+    # Without refresh_after the in-memory entry is trusted
+    writer_cache.put('10961', {'version': PUTS})
+    assert reader_cache.get('10961')['data'] == {'version': PUTS - 1}
@@ -0,0 +1,68 @@
+import os
+import shutil
+
+import pytest
+
+import gender_index
+from gender_data import GENDER_LOOKUP as SOURCE
+from gender_index import GenderLookup, compile_lookup, source_fingerprint, validate
+
+
+def build(path, source_path=gender_index.SOURCE_FILE):
+    with open(path, 'wb') as f:
+        f.write(compile_lookup(SOURCE, source_fingerprint(source_path))[0])
+
+
+def test_shipped_index_is_current_and_matches_the_source():
+    lookup = GenderLookup(gender_index.INDEX_FILE)
+    buffer, problem = lookup._map_index()
+    assert problem is None, 'run python gender_index.py'
+    buffer.close()
+
+    pairs, _ = validate(SOURCE)
+    assert len(lookup) == len(pairs)
+    for key, gender in SOURCE.items():
+        expected = gender if gender in gender_index.CODES else None
+        assert lookup.get(key) == expected, key
+
+
+def test_unknown_names_are_not_found(tmp_path):
+    path = tmp_path / 'gender_lookup.bin'
+    build(path)
+    lookup = GenderLookup(str(path))
+    assert lookup.get('not an mp, surely') is None
+    assert 'not an mp, surely' not in lookup
+
+
+@pytest.fixture
+def source_copy(tmp_path):
+    path = tmp_path / 'gender_data.py'
+    shutil.copyfile(gender_index.SOURCE_FILE, path)
+    return path
+
+
+def test_touched_but_unchanged_source_keeps_the_index(tmp_path, source_copy):
+    index = tmp_path / 'gender_lookup.bin'
+    build(index, source_copy)
+    os.utime(source_copy, (0, 0))
+    buffer, problem = GenderLookup(str(index), source_path=str(source_copy))._map_index()
+    assert problem is None
+    buffer.close()
+
+
+def test_stale_index_falls_back_to_the_source(tmp_path, source_copy, caplog):
+    index = tmp_path / 'gender_lookup.bin'
+    build(index, source_copy)
+    with open(source_copy, 'a', encoding='utf-8') as f:
+        f.write("GENDER_LOOKUP['neu, nora'] = 'female'\n")
+
+    lookup = GenderLookup(str(index), source_path=str(source_copy))
+    assert lookup._map_index() == (None, f"{index} is out of date with gender_data.py")
+    assert lookup.get('abdi, sanae') == SOURCE['abdi, sanae']
+    assert 'out of date' in caplog.text
+
+
+def test_index_from_an_older_format_is_not_used(tmp_path):
+    index = tmp_path / 'gender_lookup.bin'
+    index.write_bytes(b'GLK1' + bytes(64))
+    assert GenderLookup(str(index))._map_index() == (None, f"{index} is not a current gender lookup index")
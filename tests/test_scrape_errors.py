@@ -0,0 +1,29 @@
+import socket
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_unreachable_site_is_a_502_without_upstream_details(app, monkeypatch, caplog):
+    port = closed_port()
+    monkeypatch.setattr(app, 'ABGEORDNETENWATCH_URL', f"http://127.0.0.1:{port}")
+    monkeypatch.setattr(app, 'SCRAPER_BACKEND', 'http')
+    with app.app.test_client() as http:
+        response = http.get('/api/search?plz=32000')
+    assert response.status_code == 502
+    assert response.get_json() == {'error': 'Could not reach abgeordnetenwatch.de, please try again'}
+    assert '127.0.0.1' not in response.get_data(as_text=True)
+    # The details stay in the server log
+    assert f"port={port}" in caplog.text and 'ConnectionError' in caplog.text
+
+
+def test_slow_site_is_a_504(app, site, monkeypatch):
+    site(delay=0.5)
+    monkeypatch.setattr(app, 'PAGE_WAIT_TIMEOUT', 0.1)
+    with app.app.test_client() as http:
+        response = http.get('/api/search?plz=32001')
+    assert response.status_code == 504
+    assert response.get_json() == {'error': 'abgeordnetenwatch.de did not respond in time, please try again'}
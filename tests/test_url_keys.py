@@ -0,0 +1,28 @@
+import sys
+
+
+def test_url_cache_key_is_stable_and_canonical(server):
+    key = server.url_cache_key_for('https://www.abgeordnetenwatch.de/bundestag/abgeordnete?constituency=14011')
+    assert key == server.url_cache_key_for(
+        'https://WWW.abgeordnetenwatch.de/bundestag/abgeordnete/?utm_source=a&constituency=14011#tiles')
+    assert len(key) == len('url_') + 24
+
+
+def test_legacy_pattern_matches_old_hash_keys_only(server):
+    for legacy in ('url_0', 'url_-1', f'url_{sys.maxsize}', f'url_-{sys.maxsize + 1}'):
+        assert server.LEGACY_URL_KEY.match(legacy), legacy
+    # A current key whose hex digest happens to contain only decimal digits
+    assert not server.LEGACY_URL_KEY.match('url_' + '1234567890' * 2 + '1234')
+    assert not server.LEGACY_URL_KEY.match('url_0123456789abcdef01234567')
+
+
+def test_startup_migration_keeps_all_digit_current_keys(app):
+    current = 'url_' + '0' * 24
+    legacy = 'url_-4611686018427387904'
+    members = {'type': 'members', 'count': 0, 'members': []}
+    app.PLZ_CACHE.put(current, members)
+    app.PLZ_CACHE.put(legacy, members)
+
+    app.drop_orphaned_url_entries()
+    assert current in app.PLZ_CACHE.keys()
+    assert legacy not in app.PLZ_CACHE.keys()
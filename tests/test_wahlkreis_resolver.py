@@ -0,0 +1,72 @@
+import os
+from urllib.parse import quote
+
+import pytest
+
+from mp_index import MPIndex
+from name_processing import detect_gender
+from wahlkreis_resolver import WahlkreisResolver
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+OPTION_URL = ('https://www.abgeordnetenwatch.de/bundestag/abgeordnete'
+              '?politician_search_keys=40213&constituency=14011')
+
+
+@pytest.fixture
+def resolver(server):
+    mp_index = MPIndex(os.path.join(FIXTURES, 'bundestag_contacts.csv'), detect_gender=detect_gender)
+    mp_index.load()
+    resolver = WahlkreisResolver(mp_index, os.path.join(FIXTURES, 'plz_wahlkreis.csv'),
+                                 canonicalize=server.canonical_url)
+    assert resolver.load() == 2
+    return resolver
+
+
+def test_single_wahlkreis_plz(resolver):
+    answer = resolver.resolve_plz('10961')
+    assert answer['type'] == 'members' and answer['count'] == 1
+    member = answer['members'][0]
+    assert member['name'] == 'Anna Beispiel'
+    assert member['constituency'] == 'Wahlkreis: 82 - Berlin-Friedrichshain-Kreuzberg'
+    assert member['contact_url'].endswith('mdbId=1000001')
+    # Not in the contacts CSV; see the README note on offline answers
+    assert member['profile_url'] is None and member['image_url'] is None
+
+
+def test_multiple_wahlkreis_plz(resolver):
+    answer = resolver.resolve_plz('40213')
+    assert answer['type'] == 'multiple_wahlkreis'
+    assert [option['title'] for option in answer['options']] == ['Düsseldorf I', 'Düsseldorf II']
+    assert answer['options'][1]['url'] == OPTION_URL
+
+
+def test_multiple_wahlkreis_plz_without_option_urls_is_left_to_the_scraper(resolver):
+    assert resolver.resolve_plz('40210') is None
+    assert resolver.resolve_plz('99999') is None
+
+
+def test_url_lookup(resolver):
+    answer = resolver.resolve_url(OPTION_URL)
+    assert [member['name'] for member in answer['members']] == ['Tobias Test']
+
+
+@pytest.mark.parametrize('variant', [
+    OPTION_URL + '&utm_source=a',
+    OPTION_URL.replace('www.abgeordnetenwatch.de', 'WWW.abgeordnetenwatch.de') + '#tiles',
+    'https://www.abgeordnetenwatch.de/bundestag/abgeordnete/?constituency=14011&politician_search_keys=40213',
+])
+def test_url_lookup_uses_the_canonical_url(resolver, variant):
+    assert resolver.resolve_url(variant)['count'] == 1
+
+
+def test_option_url_with_tracking_params_is_answered_offline(app, resolver, monkeypatch):
+    monkeypatch.setattr(app, 'WAHLKREIS_RESOLVER', resolver)
+    with app.app.test_client() as http:
+        response = http.get(f"/api/scrape-url?url={quote(OPTION_URL + '&utm_source=a', safe='')}")
+        assert response.status_code == 200
+        assert response.headers['X-Cache'] == 'OFFLINE'
+        assert response.get_json()['members'][0]['name'] == 'Tobias Test'
+
+        response = http.get('/api/search?plz=10961')
+        assert response.headers['X-Cache'] == 'OFFLINE'
+        assert response.get_json()['count'] == 1
@@ -0,0 +1,111 @@
+"""
+In-browser extraction of listing tiles with a single WebDriver round-trip per page
+"""
+import threading
+import time
+
+SITE_URL = "https://www.abgeordnetenwatch.de"
+
+# Runs inside the page; returns one plain object per tile so WebDriver serializes
+# everything in one response instead of one round-trip per field
+EXTRACT_POLITICIANS_JS = """
+function text(root, selector) {
+    var el = root.querySelector(selector);
+    return el ? el.innerText.trim() : null;
+}
+function attr(root, selector, name) {
+    var el = root.querySelector(selector);
+    return el ? (el[name] || el.getAttribute(name)) : null;
+}
+return Array.prototype.map.call(document.querySelectorAll('article.tile--politician'), function (tile) {
+    return {
+        name: text(tile, '.tile__politician__name'),
+        profile_url: attr(tile, "a[href*='/profile/']", 'href'),
+        party: text(tile, '.tile__politician__party'),
+        constituency: text(tile, '.politician-tile__candidacy-mandate-constituency'),
+        image_url: attr(tile, '.tile__politician__image img', 'src')
+    };
+});
+"""
+
+EXTRACT_OPTIONS_JS = """
+var options = [];
+Array.prototype.forEach.call(document.querySelectorAll('article.tile'), function (tile) {
+    var title = tile.querySelector('.tile__title');
+    var link = tile.querySelector('.tile__links a');
+    if (title && link) {
+        options.push({title: title.innerText.trim(), url: link.href || link.getAttribute('href')});
+    }
+});
+return options;
+"""
+
+
+def absolute_url(url):
+    """Prefix site-relative URLs the way the per-element scraper did"""
+    if url and url.startswith('/'):
+        return SITE_URL + url
+    return url or None
+
+
+class TileExtractor:
+    """
+    Extracts politician tiles / Wahlkreis options via execute_script and keeps
+    per-page extraction timings.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pages = 0
+        self._total = 0.0
+        self._max = 0.0
+        self._last = 0.0
+
+    def _record(self, seconds):
+        with self._lock:
+            self._pages += 1
+            self._total += seconds
+            self._last = seconds
+            self._max = max(self._max, seconds)
+
+    def politicians(self, driver):
+        """
+        Raw politician records (no contact URL / gender yet); returns (records, seconds)
+        """
+        started = time.perf_counter()
+        tiles = driver.execute_script(EXTRACT_POLITICIANS_JS) or []
+        records = []
+        for tile in tiles:
+            if not tile.get('name'):
+                continue
+            records.append({
+                'name': tile['name'],
+                'profile_url': absolute_url(tile.get('profile_url')),
+                'party': tile['party'] if tile.get('party') is not None else 'Unknown',
+                'constituency': tile['constituency'] if tile.get('constituency') is not None else 'N/A',
+                'image_url': absolute_url(tile.get('image_url')),
+            })
+        seconds = time.perf_counter() - started
+        self._record(seconds)
+        return records, seconds
+
+    def wahlkreis_options(self, driver):
+        """Options of a 'mehrere Ergebnisse' page; returns (options, seconds)"""
+        started = time.perf_counter()
+        options = [
+            {'title': option['title'], 'url': option['url']}
+            for option in driver.execute_script(EXTRACT_OPTIONS_JS) or []
+            if option.get('url')
+        ]
+        seconds = time.perf_counter() - started
+        self._record(seconds)
+        return options, seconds
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pages': self._pages,
+                'last_ms': round(self._last * 1000, 1),
+                'avg_ms': round(self._total / self._pages * 1000, 1) if self._pages else 0.0,
+                'max_ms': round(self._max * 1000, 1),
+            }
@@ -0,0 +1,133 @@
+"""
+Offline PLZ -> Wahlkreis -> MP resolution from local data files
+
+The mapping file (data/plz_wahlkreis.csv) has one row per PLZ/Wahlkreis pair:
+
+    plz,wahlkreis_number,option_title,option_url
+    10961,82,,
+    40213,106,Düsseldorf Altstadt und Carlstadt,https://www.abgeordnetenwatch.de/...&constituency=14011
+
+option_title/option_url are only needed for PLZs that belong to several
+Wahlkreise: they become the options of the 'multiple_wahlkreis' answer, and
+a later /api/scrape-url call for option_url is answered from the same index.
+Option URLs are matched after `canonicalize` (the server's cache-key
+normalization), so tracking parameters or reordered queries still resolve.
+PLZs whose options lack a URL are left to the scraper.
+
+The contacts CSV has no abgeordnetenwatch profile or portrait, so members in
+offline answers carry profile_url and image_url as None.
+"""
+import csv
+import os
+from datetime import datetime
+
+
+def wahlkreis_label(number, name):
+    """Constituency text in the format abgeordnetenwatch tiles use"""
+    return f"Wahlkreis: {number} - {name}"
+
+
+class WahlkreisResolver:
+    """
+    In-memory index joining a PLZ -> Wahlkreis mapping with the members in an MPIndex
+    """
+
+    def __init__(self, mp_index, mapping_path, canonicalize=None):
+        self.mp_index = mp_index
+        self.mapping_path = mapping_path
+        self.canonicalize = canonicalize or (lambda url: url)
+
+        self._plz_index = {}  # plz -> tuple of Wahlkreis numbers
+        self._options = {}  # plz -> list of {'title', 'url'} (multi-Wahlkreis PLZs only)
+        self._url_index = {}  # canonical option url -> Wahlkreis number
+        self._members = {}  # Wahlkreis number -> tuple of member dicts
+        self._names = {}  # Wahlkreis number -> Wahlkreis name
+        self.modified = None  # Last change of the source files (Last-Modified of offline answers)
+
+    def load(self):
+        """Build the indexes; returns the number of resolvable PLZs"""
+        if not os.path.exists(self.mapping_path) or not len(self.mp_index):
+            return 0
+        sources = [self.mapping_path, self.mp_index.contacts_path]
+        self.modified = datetime.fromtimestamp(max(os.path.getmtime(path) for path in sources))
+
+        members = {}
+        for mp in self.mp_index.members_by_wahlkreis():
+            number = mp.wahlkreis_number
+            self._names[number] = mp.wahlkreis_name or ''
+            members.setdefault(number, []).append({
+                'name': mp.name,
+                'profile_url': None,
+                'party': mp.fraktion or 'Unknown',
+                'constituency': wahlkreis_label(number, self._names[number]),
+                'image_url': None,
+                'contact_url': mp.contact_url,
+                'gender': mp.gender,
+            })
+        self._members = {number: tuple(rows) for number, rows in members.items()}
+
+        wahlkreise = {}
+        options = {}
+        with open(self.mapping_path, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                plz = row['plz'].strip().zfill(5)
+                number = row['wahlkreis_number'].strip()
+                if not number.isdigit() or int(number) not in self._members:
+                    continue
+                number = int(number)
+                if number in wahlkreise.setdefault(plz, []):
+                    continue
+                wahlkreise[plz].append(number)
+                options.setdefault(plz, []).append({
+                    'title': (row.get('option_title') or '').strip() or wahlkreis_label(number, self._names[number]),
+                    'url': (row.get('option_url') or '').strip(),
+                    'wahlkreis': number,
+                })
+
+        for plz, numbers in wahlkreise.items():
+            if len(numbers) > 1:
+                # Without follow-up URLs the frontend cannot pick an option; leave these to the scraper
+                if not all(option['url'] for option in options[plz]):
+                    continue
+                self._options[plz] = [{'title': o['title'], 'url': o['url']} for o in options[plz]]
+                for option in options[plz]:
+                    self._url_index[self.canonicalize(option['url'])] = option['wahlkreis']
+            self._plz_index[plz] = tuple(numbers)
+
+        return len(self._plz_index)
+
+    def _members_response(self, number):
+        members = list(self._members[number])
+        return {
+            'type': 'members',
+            'count': len(members),
+            'members': members
+        }
+
+    def resolve_plz(self, plz):
+        """The /api/search response for a PLZ, or None if the PLZ is not mapped"""
+        numbers = self._plz_index.get(plz)
+        if not numbers:
+            return None
+        if len(numbers) > 1:
+            return {
+                'plz': plz,
+                'type': 'multiple_wahlkreis',
+                'message': f'PLZ {plz} gehört zu mehreren Wahlkreisen',
+                'options': list(self._options[plz])
+            }
+        return {'plz': plz, **self._members_response(numbers[0])}
+
+    def resolve_url(self, url):
+        """The /api/scrape-url response for an option URL from the mapping, or None"""
+        number = self._url_index.get(self.canonicalize(url))
+        if number is None:
+            return None
+        return self._members_response(number)
+
+    def stats(self):
+        return {
+            'plz': len(self._plz_index),
+            'multiple_wahlkreis_plz': len(self._options),
+            'wahlkreise': len(self._members),
+        }
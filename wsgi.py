@@ -0,0 +1,14 @@
+"""
+WSGI entry point for production serving
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Each worker process imports this module itself (no preload), so every worker
+gets its own SQLite connections, executors and browser pool, while the
+SQLite cache store is shared by all of them.
+"""
+from abgeordnetenwatch_server import app, DRIVER_POOL, SCRAPER_BACKEND
+
+# The HTTP backend only needs browsers as a fallback, so they start lazily there
+if SCRAPER_BACKEND == 'selenium':
+    DRIVER_POOL.start()